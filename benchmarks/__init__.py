@@ -0,0 +1 @@
+"""Офлайн-бенчмарки конвейера parse → select → format → update."""
@@ -0,0 +1,100 @@
+"""HTML-фикстуры для бенчмарков.
+
+Страницы воспроизводят разметку листингов citaty.info (`article.node-quote`
+с цитатой и `data-source`) вместе с типичным «обвесом» страницы. Они
+генерируются детерминированно, чтобы результаты разных прогонов были
+сравнимы и не требовали сети.
+"""
+
+import random
+
+
+PARSER_CONFIG = {
+    'quote_selector': 'div.field-name-body a > p',
+    'source_selector': 'a.copy-to-clipboard',
+    'source_attr': 'data-source',
+    'block_selector': 'article.node-quote',
+}
+
+# название фикстуры → число цитат на странице
+FIXTURE_SIZES = {
+    'small': 2,
+    'typical': 20,
+    'large': 500,
+}
+
+_WORDS = (
+    'жизнь время человек мир любовь счастье правда сердце слово память путь '
+    'свобода надежда дорога судьба душа мечта тишина город море ночь свет'
+).split()
+
+_AUTHORS = (
+    '📚 Дэвид Митчелл, Облачный атлас',
+    '🧑🏼 Хенни Янгман',
+    '🧑🏼 Марк Твен',
+    '📚 Михаил Булгаков, Мастер и Маргарита',
+    '🎬 Форрест Гамп',
+)
+
+_HEADER = '''<!DOCTYPE html>
+<html lang="ru"><head><meta charset="utf-8"><title>Цитаты</title>
+<link rel="stylesheet" href="/css/main.css"><script src="/js/app.js"></script>
+</head><body><header class="site-header"><nav>{nav}</nav></header><main><div class="view-content">
+'''
+
+_BLOCK = '''<article class="node node-quote" id="node-{idx}">
+    <div class="field-name-body">
+        <a href="https://citaty.info/quote/{idx}" class="citaty_info-quote alink" target="_blank">
+            <p>{text}</p>
+        </a>
+    </div>
+    <div class="field-name-field-tags"><a href="/tag/{tag}">{tag}</a></div>
+    <div class="actions">
+        <a class="action copy-to-clipboard" data-source="{source}"><span class="action__label">Скопировать</span></a>
+        <a class="action share" href="#"><span class="action__label">Поделиться</span></a>
+    </div>
+</article>
+'''
+
+_FOOTER = '''</div></main><footer><p>&copy; citaty.info</p>{links}</footer></body></html>
+'''
+
+
+def quote_text(rng, min_words=3, max_words=40):
+    words = [rng.choice(_WORDS) for _ in range(rng.randint(min_words, max_words))]
+    text = ' '.join(words)
+    return text[0].upper() + text[1:] + '.'
+
+
+def make_listing_page(quotes, seed=0):
+    """Возвращает HTML листинга с `quotes` цитатами разной длины."""
+
+    rng = random.Random(seed)
+    nav = ''.join(f'<a href="/section/{i}">Раздел {i}</a>' for i in range(30))
+    links = ''.join(f'<a href="/page/{i}">{i}</a>' for i in range(50))
+    blocks = [
+        _BLOCK.format(
+            idx=idx,
+            text=quote_text(rng).replace(' ', '&nbsp;', 1),
+            tag=rng.choice(_WORDS),
+            source=rng.choice(_AUTHORS),
+        )
+        for idx in range(quotes)
+    ]
+    return _HEADER.format(nav=nav) + ''.join(blocks) + _FOOTER.format(links=links)
+
+
+def load_fixtures():
+    """Словарь «название → HTML» для всех размеров из `FIXTURE_SIZES`."""
+
+    return {name: make_listing_page(size, seed=idx) for idx, (name, size) in enumerate(FIXTURE_SIZES.items())}
+
+
+def make_candidates(count, seed=0):
+    """Список кандидатов `{'quote', 'source'}` для бенчмарков выбора цитаты."""
+
+    rng = random.Random(seed)
+    return [
+        {'quote': quote_text(rng), 'source': rng.choice(_AUTHORS)}
+        for _ in range(count)
+    ]
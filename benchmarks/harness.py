@@ -0,0 +1,107 @@
+"""Измерение времени и памяти, сохранение и сравнение результатов."""
+
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+
+DEFAULT_REGRESSION_THRESHOLD = 0.10
+
+
+def percentile(samples, fraction):
+    """Перцентиль по методу ближайшего ранга; `samples` должны быть отсортированы."""
+
+    if not samples:
+        return 0.0
+    rank = max(0, min(len(samples) - 1, math.ceil(fraction * len(samples)) - 1))
+    return samples[rank]
+
+
+def measure(fn, iterations=100, warmup=5):
+    """Запускает `fn` `iterations` раз и возвращает статистику.
+
+    Время каждого вызова меряется `time.perf_counter`; пиковая память —
+    отдельным прогоном под `tracemalloc`, чтобы трассировка не искажала тайминги.
+    """
+
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    samples.sort()
+    total = sum(samples)
+    return {
+        'iterations': iterations,
+        'ops_per_sec': iterations / total if total else float('inf'),
+        'mean_ms': statistics.fmean(samples) * 1000,
+        'p50_ms': percentile(samples, 0.50) * 1000,
+        'p99_ms': percentile(samples, 0.99) * 1000,
+        'peak_memory_kb': peak / 1024,
+    }
+
+
+def build_report(results, **meta):
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            **meta,
+        },
+        'results': results,
+    }
+
+
+def save_report(report, path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def load_report(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_reports(baseline, current, threshold=DEFAULT_REGRESSION_THRESHOLD):
+    """Сравнивает p50 с эталоном; возвращает строки (имя, было, стало, изменение, регрессия)."""
+
+    rows = []
+    for name, stats in current['results'].items():
+        before = baseline['results'].get(name)
+        if not before:
+            continue
+        old, new = before['p50_ms'], stats['p50_ms']
+        change = (new - old) / old if old else 0.0
+        rows.append((name, old, new, change, change > threshold))
+    return rows
+
+
+def format_table(results):
+    lines = [f"{'benchmark':<44} {'ops/s':>12} {'p50 ms':>10} {'p99 ms':>10} {'peak KiB':>10}"]
+    for name, stats in results.items():
+        lines.append(
+            f"{name:<44} {stats['ops_per_sec']:>12.1f} {stats['p50_ms']:>10.4f}"
+            f" {stats['p99_ms']:>10.4f} {stats['peak_memory_kb']:>10.1f}"
+        )
+    return '\n'.join(lines)
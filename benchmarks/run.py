@@ -0,0 +1,157 @@
+"""Запуск офлайн-бенчмарков.
+
+    python -m benchmarks.run [--backend lxml] [--iterations 200]
+                             [--output benchmarks/results/latest.json]
+                             [--baseline benchmarks/results/before.json]
+
+Сеть не используется: страницы берутся из `benchmarks.fixtures`, а GitHub
+подменяется `FakeGitHubClient`.
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+
+from benchmarks.fixtures import PARSER_CONFIG, load_fixtures, make_candidates
+from benchmarks.harness import (
+    DEFAULT_REGRESSION_THRESHOLD,
+    build_report,
+    compare_reports,
+    format_table,
+    load_report,
+    measure,
+    save_report,
+)
+from src.core.runner import update_once
+from src.core.selection import enforce_status_length, select_quote_for_length
+from src.github.status_client import StatusResult
+from src.parser.site_parser import QuoteParser
+
+
+DEFAULT_OUTPUT = 'benchmarks/results/latest.json'
+
+
+class FixtureResponse:
+    def __init__(self, text):
+        self.text = text
+        self.status_code = 200
+        self.headers = {'Content-Type': 'text/html; charset=utf-8'}
+
+    def raise_for_status(self):
+        return None
+
+
+class FixtureSession:
+    """Замена `requests.Session`, всегда отдающая одну и ту же страницу."""
+
+    def __init__(self, text):
+        self._response = FixtureResponse(text)
+        self.adapters = {}
+
+    def get(self, url, **kwargs):
+        return self._response
+
+    def close(self):
+        return None
+
+
+class FakeGitHubClient:
+    """GitHub-клиент без сети: запоминает статус и сразу «подтверждает» его."""
+
+    def __init__(self):
+        self.debug = False
+        self.status = None
+        self.skipped_updates = 0
+
+    def set_status(self, message, *, emoji=None, expires_in_seconds=None):
+        self.status = StatusResult(message=message, emoji=emoji, expires_at=None)
+        return self.status
+
+    def verify_status(self, expected_message, **kwargs):
+        return self.status is not None and self.status.message == expected_message, self.status
+
+
+def make_fixture_parser(html, backend=None):
+    return QuoteParser(
+        'https://citaty.info/random',
+        PARSER_CONFIG['quote_selector'],
+        PARSER_CONFIG['source_selector'],
+        PARSER_CONFIG['source_attr'],
+        PARSER_CONFIG['block_selector'],
+        session=FixtureSession(html),
+        backend=backend,
+    )
+
+
+def run_benchmarks(iterations=100, backend=None, max_status_length=80, warmup=5):
+    """Выполняет все бенчмарки и возвращает словарь «имя → статистика»."""
+
+    def bench(fn):
+        return measure(fn, iterations, warmup)
+
+    results = {}
+    fixtures = load_fixtures()
+
+    for name, html in fixtures.items():
+        parser = make_fixture_parser(html, backend)
+        results[f'fetch_all[{name}]'] = bench(parser.fetch_all)
+
+    # `first` обычно останавливается на первых кандидатах; `longest` и лимит,
+    # в который не помещается ничего, заставляют просмотреть весь список.
+    for count in (20, 10_000):
+        candidates = make_candidates(count)
+        for label, limit, policy in (
+            ('first', max_status_length, 'first'),
+            ('longest', max_status_length, 'longest'),
+            ('no-fit', 5, 'first'),
+        ):
+            results[f'select_quote_for_length[{count},{label}]'] = bench(
+                lambda: select_quote_for_length(candidates, limit, policy)
+            )
+
+    long_message = '"' + 'слово ' * 40 + '" — Автор'
+    results['enforce_status_length'] = bench(
+        lambda: enforce_status_length(long_message, max_status_length)
+    )
+
+    parser = make_fixture_parser(fixtures['typical'], backend)
+    client = FakeGitHubClient()
+
+    def cycle():
+        with contextlib.redirect_stdout(io.StringIO()):
+            update_once(parser, client, 3600, max_status_length, True, 1, 0.0)
+
+    results['update_once[typical]'] = bench(cycle)
+    return results
+
+
+def main(argv=None):
+    cli = argparse.ArgumentParser(description='Офлайн-бенчмарки auto_quoter')
+    cli.add_argument('--iterations', type=int, default=100)
+    cli.add_argument('--backend', default=None, help='parser.backend: html.parser, lxml, selectolax')
+    cli.add_argument('--output', default=DEFAULT_OUTPUT)
+    cli.add_argument('--baseline', default=None, help='JSON предыдущего прогона для сравнения')
+    cli.add_argument('--threshold', type=float, default=DEFAULT_REGRESSION_THRESHOLD)
+    args = cli.parse_args(argv)
+
+    results = run_benchmarks(iterations=args.iterations, backend=args.backend)
+    report = build_report(results, backend=args.backend or 'html.parser', iterations=args.iterations)
+    print(format_table(results))
+    save_report(report, args.output)
+    print(f"\nРезультаты сохранены в {args.output}")
+
+    if not args.baseline:
+        return 0
+
+    regressions = 0
+    print(f"\nСравнение p50 с {args.baseline}:")
+    for name, old, new, change, regressed in compare_reports(load_report(args.baseline), report, args.threshold):
+        marker = '  РЕГРЕССИЯ' if regressed else ''
+        print(f"{name:<44} {old:>10.4f} → {new:>10.4f} ms ({change:+.1%}){marker}")
+        regressions += regressed
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,412 @@
+"""Локальные HTTP-заглушки citaty.info и GitHub GraphQL для нагрузочных тестов.
+
+    python -m benchmarks.servers [--latency-ms 50] [--jitter-ms 20] [--error-rate 0.05]
+                                 [--quotes 20] [--pages-dir recorded/]
+                                 [--rate-limit 5000] [--reset-seconds 3600]
+
+`FakeCitatyServer` отдаёт листинги цитат (записанные HTML-файлы или
+детерминированные страницы из `benchmarks.fixtures`), `FakeGitHubServer`
+реализует `changeUserStatus` (в том числе пакетный, с алиасами) и
+`viewer { status }` вместе с `rateLimit` и заголовками `X-RateLimit-*`.
+Оба сервера — настоящие `ThreadingHTTPServer` с keep-alive, поэтому через них
+проходит реальный HTTP-стек `requests`: пулы соединений, таймауты, повторы и
+ограничение частоты запросов. Задержка, разброс и доля ответов 503
+настраиваются для каждого сервера отдельно. `GET /_stats` отдаёт счётчики
+сервера в JSON (без задержки и не учитываясь в них), так что их можно снять и
+с заглушек, запущенных отдельным процессом.
+"""
+
+import argparse
+from abc import ABC, abstractmethod
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.fixtures import FIXTURE_SIZES, make_listing_page
+
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PAGE_COUNT = 8
+DEFAULT_RATE_LIMIT = 5000
+DEFAULT_RESET_SECONDS = 3600
+# GitHub не принимает статус длиннее 80 символов
+DEFAULT_MAX_MESSAGE_LENGTH = 80
+STATS_PATH = '/_stats'
+
+_MUTATION_FIELD = re.compile(r'(?:(\w+)\s*:\s*)?changeUserStatus\s*\(\s*input\s*:\s*\$(\w+)\s*\)')
+
+
+class StubServer(ABC):
+    """HTTP-сервер в фоновом потоке с искусственной задержкой и ошибками.
+
+    Наследники реализуют `handle(method, path, headers, body)` и возвращают
+    `(код, заголовки, тело)`. Перед ответом каждый запрос ждёт
+    `latency + uniform(0, jitter)` секунд, а с вероятностью `error_rate`
+    получает 503 вместо ответа.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=0, latency=0.0, jitter=0.0, error_rate=0.0, seed=0):
+        self.latency = max(0.0, float(latency))
+        self.jitter = max(0.0, float(jitter))
+        self.error_rate = min(1.0, max(0.0, float(error_rate)))
+        self.requests = 0
+        self.errors = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = _QuietHTTPServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def address(self):
+        host, port = self._server.server_address[:2]
+        return host, port
+
+    @property
+    def base_url(self):
+        host, port = self.address
+        return f'http://{host}:{port}'
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._server.serve_forever, name=f'{type(self).__name__}-http', daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def close(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def stats(self):
+        with self._lock:
+            return {'requests': self.requests, 'errors': self.errors}
+
+    @abstractmethod
+    def handle(self, method, path, headers, body):
+        """Ответ на запрос: `(код, заголовки, тело)`."""
+
+    def respond(self, method, path, headers, body):
+        """Задержка, случайная ошибка или ответ `handle`."""
+
+        if method == 'GET' and path == STATS_PATH:
+            return _json(200, self.stats())
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + (self._rng.uniform(0.0, self.jitter) if self.jitter else 0.0)
+            failed = self._rng.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        if delay:
+            time.sleep(delay)
+        if failed:
+            return 503, {'Content-Type': 'text/plain; charset=utf-8'}, b'Service Unavailable'
+        return self.handle(method, path, headers, body)
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        # клиент, оборвавший соединение (таймаут, отмена запроса), — не ошибка сервера
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+
+def _make_handler(stub):
+    class StubHandler(BaseHTTPRequestHandler):
+        # keep-alive, как у настоящих серверов: иначе пул соединений клиента не проверить
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):  # noqa: N802 - имя задано http.server
+            self._dispatch('GET')
+
+        def do_POST(self):  # noqa: N802 - имя задано http.server
+            self._dispatch('POST')
+
+        def _dispatch(self, method):
+            length = int(self.headers.get('Content-Length') or 0)
+            body = self.rfile.read(length) if length else b''
+            path = self.path.split('?', 1)[0]
+            status, headers, payload = stub.respond(method, path, self.headers, body)
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, str(value))
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            # тысячи запросов нагрузочного теста не засоряют вывод
+            pass
+
+    return StubHandler
+
+
+def load_pages(directory):
+    """Читает записанные страницы (`*.html`) из каталога в алфавитном порядке."""
+
+    pages = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith('.html'):
+            with open(os.path.join(directory, name), encoding='utf-8') as f:
+                pages.append(f.read())
+    if not pages:
+        raise ValueError(f"В каталоге {directory} нет файлов *.html")
+    return pages
+
+
+class FakeCitatyServer(StubServer):
+    """Заглушка citaty.info: `/random` — случайная страница, `/page/<n>` — n-я по кругу.
+
+    `pages` — готовые HTML (например, из `load_pages`); без них генерируется
+    `page_count` листингов по `quotes_per_page` цитат.
+    """
+
+    def __init__(
+        self,
+        pages=None,
+        quotes_per_page=FIXTURE_SIZES['typical'],
+        page_count=DEFAULT_PAGE_COUNT,
+        seed=0,
+        **kwargs,
+    ):
+        super().__init__(seed=seed, **kwargs)
+        if pages is None:
+            pages = [make_listing_page(quotes_per_page, seed=seed + idx) for idx in range(max(1, page_count))]
+        self.pages = [page.encode('utf-8') for page in pages]
+        self.bytes_sent = 0
+
+    @property
+    def url(self):
+        return f'{self.base_url}/random'
+
+    def stats(self):
+        result = super().stats()
+        with self._lock:
+            result['bytes_sent'] = self.bytes_sent
+        return result
+
+    def handle(self, method, path, headers, body):
+        if method != 'GET':
+            return 405, {}, b''
+        if path == '/random':
+            with self._lock:
+                page = self._rng.choice(self.pages)
+        elif path.startswith('/page/') and path[len('/page/'):].isdigit():
+            page = self.pages[int(path[len('/page/'):]) % len(self.pages)]
+        else:
+            return 404, {}, b''
+        with self._lock:
+            self.bytes_sent += len(page)
+        return 200, {'Content-Type': 'text/html; charset=utf-8'}, page
+
+
+class FakeGitHubServer(StubServer):
+    """Заглушка GitHub GraphQL (`POST /graphql`) с бюджетом запросов на токен.
+
+    Каждый запрос стоит одно очко из `rate_limit`; бюджет восстанавливается
+    через `reset_seconds`. Исчерпанный бюджет даёт 403 с
+    `X-RateLimit-Remaining: 0`, как у GitHub. Статусы хранятся отдельно для
+    каждого токена, так что один сервер обслуживает сотни аккаунтов.
+    """
+
+    def __init__(
+        self,
+        rate_limit=DEFAULT_RATE_LIMIT,
+        reset_seconds=DEFAULT_RESET_SECONDS,
+        max_message_length=DEFAULT_MAX_MESSAGE_LENGTH,
+        clock=time.time,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.rate_limit = max(0, int(rate_limit))
+        self.reset_seconds = max(1, int(reset_seconds))
+        self.max_message_length = max_message_length
+        self.mutations = 0
+        self.queries = 0
+        self.rate_limited = 0
+        self._clock = clock
+        self._tokens = {}
+
+    @property
+    def url(self):
+        return f'{self.base_url}/graphql'
+
+    def status_for(self, token):
+        """Текущий статус аккаунта с токеном `token` (`None`, если не задан)."""
+
+        with self._lock:
+            state = self._tokens.get(token)
+            return dict(state['status']) if state and state['status'] else None
+
+    def stats(self):
+        result = super().stats()
+        with self._lock:
+            result.update(
+                mutations=self.mutations,
+                queries=self.queries,
+                rate_limited=self.rate_limited,
+                tokens=len(self._tokens),
+            )
+        return result
+
+    def handle(self, method, path, headers, body):
+        if path != '/graphql':
+            return 404, {}, b''
+        if method != 'POST':
+            return 405, {}, b''
+        auth = headers.get('Authorization') or ''
+        if not auth.startswith('Bearer ') or not auth[len('Bearer '):].strip():
+            return _json(401, {'message': 'Bad credentials'})
+        token = auth[len('Bearer '):].strip()
+
+        with self._lock:
+            state = self._charge(token)
+            limit_headers = self._limit_headers(state)
+            if state['remaining'] < 0:
+                state['remaining'] = 0
+                self.rate_limited += 1
+                limit_headers['X-RateLimit-Remaining'] = 0
+                return _json(403, {'message': 'API rate limit exceeded'}, limit_headers)
+
+        try:
+            payload = json.loads(body or b'{}')
+        except ValueError:
+            return _json(400, {'message': 'Problems parsing JSON'}, limit_headers)
+        query = payload.get('query') or ''
+        variables = payload.get('variables') or {}
+
+        with self._lock:
+            if 'changeUserStatus' in query:
+                self.mutations += 1
+                result = self._change_status(state, query, variables)
+            elif 'viewer' in query:
+                self.queries += 1
+                result = self._viewer(state, query)
+            else:
+                result = {'errors': [{'message': 'Unsupported query'}]}
+        return _json(200, result, limit_headers)
+
+    def _charge(self, token):
+        now = self._clock()
+        state = self._tokens.get(token)
+        if state is None or now >= state['reset_at']:
+            state = self._tokens[token] = {
+                'status': state['status'] if state else None,
+                'remaining': self.rate_limit,
+                'reset_at': int(now) + self.reset_seconds,
+            }
+        state['remaining'] -= 1
+        return state
+
+    def _limit_headers(self, state):
+        remaining = max(0, state['remaining'])
+        return {
+            'X-RateLimit-Limit': self.rate_limit,
+            'X-RateLimit-Remaining': remaining,
+            'X-RateLimit-Used': self.rate_limit - remaining,
+            'X-RateLimit-Reset': state['reset_at'],
+            'X-RateLimit-Resource': 'graphql',
+        }
+
+    def _change_status(self, state, query, variables):
+        data, errors = {}, []
+        for match in _MUTATION_FIELD.finditer(query):
+            key = match.group(1) or 'changeUserStatus'
+            status_input = variables.get(match.group(2)) or {}
+            message = status_input.get('message') or ''
+            if len(message) > self.max_message_length:
+                data[key] = None
+                errors.append({
+                    'type': 'UNPROCESSABLE',
+                    'path': [key],
+                    'message': f'Message is too long (maximum is {self.max_message_length} characters)',
+                })
+                continue
+            state['status'] = {
+                'message': message,
+                'emoji': status_input.get('emoji'),
+                'expiresAt': status_input.get('expiresAt'),
+            }
+            data[key] = {'status': dict(state['status'])}
+        result = {'data': data}
+        if errors:
+            result['errors'] = errors
+        return result
+
+    def _viewer(self, state, query):
+        data = {'viewer': {'status': dict(state['status']) if state['status'] else None}}
+        if 'rateLimit' in query:
+            reset_at = datetime.fromtimestamp(state['reset_at'], timezone.utc)
+            data['rateLimit'] = {
+                'limit': self.rate_limit,
+                'cost': 1,
+                'remaining': max(0, state['remaining']),
+                'resetAt': reset_at.isoformat().replace('+00:00', 'Z'),
+            }
+        return {'data': data}
+
+
+def _json(status, payload, headers=None):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    return status, {'Content-Type': 'application/json; charset=utf-8', **(headers or {})}, body
+
+
+def main(argv=None):
+    cli = argparse.ArgumentParser(description='Локальные заглушки citaty.info и GitHub GraphQL')
+    cli.add_argument('--host', default=DEFAULT_HOST)
+    cli.add_argument('--citaty-port', type=int, default=8081)
+    cli.add_argument('--github-port', type=int, default=8082)
+    cli.add_argument('--latency-ms', type=float, default=0.0, help='задержка каждого ответа')
+    cli.add_argument('--jitter-ms', type=float, default=0.0, help='случайная добавка к задержке')
+    cli.add_argument('--error-rate', type=float, default=0.0, help='доля ответов 503, 0..1')
+    cli.add_argument('--quotes', type=int, default=FIXTURE_SIZES['typical'], help='цитат на странице')
+    cli.add_argument('--pages-dir', default=None, help='каталог с записанными страницами *.html')
+    cli.add_argument('--rate-limit', type=int, default=DEFAULT_RATE_LIMIT, help='запросов на токен до сброса')
+    cli.add_argument('--reset-seconds', type=int, default=DEFAULT_RESET_SECONDS)
+    args = cli.parse_args(argv)
+
+    common = {
+        'host': args.host,
+        'latency': args.latency_ms / 1000,
+        'jitter': args.jitter_ms / 1000,
+        'error_rate': args.error_rate,
+    }
+    pages = load_pages(args.pages_dir) if args.pages_dir else None
+    citaty = FakeCitatyServer(pages=pages, quotes_per_page=args.quotes, port=args.citaty_port, **common)
+    github = FakeGitHubServer(
+        rate_limit=args.rate_limit, reset_seconds=args.reset_seconds, port=args.github_port, **common
+    )
+
+    with citaty, github:
+        print(f"citaty.info: {citaty.url}  (parser.url)")
+        print(f"GitHub GraphQL: {github.url}  (github.graphql_url, любой непустой токен)")
+        print("Ctrl+C — остановить")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        print(f"citaty.info: {citaty.stats()}")
+        print(f"GitHub: {github.stats()}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
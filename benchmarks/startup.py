@@ -0,0 +1,134 @@
+"""Бенчмарк холодного старта на основе `python -X importtime`.
+
+    python -m benchmarks.startup [--module main] [--module src.core.runner]
+                                 [--runs 5] [--budget-ms 50]
+                                 [--forbid requests --forbid bs4]
+
+Для каждого модуля запускается отдельный интерпретатор с `-X importtime`;
+из его stderr берётся суммарное время импорта (медиана по `--runs` запускам)
+и самые тяжёлые модули. Скрипт завершается с кодом 1, если у какого-либо из
+модулей медиана превысила `--budget-ms` или загрузился модуль из `--forbid`.
+`src.core.runner` — то, что на самом деле загружает `python main.py` до чтения
+конфига, поэтому проверяется вместе с `main`.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+
+DEFAULT_MODULES = ('main', 'src.core.runner')
+DEFAULT_RUNS = 5
+DEFAULT_BUDGET_MS = 50.0
+# зависимости, которые не должны загружаться до чтения конфига
+DEFAULT_FORBIDDEN = ('requests', 'bs4', 'soupsieve', 'lxml', 'selectolax')
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_importtime(stderr):
+    """Разбирает вывод `-X importtime` в список `(модуль, self_us, cumulative_us, глубина)`."""
+
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # строка заголовка
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(parts[0]), int(parts[1]), depth))
+    return rows
+
+
+def measure_import(module, python=sys.executable, cwd=ROOT_DIR):
+    """Один холодный импорт `module` в новом интерпретаторе."""
+
+    result = subprocess.run(
+        [python, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = parse_importtime(result.stderr)
+    # всё до `site` включительно — старт самого интерпретатора
+    start = next((idx for idx, row in enumerate(rows) if row[0] == 'site' and row[3] == 0), -1)
+    own = rows[start + 1:]
+    return {
+        'total_us': sum(self_us for _, self_us, _, _ in own),
+        'modules': [name for name, _, _, _ in own],
+        'heaviest': sorted(
+            ((name, cumulative) for name, _, cumulative, depth in own if depth == 1),
+            key=lambda item: item[1],
+            reverse=True,
+        ),
+    }
+
+
+def run_startup_benchmark(modules=DEFAULT_MODULES, runs=DEFAULT_RUNS, python=sys.executable):
+    results = {}
+    for module in modules:
+        samples = [measure_import(module, python=python) for _ in range(max(1, runs))]
+        totals = sorted(sample['total_us'] / 1000 for sample in samples)
+        results[module] = {
+            'median_ms': statistics.median(totals),
+            'min_ms': totals[0],
+            'max_ms': totals[-1],
+            'modules': samples[-1]['modules'],
+            'heaviest': samples[-1]['heaviest'][:10],
+        }
+    return results
+
+
+def forbidden_imports(modules, forbidden=DEFAULT_FORBIDDEN):
+    """Запрещённые пакеты (или их подмодули) среди загруженных модулей."""
+
+    return sorted(
+        {name.split('.')[0] for name in modules if name.split('.')[0] in set(forbidden)}
+    )
+
+
+def check_startup(results, forbidden=DEFAULT_FORBIDDEN, budget_ms=DEFAULT_BUDGET_MS):
+    """Нарушения бюджета и запрещённые импорты: список строк `(модуль, описание)`."""
+
+    failures = []
+    for module, stats in results.items():
+        leaked = forbidden_imports(stats['modules'], forbidden)
+        if leaked:
+            failures.append((module, f"загружает {', '.join(leaked)}"))
+        if stats['median_ms'] > budget_ms:
+            failures.append((module, f"импорт дольше бюджета {budget_ms:.1f} ms"))
+    return failures
+
+
+def main(argv=None):
+    cli = argparse.ArgumentParser(description='Время холодного импорта auto_quoter')
+    cli.add_argument('--module', action='append', dest='modules', help='модуль для импорта')
+    cli.add_argument('--runs', type=int, default=DEFAULT_RUNS)
+    cli.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS, help='бюджет на модуль')
+    cli.add_argument('--forbid', action='append', default=None, help='пакет, запрещённый при импорте')
+    args = cli.parse_args(argv)
+
+    modules = args.modules or list(DEFAULT_MODULES)
+    forbidden = args.forbid or list(DEFAULT_FORBIDDEN)
+    results = run_startup_benchmark(modules, runs=args.runs)
+
+    for module, stats in results.items():
+        print(
+            f"{module:<24} median {stats['median_ms']:8.2f} ms"
+            f"  (min {stats['min_ms']:.2f}, max {stats['max_ms']:.2f}, модулей {len(stats['modules'])})"
+        )
+        for name, cumulative in stats['heaviest'][:5]:
+            print(f"    {name:<40} {cumulative / 1000:8.2f} ms")
+
+    failures = check_startup(results, forbidden, args.budget_ms)
+    for module, problem in failures:
+        print(f"ОШИБКА: `import {module}` {problem}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
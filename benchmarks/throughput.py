@@ -0,0 +1,367 @@
+"""Сценарный бенчмарк: цикл обновления для N аккаунтов через локальные заглушки.
+
+    python -m benchmarks.throughput [--accounts 200] [--cycles 20] [--duration 600]
+                                    [--latency-ms 20] [--jitter-ms 10] [--error-rate 0.01]
+                                    [--workers 8] [--in-process]
+                                    [--output benchmarks/results/throughput.json]
+                                    [--baseline benchmarks/results/throughput-before.json]
+                                    [--max-growth-kb 64]
+
+Каждый цикл — `update_accounts_once`: одна цитата с `FakeCitatyServer`
+публикуется всем аккаунтам через `FakeGitHubServer` (см. `benchmarks.servers`).
+Парсер, сессии и клиенты живут весь прогон, как в режиме `loop: true`, поэтому
+рост памяти от цикла к циклу указывает на утечку; `--duration` превращает
+прогон в soak-тест заданной длительности.
+
+Заглушки по умолчанию запускаются отдельным процессом, чтобы процессорное
+время и память относились только к auto_quoter; их счётчики берутся из
+`/_stats`. С `--in-process` они работают в потоках этого же процесса (быстрее
+стартует, но CPU серверов попадает в замер).
+
+В отчёте: статусов в секунду, HTTP-запросов и секунд CPU на одно обновление,
+p50/p99 длительности цикла, средние времена стадий из `src.core.metrics`,
+RSS до и после и наклон роста RSS (KiB за цикл) после прогрева.
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+from benchmarks.fixtures import FIXTURE_SIZES, PARSER_CONFIG
+from benchmarks.harness import (
+    DEFAULT_REGRESSION_THRESHOLD,
+    build_report,
+    compare_reports,
+    load_report,
+    percentile,
+    save_report,
+)
+from benchmarks.servers import STATS_PATH, FakeCitatyServer, FakeGitHubServer
+from src.core.builders import build_github_accounts, build_parser
+from src.core.metrics import REGISTRY
+from src.core.runner import DEFAULT_FANOUT_WORKERS, update_accounts_once
+from src.core.selection import DEFAULT_MAX_STATUS_LENGTH
+
+
+DEFAULT_OUTPUT = 'benchmarks/results/throughput.json'
+DEFAULT_ACCOUNTS = 50
+DEFAULT_CYCLES = 10
+DEFAULT_WARMUP = 1
+# бюджет заглушки GitHub заведомо больше прогона: меряется auto_quoter, а не лимит
+DEFAULT_BENCH_RATE_LIMIT = 1_000_000
+SERVER_START_TIMEOUT = 10.0
+
+_URL = re.compile(r'https?://\S+')
+
+
+class LocalServers:
+    """Пара заглушек в дочернем процессе (`python -m benchmarks.servers`) или в потоках."""
+
+    def __init__(
+        self,
+        in_process=False,
+        latency=0.0,
+        jitter=0.0,
+        error_rate=0.0,
+        quotes=FIXTURE_SIZES['typical'],
+        rate_limit=DEFAULT_BENCH_RATE_LIMIT,
+    ):
+        self.in_process = in_process
+        self.options = {'latency': latency, 'jitter': jitter, 'error_rate': error_rate}
+        self.quotes = quotes
+        self.rate_limit = rate_limit
+        self.citaty_url = None
+        self.github_url = None
+        self._servers = []
+        self._process = None
+
+    def start(self):
+        if self.in_process:
+            citaty = FakeCitatyServer(quotes_per_page=self.quotes, **self.options).start()
+            github = FakeGitHubServer(rate_limit=self.rate_limit, **self.options).start()
+            self._servers = [citaty, github]
+            self.citaty_url, self.github_url = citaty.url, github.url
+            return self
+
+        cmd = [
+            sys.executable, '-u', '-m', 'benchmarks.servers',
+            '--citaty-port', '0',
+            '--github-port', '0',
+            '--latency-ms', str(self.options['latency'] * 1000),
+            '--jitter-ms', str(self.options['jitter'] * 1000),
+            '--error-rate', str(self.options['error_rate']),
+            '--quotes', str(self.quotes),
+            '--rate-limit', str(self.rate_limit),
+        ]
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self._process = subprocess.Popen(cmd, cwd=root, stdout=subprocess.PIPE, text=True)
+        # первые две строки вывода — адреса citaty.info и GitHub
+        urls = []
+        deadline = time.monotonic() + SERVER_START_TIMEOUT
+        while len(urls) < 2 and time.monotonic() < deadline:
+            line = self._process.stdout.readline()
+            if not line:
+                break
+            urls.extend(_URL.findall(line))
+        if len(urls) < 2:
+            self.close()
+            raise RuntimeError("Заглушки не запустились")
+        self.citaty_url, self.github_url = urls[:2]
+        return self
+
+    def stats(self):
+        """Счётчики заглушек: `{'citaty': {...}, 'github': {...}}`."""
+
+        if self._servers:
+            citaty, github = self._servers
+            return {'citaty': citaty.stats(), 'github': github.stats()}
+        return {
+            'citaty': _fetch_stats(self.citaty_url),
+            'github': _fetch_stats(self.github_url),
+        }
+
+    def close(self):
+        for server in self._servers:
+            server.close()
+        self._servers = []
+        if self._process is not None:
+            self._process.terminate()
+            self._process.wait()
+            self._process.stdout.close()
+            self._process = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _fetch_stats(url):
+    base = url.rsplit('/', 1)[0]
+    with urllib.request.urlopen(base + STATS_PATH, timeout=5) as response:
+        return json.load(response)
+
+
+def rss_kb():
+    """Текущий RSS процесса в KiB (Linux); на других ОС — пиковый RSS."""
+
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 if sys.platform == 'darwin' else float(peak)
+
+
+def growth_slope(samples):
+    """Наклон линейной регрессии по замерам (прирост за цикл)."""
+
+    if len(samples) < 2:
+        return 0.0
+    return statistics.linear_regression(range(len(samples)), samples).slope
+
+
+def build_bench_accounts(github_url, count, max_wait_seconds=5.0):
+    """`count` аккаунтов с уникальными токенами; общий пул соединений, как в `main`."""
+
+    prefix = f'bench-{os.getpid()}-{time.monotonic_ns()}'
+    config = {
+        'graphql_url': github_url,
+        'verify_mode': 'auto',
+        'rate_limit': {'min_interval_seconds': 0, 'max_wait_seconds': max_wait_seconds},
+        'status_cache': {'enabled': False},
+        'accounts': [{'name': f'account-{idx}', 'token': f'{prefix}-{idx}'} for idx in range(count)],
+    }
+    return build_github_accounts(config, DEFAULT_MAX_STATUS_LENGTH, 0)
+
+
+def build_bench_parser(citaty_url):
+    parser_cfg = {
+        'url': citaty_url,
+        **PARSER_CONFIG,
+        'session': {'pool_size': 2, 'max_retries': 2, 'backoff_factor': 0.0},
+    }
+    return build_parser({'parser': parser_cfg, 'timeout': 10})
+
+
+def run_throughput(
+    accounts=DEFAULT_ACCOUNTS,
+    cycles=DEFAULT_CYCLES,
+    duration=None,
+    warmup=DEFAULT_WARMUP,
+    workers=DEFAULT_FANOUT_WORKERS,
+    in_process=False,
+    latency=0.0,
+    jitter=0.0,
+    error_rate=0.0,
+    quotes=FIXTURE_SIZES['typical'],
+    parser_max_attempts=3,
+):
+    """Прогоняет `cycles` циклов (или циклы в течение `duration` секунд) и возвращает сводку."""
+
+    servers = LocalServers(
+        in_process=in_process, latency=latency, jitter=jitter, error_rate=error_rate, quotes=quotes
+    )
+    with servers:
+        parser = build_bench_parser(servers.citaty_url)
+        bench_accounts = build_bench_accounts(servers.github_url, accounts)
+
+        def cycle():
+            return update_accounts_once(
+                parser, bench_accounts, parser_max_attempts, 0.0, max_workers=workers
+            )
+
+        durations = []
+        rss_samples = []
+        failed = 0
+        # вывод циклов уходит в /dev/null: буфер в памяти исказил бы замер роста памяти
+        with open(os.devnull, 'w') as sink, contextlib.redirect_stdout(sink):
+            try:
+                for _ in range(max(0, warmup)):
+                    cycle()
+                gc.collect()
+                REGISTRY.reset()
+                before = servers.stats()
+                rss_start = rss_kb()
+                cpu_started = time.process_time()
+                wall_started = time.perf_counter()
+
+                while True:
+                    elapsed = time.perf_counter() - wall_started
+                    if duration is not None and elapsed >= duration:
+                        break
+                    if duration is None and len(durations) >= max(1, cycles):
+                        break
+                    started = time.perf_counter()
+                    if not cycle():
+                        failed += 1
+                    durations.append(time.perf_counter() - started)
+                    rss_samples.append(rss_kb())
+
+                wall = time.perf_counter() - wall_started
+                cpu = time.process_time() - cpu_started
+                after = servers.stats()
+                gc.collect()
+                rss_end = rss_kb()
+            finally:
+                parser.close()
+
+    updates = after['github']['mutations'] - before['github']['mutations']
+    http_requests = sum(after[name]['requests'] - before[name]['requests'] for name in ('citaty', 'github'))
+    server_errors = sum(after[name]['errors'] - before[name]['errors'] for name in ('citaty', 'github'))
+    durations.sort()
+    stages = REGISTRY.snapshot()['stages']
+    return {
+        'accounts': len(bench_accounts),
+        'cycles': len(durations),
+        'failed_cycles': failed,
+        'wall_seconds': wall,
+        'updates': updates,
+        'updates_per_sec': updates / wall if wall else 0.0,
+        'http_requests': http_requests,
+        'requests_per_update': http_requests / updates if updates else 0.0,
+        'cpu_seconds': cpu,
+        'cpu_seconds_per_update': cpu / updates if updates else 0.0,
+        'server_errors': server_errors,
+        'p50_ms': percentile(durations, 0.50) * 1000,
+        'p99_ms': percentile(durations, 0.99) * 1000,
+        'stage_mean_ms': {name: summary['mean_seconds'] * 1000 for name, summary in stages.items()},
+        'rss_start_kb': rss_start,
+        'rss_end_kb': rss_end,
+        'rss_growth_kb': rss_end - rss_start,
+        'rss_growth_kb_per_cycle': growth_slope(rss_samples),
+    }
+
+
+def format_summary(name, stats):
+    lines = [
+        f"{name}: {stats['cycles']} циклов за {stats['wall_seconds']:.2f} с"
+        f" (неудачных {stats['failed_cycles']}, ответов 503 {stats['server_errors']})",
+        f"  статусов обновлено      {stats['updates']:>10}  ({stats['updates_per_sec']:.1f} в секунду)",
+        f"  HTTP-запросов на статус {stats['requests_per_update']:>10.2f}",
+        f"  CPU на статус           {stats['cpu_seconds_per_update'] * 1000:>10.3f} ms",
+        f"  цикл p50 / p99          {stats['p50_ms']:>10.1f} / {stats['p99_ms']:.1f} ms",
+        f"  RSS                     {stats['rss_start_kb']:>10.0f} → {stats['rss_end_kb']:.0f} KiB"
+        f" ({stats['rss_growth_kb_per_cycle']:+.2f} KiB за цикл)",
+    ]
+    for stage, mean_ms in sorted(stats['stage_mean_ms'].items()):
+        lines.append(f"  стадия {stage:<16} {mean_ms:>10.2f} ms в среднем")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    cli = argparse.ArgumentParser(description='Пропускная способность многоаккаунтного цикла auto_quoter')
+    cli.add_argument('--accounts', type=int, default=DEFAULT_ACCOUNTS)
+    cli.add_argument('--cycles', type=int, default=DEFAULT_CYCLES)
+    cli.add_argument('--duration', type=float, default=None, help='soak: секунд прогона вместо --cycles')
+    cli.add_argument('--warmup', type=int, default=DEFAULT_WARMUP)
+    cli.add_argument('--workers', type=int, default=DEFAULT_FANOUT_WORKERS, help='потоков рассылки статусов')
+    cli.add_argument('--latency-ms', type=float, default=0.0)
+    cli.add_argument('--jitter-ms', type=float, default=0.0)
+    cli.add_argument('--error-rate', type=float, default=0.0)
+    cli.add_argument('--quotes', type=int, default=FIXTURE_SIZES['typical'], help='цитат на странице')
+    cli.add_argument('--in-process', action='store_true', help='заглушки в потоках этого процесса')
+    cli.add_argument('--output', default=DEFAULT_OUTPUT)
+    cli.add_argument('--baseline', default=None, help='JSON предыдущего прогона для сравнения p50 цикла')
+    cli.add_argument('--threshold', type=float, default=DEFAULT_REGRESSION_THRESHOLD)
+    cli.add_argument(
+        '--max-growth-kb', type=float, default=None, help='ошибка, если RSS растёт быстрее (KiB за цикл)'
+    )
+    args = cli.parse_args(argv)
+
+    stats = run_throughput(
+        accounts=args.accounts,
+        cycles=args.cycles,
+        duration=args.duration,
+        warmup=args.warmup,
+        workers=args.workers,
+        in_process=args.in_process,
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        quotes=args.quotes,
+    )
+    name = f'update_accounts_once[{args.accounts} accounts]'
+    print(format_summary(name, stats))
+    report = build_report(
+        {name: stats},
+        servers='in-process' if args.in_process else 'subprocess',
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        workers=args.workers,
+    )
+    save_report(report, args.output)
+    print(f"\nРезультаты сохранены в {args.output}")
+
+    failures = 0
+    if args.max_growth_kb is not None and stats['rss_growth_kb_per_cycle'] > args.max_growth_kb:
+        print(f"ОШИБКА: RSS растёт на {stats['rss_growth_kb_per_cycle']:.2f} KiB за цикл")
+        failures += 1
+    if args.baseline:
+        print(f"\nСравнение p50 цикла с {args.baseline}:")
+        for row_name, old, new, change, regressed in compare_reports(
+            load_report(args.baseline), report, args.threshold
+        ):
+            marker = '  РЕГРЕССИЯ' if regressed else ''
+            print(f"{row_name:<44} {old:>10.2f} → {new:>10.2f} ms ({change:+.1%}){marker}")
+            failures += regressed
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
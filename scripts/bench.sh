@@ -0,0 +1,18 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# Запуск офлайн-бенчмарков. Аргументы передаются в `python -m benchmarks.run`
+# (например: ./scripts/bench.sh --backend lxml --baseline benchmarks/results/before.json).
+
+ROOT_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+VENV_PY="$ROOT_DIR/.venv/bin/python"
+
+cd "$ROOT_DIR"
+
+if [ -x "$VENV_PY" ]; then
+  echo "Running benchmarks with venv python: $VENV_PY"
+  "$VENV_PY" -m benchmarks.run "$@"
+else
+  echo "No .venv detected, using system python3"
+  python3 -m benchmarks.run "$@"
+fi
@@ -1,8 +1,19 @@
 """Package for auto_quoter source code.
 
 Expose subpackages for easier imports, e.g. `from src import parser, github`.
+Subpackages are imported on first access, so `import src` stays cheap.
 """
 
-from . import github, parser  # re-export packages
+import importlib
 
 __all__ = ["parser", "github"]
+
+
+def __getattr__(name):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return importlib.import_module(f".{name}", __name__)
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,22 +1,50 @@
-"""Core helpers for auto_quoter: config, builders, selection, runner."""
-from .config import load_config
-from .builders import build_parser, build_github_client
-from .selection import (
-    format_status_message,
-    enforce_status_length,
-    select_quote_for_length,
-    fetch_quote_with_retries,
-)
-from .runner import update_once, main as run_main
+"""Core helpers for auto_quoter: config, builders, selection, pool, runner.
 
-__all__ = [
-    "load_config",
-    "build_parser",
-    "build_github_client",
-    "format_status_message",
-    "enforce_status_length",
-    "select_quote_for_length",
-    "fetch_quote_with_retries",
-    "update_once",
-    "run_main",
-]
+Re-exports are resolved lazily (PEP 562): `from src.core import QuotePool`
+imports only `src.core.pool`, so a short run does not pay for every module.
+"""
+import importlib
+
+_EXPORTS = {
+    "load_config": (".config", "load_config"),
+    "build_parser": (".builders", "build_parser"),
+    "build_async_parser": (".builders", "build_async_parser"),
+    "build_github_client": (".builders", "build_github_client"),
+    "build_github_accounts": (".builders", "build_github_accounts"),
+    "Account": (".accounts", "Account"),
+    "build_quote_pool": (".builders", "build_quote_pool"),
+    "QuotePool": (".pool", "QuotePool"),
+    "build_quote_history": (".builders", "build_quote_history"),
+    "QuoteHistory": (".history", "QuoteHistory"),
+    "build_metrics_server": (".builders", "build_metrics_server"),
+    "METRICS": (".metrics", "REGISTRY"),
+    "MetricsRegistry": (".metrics", "MetricsRegistry"),
+    "MetricsServer": (".metrics", "MetricsServer"),
+    "SELECTION_POLICIES": (".selection", "SELECTION_POLICIES"),
+    "format_status_message": (".selection", "format_status_message"),
+    "enforce_status_length": (".selection", "enforce_status_length"),
+    "select_quote_for_length": (".selection", "select_quote_for_length"),
+    "fits_status_length": (".selection", "fits_status_length"),
+    "fetch_quote_with_retries": (".selection", "fetch_quote_with_retries"),
+    "fetch_quote_concurrently": (".selection", "fetch_quote_concurrently"),
+    "update_once": (".runner", "update_once"),
+    "update_accounts_once": (".runner", "update_accounts_once"),
+    "run_accounts": (".runner", "run_accounts"),
+    "run_main": (".runner", "main"),
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    try:
+        module_name, attr = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name, __name__), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
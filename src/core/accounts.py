@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List
+
+if TYPE_CHECKING:
+    from src.github.status_client import GitHubStatusClient
+
+
+@dataclass
+class Account:
+    """GitHub-аккаунт, которому раздаётся общая цитата."""
+
+    name: str
+    client: GitHubStatusClient
+    max_status_length: int
+    refresh_interval: int
+    next_due: float = 0.0
+
+    def schedule_next(self, now: float) -> None:
+        """Назначает следующий запуск; аккаунт без интервала больше не обновляется."""
+
+        if self.refresh_interval > 0:
+            self.next_due = now + self.refresh_interval
+        else:
+            self.next_due = math.inf
+
+
+def due_accounts(accounts: List[Account], now: float) -> List[Account]:
+    return [account for account in accounts if account.next_due <= now]
+
+
+def next_due_time(accounts: List[Account]) -> float:
+    return min((account.next_due for account in accounts), default=math.inf)
@@ -1,22 +1,276 @@
+"""Сборка компонентов приложения из `config.json`.
+
+Модули необязательных компонентов (агрегатор, асинхронный парсер, пул
+процессов, HTTP-кэш, SQLite-пул, клиент GitHub) импортируются внутри
+строителей: однократный запуск не платит за импорт того, что выключено
+в конфиге.
+"""
+
+from __future__ import annotations
+
+import functools
 import os
-from typing import Any, Dict, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
-from src.github.status_client import GitHubStatusClient
-from src.parser.site_parser import QuoteParser
+from src.core.accounts import Account
+from src.core.history import (
+    DEFAULT_BLOOM_CAPACITY,
+    DEFAULT_BLOOM_ERROR_RATE,
+    DEFAULT_HISTORY_MAX_AGE_DAYS,
+    DEFAULT_HISTORY_MAX_ENTRIES,
+    DEFAULT_HISTORY_PATH,
+    HISTORY_LRU,
+    HISTORY_MODES,
+    QuoteHistory,
+)
+from src.core.metrics import DEFAULT_METRICS_HOST, DEFAULT_METRICS_PORT, REGISTRY, MetricsServer
+from src.core.prefetch import DEFAULT_PREFETCH_DEPTH, DEFAULT_PREFETCH_RETRY_SECONDS, QuotePrefetcher
+from src.core.selection import (
+    DEFAULT_SELECTION_POLICY,
+    fetch_quote_concurrently,
+    fetch_quote_with_retries,
+)
 
+if TYPE_CHECKING:
+    from src.core.pool import QuotePool
+    from src.github.status_cache import StatusCache
+    from src.github.status_client import GitHubStatusClient
+    from src.parser.aggregator import QuoteAggregator
+    from src.parser.async_parser import AsyncQuoteParser
+    from src.parser.process_pool import ParsePool
+    from src.parser.site_parser import QuoteParser
 
-def build_parser(config: Dict[str, Any]) -> QuoteParser:
+
+def build_parser(config: Dict[str, Any]) -> Union[QuoteParser, QuoteAggregator]:
     parser_cfg = config.get('parser') or {}
+    timeout = config.get('timeout', 10)
+    sources_cfg = parser_cfg.get('sources')
+    parse_pool = build_parse_pool(parser_cfg)
+    if not sources_cfg:
+        return _build_quote_parser(parser_cfg, timeout, parse_pool)
+
+    from src.parser.aggregator import (
+        DEFAULT_LATENCY_TARGET,
+        DEFAULT_SOURCE_CONCURRENCY,
+        DEFAULT_WEIGHT,
+        QuoteAggregator,
+        QuoteSource,
+    )
+
+    # настройки верхнего уровня `parser` служат значениями по умолчанию для источников;
+    # `parser.concurrency` относится ко всему циклу, у источника свой бюджет запросов
+    defaults = {
+        key: value for key, value in parser_cfg.items() if key not in ('sources', 'concurrency')
+    }
+    sources = []
+    for idx, source_cfg in enumerate(sources_cfg, start=1):
+        merged = {**defaults, **source_cfg}
+        sources.append(
+            QuoteSource(
+                merged.get('name') or merged.get('url') or f'source-{idx}',
+                _build_quote_parser(merged, merged.get('timeout', timeout), parse_pool),
+                weight=merged.get('weight', DEFAULT_WEIGHT),
+                concurrency=merged.get('concurrency') or DEFAULT_SOURCE_CONCURRENCY,
+            )
+        )
+
+    return QuoteAggregator(
+        sources,
+        fanout=parser_cfg.get('fanout'),
+        latency_target=parser_cfg.get('latency_target_seconds', DEFAULT_LATENCY_TARGET),
+    )
+
+
+def build_parse_pool(parser_cfg: Dict[str, Any]) -> Optional[ParsePool]:
+    """Общий для всех источников пул процессов разбора (блок `parser.process_pool`)."""
+
+    pool_cfg = parser_cfg.get('process_pool') or {}
+    if not pool_cfg.get('enabled', False):
+        return None
+
+    from src.parser.process_pool import ParsePool
+
+    return ParsePool(workers=pool_cfg.get('workers'))
+
+
+def _build_quote_parser(
+    parser_cfg: Dict[str, Any],
+    timeout: float,
+    parse_pool: Optional[ParsePool] = None,
+) -> QuoteParser:
+    from src.parser.site_parser import (
+        DEFAULT_BACKOFF_FACTOR,
+        DEFAULT_MAX_RETRIES,
+        DEFAULT_POOL_SIZE,
+        DEFAULT_STREAM_CHUNK_SIZE,
+        QuoteParser,
+        build_session,
+    )
+
+    session_cfg = parser_cfg.get('session') or {}
+    # каждому параллельному запросу нужно своё соединение в пуле
+    concurrency = int(parser_cfg.get('concurrency', 1) or 1)
+    pool_size = max(int(session_cfg.get('pool_size', DEFAULT_POOL_SIZE)), concurrency)
+    session = build_session(
+        pool_size=pool_size,
+        max_retries=session_cfg.get('max_retries', DEFAULT_MAX_RETRIES),
+        backoff_factor=session_cfg.get('backoff_factor', DEFAULT_BACKOFF_FACTOR),
+        keep_alive=session_cfg.get('keep_alive', True),
+    )
+    cache_cfg = parser_cfg.get('cache') or {}
+    cache = None
+    if cache_cfg.get('enabled', False):
+        from src.parser.http_cache import DEFAULT_CACHE_DIR, DEFAULT_CACHE_MAX_BYTES, HttpCache
+
+        cache = HttpCache(
+            cache_cfg.get('dir') or DEFAULT_CACHE_DIR,
+            max_bytes=cache_cfg.get('max_bytes', DEFAULT_CACHE_MAX_BYTES),
+        )
     return QuoteParser(
         parser_cfg.get('url'),
         parser_cfg.get('quote_selector'),
         parser_cfg.get('source_selector'),
         parser_cfg.get('source_attr', 'data-source'),
         parser_cfg.get('block_selector'),
-        timeout=config.get('timeout', 10),
+        timeout=timeout,
+        session=session,
+        backend=parser_cfg.get('backend'),
+        streaming=parser_cfg.get('streaming', False),
+        chunk_size=parser_cfg.get('stream_chunk_size', DEFAULT_STREAM_CHUNK_SIZE),
+        cache=cache,
+        parse_pool=parse_pool,
+        metrics=REGISTRY,
+    )
+
+
+def build_async_parser(
+    config: Dict[str, Any], parser: Union[QuoteParser, QuoteAggregator]
+) -> Optional[AsyncQuoteParser]:
+    parser_cfg = config.get('parser') or {}
+    concurrency = int(parser_cfg.get('concurrency', 1) or 1)
+    if concurrency <= 1:
+        return None
+
+    from src.parser.async_parser import AsyncQuoteParser
+
+    return AsyncQuoteParser(parser, concurrency=concurrency)
+
+
+def build_quote_pool(config: Dict[str, Any]) -> Optional[QuotePool]:
+    pool_cfg = config.get('pool') or {}
+    if not pool_cfg.get('enabled', False):
+        return None
+
+    from src.core.pool import DEFAULT_POOL_PATH, QuotePool
+
+    return QuotePool(pool_cfg.get('path') or DEFAULT_POOL_PATH)
+
+
+def build_quote_history(config: Dict[str, Any]) -> Optional[QuoteHistory]:
+    """История опубликованных цитат (блок `history`), если она включена."""
+
+    history_cfg = config.get('history') or {}
+    if not history_cfg.get('enabled', False):
+        return None
+
+    mode = history_cfg.get('mode') or HISTORY_LRU
+    if mode not in HISTORY_MODES:
+        print(
+            f"Предупреждение: неизвестный режим истории цитат '{mode}', "
+            f"используем '{HISTORY_LRU}'."
+        )
+        mode = HISTORY_LRU
+
+    return QuoteHistory(
+        history_cfg.get('path') or DEFAULT_HISTORY_PATH,
+        mode=mode,
+        max_entries=history_cfg.get('max_entries') or DEFAULT_HISTORY_MAX_ENTRIES,
+        max_age_days=history_cfg.get('max_age_days', DEFAULT_HISTORY_MAX_AGE_DAYS),
+        bloom_capacity=history_cfg.get('bloom_capacity') or DEFAULT_BLOOM_CAPACITY,
+        bloom_error_rate=history_cfg.get('bloom_error_rate') or DEFAULT_BLOOM_ERROR_RATE,
     )
 
 
+def build_metrics_server(config: Dict[str, Any]) -> Optional[MetricsServer]:
+    """Включает экспорт метрик (блок `metrics`): HTTP-эндпоинт и JSON-снимок."""
+
+    metrics_cfg = config.get('metrics') or {}
+    if not metrics_cfg.get('enabled', False):
+        return None
+
+    REGISTRY.snapshot_path = metrics_cfg.get('snapshot_path') or None
+    port = metrics_cfg.get('port', DEFAULT_METRICS_PORT)
+    if port is None:
+        return None
+
+    host = metrics_cfg.get('host') or DEFAULT_METRICS_HOST
+    try:
+        server = MetricsServer(REGISTRY, host=host, port=int(port))
+    except OSError as exc:
+        print(f"Предупреждение: не удалось запустить сервер метрик на {host}:{port}: {exc}")
+        return None
+    print(f"Метрики доступны на http://{host}:{server.address[1]}/metrics")
+    return server.start()
+
+
+def build_prefetcher(
+    config: Dict[str, Any],
+    max_status_length: int,
+    parser_max_attempts: int,
+    parser_retry_interval: float,
+    parser: Union[QuoteParser, QuoteAggregator],
+    pool: Optional[QuotePool] = None,
+    selection_policy: str = DEFAULT_SELECTION_POLICY,
+    async_parser: Optional[AsyncQuoteParser] = None,
+    history: Optional[QuoteHistory] = None,
+) -> Optional[QuotePrefetcher]:
+    """Запускает фоновую подгрузку цитат, если включён блок `prefetch`."""
+
+    prefetch_cfg = config.get('prefetch') or {}
+    if not prefetch_cfg.get('enabled', False):
+        return None
+
+    if async_parser is not None:
+        import asyncio
+
+        def fetch():
+            return asyncio.run(
+                fetch_quote_concurrently(
+                    async_parser,
+                    max_status_length,
+                    parser_max_attempts,
+                    parser_retry_interval,
+                    pool=pool,
+                    policy=selection_policy,
+                    history=history,
+                    record=False,
+                )
+            )
+    else:
+        fetch = functools.partial(
+            fetch_quote_with_retries,
+            parser,
+            max_status_length,
+            parser_max_attempts,
+            parser_retry_interval,
+            pool=pool,
+            policy=selection_policy,
+            history=history,
+            record=False,
+        )
+
+    prefetcher = QuotePrefetcher(
+        fetch,
+        depth=int(prefetch_cfg.get('depth') or DEFAULT_PREFETCH_DEPTH),
+        retry_interval=float(
+            prefetch_cfg.get('retry_interval_seconds', DEFAULT_PREFETCH_RETRY_SECONDS)
+        ),
+        history=history,
+        pool=pool,
+    )
+    return prefetcher.start()
+
+
 def build_github_client(
     config: Optional[Dict[str, Any]], debug: bool = False
 ) -> Tuple[Optional[GitHubStatusClient], bool]:
@@ -33,10 +287,15 @@ def build_github_client(
         print("GitHub token не указан, статус обновляться не будет.")
         return None, True
 
+    from src.github.status_client import GitHubStatusClient
+
     client_kwargs = {
         'token': token,
         'default_emoji': config.get('emoji'),
         'timeout': config.get('timeout', 10),
+        'verify_mode': _verify_mode(config),
+        **_rate_limit_kwargs(config),
+        **_status_cache_kwargs(config, build_status_cache(config)),
         'dry_run': dry_run,
         'debug': bool(debug),
     }
@@ -45,3 +304,117 @@ def build_github_client(
 
     client = GitHubStatusClient(**client_kwargs)
     return client, True
+
+
+def _verify_mode(config: Dict[str, Any]) -> str:
+    from src.github.status_client import DEFAULT_VERIFY_MODE, VERIFY_MODES
+
+    verify_mode = config.get('verify_mode') or DEFAULT_VERIFY_MODE
+    if verify_mode not in VERIFY_MODES:
+        print(
+            f"Предупреждение: неизвестный режим проверки статуса '{verify_mode}', "
+            f"используем '{DEFAULT_VERIFY_MODE}'."
+        )
+        return DEFAULT_VERIFY_MODE
+    return verify_mode
+
+
+def _rate_limit_kwargs(config: Dict[str, Any]) -> Dict[str, float]:
+    rate_cfg = config.get('rate_limit') or {}
+    kwargs = {}
+    if rate_cfg.get('min_interval_seconds') is not None:
+        kwargs['min_interval'] = float(rate_cfg['min_interval_seconds'])
+    if rate_cfg.get('max_wait_seconds') is not None:
+        kwargs['max_wait_seconds'] = float(rate_cfg['max_wait_seconds'])
+    return kwargs
+
+
+def build_status_cache(config: Dict[str, Any]) -> Optional[StatusCache]:
+    cache_cfg = config.get('status_cache') or {}
+    if not cache_cfg.get('enabled', False):
+        return None
+
+    from src.github.status_cache import DEFAULT_STATUS_CACHE_PATH, StatusCache
+
+    return StatusCache(cache_cfg.get('path') or DEFAULT_STATUS_CACHE_PATH)
+
+
+def _status_cache_kwargs(
+    config: Dict[str, Any],
+    status_cache: Optional[StatusCache],
+    cache_key: str = 'default',
+) -> Dict[str, Any]:
+    if status_cache is None:
+        return {}
+    cache_cfg = config.get('status_cache') or {}
+    refresh_window = cache_cfg.get('refresh_window_seconds')
+    return {
+        'status_cache': status_cache,
+        'cache_key': cache_key,
+        'refresh_cache': bool(cache_cfg.get('refresh_on_start', False)),
+        'refresh_window': float(refresh_window) if refresh_window is not None else None,
+    }
+
+
+def build_github_accounts(
+    config: Optional[Dict[str, Any]],
+    default_max_status_length: int,
+    default_refresh_interval: int,
+    debug: bool = False,
+) -> List[Account]:
+    """Собирает аккаунты из `github.accounts`; все клиенты делят один пул соединений.
+
+    Каждый аккаунт наследует настройки блока `github` и может переопределить
+    `token_env` (имя переменной окружения с токеном), `emoji`,
+    `max_status_length`, `refresh_interval_seconds`, `dry_run`, `verify_mode`,
+    `rate_limit` и `graphql_url`.
+    """
+
+    if not config or not config.get('enabled', True):
+        return []
+
+    from src.github.status_client import GitHubStatusClient, build_github_session
+
+    accounts_cfg = config.get('accounts') or []
+    defaults = {key: value for key, value in config.items() if key != 'accounts'}
+    session = build_github_session(pool_size=len(accounts_cfg))
+    status_cache = build_status_cache(config)
+    accounts = []
+
+    for idx, account_cfg in enumerate(accounts_cfg, start=1):
+        merged = {**defaults, **account_cfg}
+        name = merged.get('name') or f'account-{idx}'
+        token_env = merged.get('token_env')
+        token = os.getenv(token_env) if token_env else merged.get('token')
+        dry_run = merged.get('dry_run', False)
+        if not token and not dry_run:
+            print(f"[{name}] GitHub token не указан, аккаунт пропущен.")
+            continue
+
+        client_kwargs = {
+            'token': token,
+            'default_emoji': merged.get('emoji'),
+            'timeout': merged.get('timeout', 10),
+            'verify_mode': _verify_mode(merged),
+            **_rate_limit_kwargs(merged),
+            **_status_cache_kwargs(merged, status_cache, cache_key=name),
+            'dry_run': dry_run,
+            'debug': bool(debug),
+            'session': session,
+        }
+        if merged.get('graphql_url'):
+            client_kwargs['api_url'] = merged['graphql_url']
+
+        refresh_interval = merged.get('refresh_interval_seconds')
+        accounts.append(
+            Account(
+                name=name,
+                client=GitHubStatusClient(**client_kwargs),
+                max_status_length=int(merged.get('max_status_length') or default_max_status_length),
+                refresh_interval=int(
+                    default_refresh_interval if refresh_interval is None else refresh_interval
+                ),
+            )
+        )
+
+    return accounts
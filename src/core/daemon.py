@@ -0,0 +1,226 @@
+"""Режим демона: обновление статуса по фиксированной сетке времени на asyncio.
+
+В отличие от цикла `update_once` + `time.sleep(refresh_interval)`, моменты
+обновления считаются от старта по монотонным часам (`start + k * interval`),
+поэтому длительность парсинга и проверки не накапливается в дрейф. Следующая
+цитата загружается в фоне, пока текущий статус «живёт», а SIGTERM/SIGINT
+завершают работу сразу, не дожидаясь незаконченной загрузки. В историю цитата
+попадает только после публикации, а брошенная при остановке возвращается в пул.
+"""
+
+import asyncio
+import functools
+import math
+import signal
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from src.core.history import QuoteHistory
+from src.core.metrics import REGISTRY
+from src.core.pool import QuotePool
+from src.core.prefetch import QuotePrefetcher
+from src.core.runner import fetch_status_entry, publish_status
+from src.core.selection import DEFAULT_SELECTION_POLICY
+from src.github.status_client import GitHubStatusClient
+from src.parser.aggregator import QuoteAggregator
+from src.parser.async_parser import AsyncQuoteParser
+from src.parser.site_parser import QuoteParser
+
+
+class IntervalScheduler:
+    """Сетка моментов `start + k * interval` по монотонным часам.
+
+    Если работа заняла дольше интервала, пропущенные моменты не догоняются:
+    следующий запуск назначается на ближайший будущий узел сетки.
+    """
+
+    def __init__(self, interval: float, clock: Callable[[], float] = time.monotonic) -> None:
+        if interval <= 0:
+            raise ValueError("Интервал демона должен быть больше нуля")
+        self.interval = float(interval)
+        self.clock = clock
+        self.start = clock()
+        self.tick = 0
+        self.missed = 0
+
+    def advance(self) -> float:
+        """Переходит к следующему узлу сетки и возвращает его время."""
+
+        now = self.clock()
+        next_tick = self.tick + 1
+        due = math.floor((now - self.start) / self.interval) + 1
+        if due > next_tick:
+            self.missed += due - next_tick
+            next_tick = due
+        self.tick = next_tick
+        return self.start + self.tick * self.interval
+
+    def delay(self) -> float:
+        return max(0.0, self.start + self.tick * self.interval - self.clock())
+
+
+async def run_daemon(
+    parser: Union[QuoteParser, QuoteAggregator],
+    github_client: Optional[GitHubStatusClient],
+    refresh_interval: int,
+    max_status_length: int,
+    github_enabled: bool,
+    parser_max_attempts: int,
+    parser_retry_interval: float,
+    pool: Optional[QuotePool] = None,
+    selection_policy: str = DEFAULT_SELECTION_POLICY,
+    async_parser: Optional[AsyncQuoteParser] = None,
+    prefetcher: Optional[QuotePrefetcher] = None,
+    history: Optional[QuoteHistory] = None,
+    stop_event: Optional[asyncio.Event] = None,
+    clock: Callable[[], float] = time.monotonic,
+) -> int:
+    """Обновляет статус каждые `refresh_interval` секунд до сигнала остановки.
+
+    Ошибки получения цитаты или GitHub не останавливают демон: цикл
+    пропускается, следующий запуск происходит по расписанию. Возвращает
+    число выполненных циклов.
+
+    Цитата загружается в потоке-демоне: по сигналу остановки демон не ждёт
+    незаконченную загрузку (при `max_attempts: 0` и недоступном сайте она
+    может не закончиться никогда) и не начинает новую.
+    """
+
+    stop = stop_event or asyncio.Event()
+    _install_signal_handlers(stop)
+    scheduler = IntervalScheduler(refresh_interval, clock=clock)
+    fetch = functools.partial(
+        fetch_status_entry,
+        parser,
+        max_status_length,
+        parser_max_attempts,
+        parser_retry_interval,
+        pool=pool,
+        selection_policy=selection_policy,
+        async_parser=async_parser,
+        prefetcher=prefetcher,
+        history=history,
+        record=False,
+    )
+
+    cycles = 0
+    prefetch = _fetch_in_background(fetch, pool)
+    stopping = asyncio.ensure_future(stop.wait())
+    try:
+        while not stop.is_set():
+            await asyncio.wait((prefetch, stopping), return_when=asyncio.FIRST_COMPLETED)
+            if not prefetch.done():
+                break
+            with REGISTRY.cycle():
+                ok, entry, status_message = prefetch.result()
+                if ok and status_message:
+                    published = True
+                    if github_enabled and github_client:
+                        try:
+                            published = await asyncio.to_thread(
+                                publish_status,
+                                github_client,
+                                status_message,
+                                max_status_length,
+                                refresh_interval,
+                            )
+                        except Exception as exc:
+                            # ошибки API перехватывает publish_status; здесь — всё прочее,
+                            # чтобы сбой одного цикла не останавливал демон
+                            print(f"Ошибка при обновлении статуса GitHub: {exc}")
+                            published = False
+                    if published and history is not None and prefetcher is None:
+                        history.record(entry)
+                    elif not published:
+                        _release(pool, entry)
+            cycles += 1
+
+            scheduler.advance()
+            if scheduler.missed:
+                print(f"Предупреждение: цикл длиннее интервала, пропущено запусков: {scheduler.missed}.")
+                scheduler.missed = 0
+
+            if stop.is_set():
+                break
+            # следующая цитата грузится, пока ждём очередного запуска
+            prefetch = _fetch_in_background(fetch, pool)
+            delay = scheduler.delay()
+            print(f"Повторное обновление статуса через {round(delay)} секунд...")
+            if await _wait_for_stop(stop, delay):
+                break
+    finally:
+        stopping.cancel()
+        prefetch.cancel()
+
+    print("Демон остановлен.")
+    return cycles
+
+
+FetchResult = Tuple[bool, Optional[Dict[str, Optional[str]]], Optional[str]]
+
+
+def _fetch_in_background(
+    fetch: Callable[[], FetchResult],
+    pool: Optional[QuotePool],
+) -> "asyncio.Future[FetchResult]":
+    """Запускает `fetch` в потоке-демоне и возвращает future с его результатом.
+
+    Поток из `asyncio.to_thread` задержал бы выход `asyncio.run` до конца
+    загрузки, поток-демон — нет. Если результат больше никому не нужен
+    (future отменена или цикл событий уже закрыт), цитата возвращается в пул.
+    """
+
+    loop = asyncio.get_running_loop()
+    future: "asyncio.Future[FetchResult]" = loop.create_future()
+
+    def settle(result: Optional[FetchResult], error: Optional[BaseException]) -> None:
+        if future.cancelled():
+            if result is not None:
+                _release(pool, result[1])
+        elif error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def run() -> None:
+        result, error = None, None
+        try:
+            result = fetch()
+        except Exception as exc:
+            error = exc
+        try:
+            loop.call_soon_threadsafe(settle, result, error)
+        except RuntimeError:  # цикл событий уже закрыт
+            if result is not None:
+                _release(pool, result[1])
+
+    threading.Thread(target=run, name='daemon-fetch', daemon=True).start()
+    return future
+
+
+def _release(pool: Optional[QuotePool], entry: Optional[Dict[str, Any]]) -> None:
+    if pool is None or entry is None:
+        return
+    try:
+        pool.release(entry)
+    except Exception:  # пул уже закрыт: цитата просто не вернётся
+        pass
+
+
+async def _wait_for_stop(stop: asyncio.Event, timeout: float) -> bool:
+    try:
+        await asyncio.wait_for(stop.wait(), timeout)
+    except asyncio.TimeoutError:
+        return False
+    return True
+
+
+def _install_signal_handlers(stop: asyncio.Event) -> None:
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError, ValueError):
+            # Windows или не главный поток: остаётся KeyboardInterrupt
+            pass
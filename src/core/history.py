@@ -0,0 +1,208 @@
+"""История недавно опубликованных цитат, чтобы не повторять их.
+
+Два режима:
+- `lru` — хеши цитат с временем публикации в `OrderedDict`, ограниченном по
+  числу записей (`max_entries`) и возрасту (`max_age_days`); проверка точная.
+- `bloom` — для очень длинной истории: две поочерёдно сменяемые Bloom-фильтра
+  («текущий» и «предыдущий»). Фильтр сменяется каждые `max_age_days / 2`, так
+  что цитата гарантированно помнится не меньше половины окна и не больше окна
+  целиком; память не зависит от числа цитат, возможны редкие ложные «повторы».
+
+История хранится в JSON-файле между запусками.
+"""
+
+import base64
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Mapping, Optional
+
+from src.parser.quote import Quote
+
+
+HISTORY_LRU = 'lru'
+HISTORY_BLOOM = 'bloom'
+HISTORY_MODES = (HISTORY_LRU, HISTORY_BLOOM)
+
+DEFAULT_HISTORY_PATH = '.cache/quote_history.json'
+DEFAULT_HISTORY_MAX_ENTRIES = 5000
+DEFAULT_HISTORY_MAX_AGE_DAYS = 30.0
+DEFAULT_BLOOM_CAPACITY = 100_000
+DEFAULT_BLOOM_ERROR_RATE = 0.01
+
+_DAY_SECONDS = 86400.0
+
+
+class BloomFilter:
+    """Bloom-фильтр на `bytearray` с двойным хешированием (Kirsch–Mitzenmacher)."""
+
+    def __init__(self, capacity: int, error_rate: float, bits: Optional[bytearray] = None) -> None:
+        capacity = max(1, int(capacity))
+        error_rate = min(max(float(error_rate), 1e-6), 0.5)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.hashes = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bits if bits is not None else bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        for idx in range(self.hashes):
+            yield (first + idx * second) % self.size
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def to_json(self) -> str:
+        return base64.b64encode(bytes(self.bits)).decode('ascii')
+
+    @classmethod
+    def from_json(cls, data: str, capacity: int, error_rate: float) -> 'BloomFilter':
+        bloom = cls(capacity, error_rate)
+        bits = bytearray(base64.b64decode(data))
+        if len(bits) == len(bloom.bits):
+            bloom.bits = bits
+        return bloom
+
+
+class QuoteHistory:
+    """Недавно опубликованные цитаты: `seen(entry)` и `record(entry)`."""
+
+    def __init__(
+        self,
+        path: Optional[str] = DEFAULT_HISTORY_PATH,
+        mode: str = HISTORY_LRU,
+        max_entries: int = DEFAULT_HISTORY_MAX_ENTRIES,
+        max_age_days: float = DEFAULT_HISTORY_MAX_AGE_DAYS,
+        bloom_capacity: int = DEFAULT_BLOOM_CAPACITY,
+        bloom_error_rate: float = DEFAULT_BLOOM_ERROR_RATE,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if mode not in HISTORY_MODES:
+            raise ValueError(f"Неизвестный режим истории цитат: {mode}")
+        self.path = path
+        self.mode = mode
+        self.max_entries = max(1, int(max_entries))
+        self.max_age = max(0.0, float(max_age_days)) * _DAY_SECONDS
+        self.bloom_capacity = bloom_capacity
+        self.bloom_error_rate = bloom_error_rate
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._recent: 'OrderedDict[str, float]' = OrderedDict()
+        self._current = self._new_bloom()
+        self._previous = self._new_bloom()
+        self._rotated_at = clock()
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._recent)
+
+    def seen(self, entry: Mapping[str, Any]) -> bool:
+        key = _key(entry)
+        with self._lock:
+            if self.mode == HISTORY_BLOOM:
+                self._rotate()
+                return key in self._current or key in self._previous
+            self._expire()
+            return key in self._recent
+
+    def record(self, entry: Mapping[str, Any]) -> None:
+        """Запоминает опубликованную цитату и сохраняет историю на диск."""
+
+        key = _key(entry)
+        with self._lock:
+            if self.mode == HISTORY_BLOOM:
+                self._rotate()
+                self._current.add(key)
+            else:
+                self._recent.pop(key, None)
+                self._recent[key] = self._clock()
+                self._expire()
+            self._save()
+
+    def _new_bloom(self) -> BloomFilter:
+        return BloomFilter(self.bloom_capacity, self.bloom_error_rate)
+
+    def _expire(self) -> None:
+        while len(self._recent) > self.max_entries:
+            self._recent.popitem(last=False)
+        if self.max_age <= 0:
+            return
+        cutoff = self._clock() - self.max_age
+        while self._recent:
+            key, added_at = next(iter(self._recent.items()))
+            if added_at >= cutoff:
+                break
+            self._recent.popitem(last=False)
+
+    def _rotate(self) -> None:
+        half_window = self.max_age / 2
+        if half_window <= 0:
+            return
+        now = self._clock()
+        elapsed = now - self._rotated_at
+        if elapsed < half_window:
+            return
+        # прошло больше целого окна — обе генерации устарели
+        self._previous = self._current if elapsed < 2 * half_window else self._new_bloom()
+        self._current = self._new_bloom()
+        self._rotated_at = now
+
+    def _load(self) -> None:
+        if not self.path:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get('mode') != self.mode:
+            return
+
+        if self.mode == HISTORY_BLOOM:
+            self._rotated_at = float(data.get('rotated_at') or self._clock())
+            self._current = BloomFilter.from_json(
+                data.get('current') or '', self.bloom_capacity, self.bloom_error_rate
+            )
+            self._previous = BloomFilter.from_json(
+                data.get('previous') or '', self.bloom_capacity, self.bloom_error_rate
+            )
+        else:
+            for key, added_at in data.get('recent') or []:
+                self._recent[key] = float(added_at)
+            self._expire()
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        data: Dict[str, Any] = {'mode': self.mode}
+        if self.mode == HISTORY_BLOOM:
+            data.update(
+                rotated_at=self._rotated_at,
+                current=self._current.to_json(),
+                previous=self._previous.to_json(),
+            )
+        else:
+            data['recent'] = [[key, added_at] for key, added_at in self._recent.items()]
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+
+def _key(entry: Mapping[str, Any]) -> str:
+    return Quote.from_entry(entry).content_hash
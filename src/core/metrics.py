@@ -0,0 +1,290 @@
+"""Метрики цикла обновления: время по стадиям и счётчики событий.
+
+`MetricsRegistry` хранит длительности стадий (загрузка страницы, разбор HTML,
+извлечение по селекторам, выбор цитаты, мутация GitHub, проверка статуса,
+цикл целиком) в виде гистограмм и счётчики событий (попытки, обрезания,
+запасной вариант, ошибки API). Данные отдаются в текстовом формате Prometheus
+(`render_prometheus`) и в JSON (`snapshot`, `write_snapshot`); `MetricsServer`
+публикует их по HTTP на `/metrics` и `/metrics.json`.
+
+Модули ядра пишут в общий `REGISTRY`; парсер получает его через параметр
+`metrics`, чтобы пакет `src.parser` не зависел от `src.core`.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+STAGE_FETCH = 'fetch'
+STAGE_PARSE = 'parse'
+STAGE_EXTRACT = 'extract'
+STAGE_SELECT = 'select'
+STAGE_MUTATION = 'mutation'
+STAGE_VERIFY = 'verify'
+STAGE_CYCLE = 'cycle'
+
+COUNTER_CYCLES = 'cycles_total'
+COUNTER_ATTEMPTS = 'fetch_attempts_total'
+COUNTER_POOL_HITS = 'pool_hits_total'
+COUNTER_FALLBACKS = 'fallbacks_total'
+COUNTER_TRUNCATIONS = 'truncations_total'
+COUNTER_FETCH_ERRORS = 'fetch_errors_total'
+COUNTER_API_ERRORS = 'api_errors_total'
+COUNTER_SKIPPED_UPDATES = 'skipped_updates_total'
+
+COUNTER_HELP = {
+    COUNTER_CYCLES: 'Completed update cycles.',
+    COUNTER_ATTEMPTS: 'Quote pages requested while looking for a fitting quote.',
+    COUNTER_POOL_HITS: 'Quotes taken from the local pool without a request.',
+    COUNTER_FALLBACKS: 'Cycles that fell back to the first result because nothing fit.',
+    COUNTER_TRUNCATIONS: 'Status messages truncated to the length limit.',
+    COUNTER_FETCH_ERRORS: 'Failed attempts to fetch a quote.',
+    COUNTER_API_ERRORS: 'GitHub API errors by kind.',
+    COUNTER_SKIPPED_UPDATES: 'Status updates skipped because the status was already live.',
+}
+
+METRIC_PREFIX = 'auto_quoter'
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+DEFAULT_METRICS_HOST = '127.0.0.1'
+DEFAULT_METRICS_PORT = 9108
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class StageTimer:
+    """Гистограмма длительностей одной стадии."""
+
+    def __init__(self, buckets: Tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        for idx, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.bucket_counts[idx] += 1
+                break
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'total_seconds': self.total,
+            'mean_seconds': self.total / self.count if self.count else 0.0,
+            'max_seconds': self.max,
+        }
+
+
+class MetricsRegistry:
+    """Потокобезопасное хранилище таймеров стадий и счётчиков."""
+
+    def __init__(
+        self,
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.snapshot_path: Optional[str] = None
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._stages: Dict[str, StageTimer] = {}
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        """Замеряет блок `with` как одно наблюдение стадии (в том числе при ошибке)."""
+
+        started = self._clock()
+        try:
+            yield
+        finally:
+            self.observe(stage, self._clock() - started)
+
+    @contextmanager
+    def cycle(self) -> Iterator[None]:
+        """Замеряет цикл обновления, считает его и сохраняет JSON-снимок."""
+
+        try:
+            with self.timer(STAGE_CYCLE):
+                yield
+        finally:
+            self.inc(COUNTER_CYCLES)
+            if self.snapshot_path:
+                try:
+                    self.write_snapshot(self.snapshot_path)
+                except OSError as exc:
+                    print(f"Не удалось сохранить снимок метрик: {exc}")
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            timer = self._stages.get(stage)
+            if timer is None:
+                timer = self._stages[stage] = StageTimer(self.buckets)
+            timer.observe(max(0.0, seconds))
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def counter(self, name: str, **labels: str) -> float:
+        with self._lock:
+            return self._counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def stage(self, name: str) -> Dict[str, float]:
+        with self._lock:
+            timer = self._stages.get(name)
+            return timer.summary() if timer else StageTimer(self.buckets).summary()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Снимок для JSON: сводка по стадиям и значения счётчиков."""
+
+        with self._lock:
+            stages = {name: timer.summary() for name, timer in sorted(self._stages.items())}
+            counters: Dict[str, float] = {}
+            for (name, labels), value in sorted(self._counters.items()):
+                counters[name + _format_labels(labels)] = value
+        return {'timestamp': time.time(), 'stages': stages, 'counters': counters}
+
+    def write_snapshot(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(tmp_path, path)
+
+    def render_prometheus(self) -> str:
+        """Текстовый формат экспозиции Prometheus (version 0.0.4)."""
+
+        metric = f'{METRIC_PREFIX}_stage_duration_seconds'
+        lines: List[str] = [
+            f'# HELP {metric} Time spent in each stage of the update cycle.',
+            f'# TYPE {metric} histogram',
+        ]
+        with self._lock:
+            for stage, timer in sorted(self._stages.items()):
+                cumulative = 0
+                for bound, count in zip(timer.buckets, timer.bucket_counts):
+                    cumulative += count
+                    labels = (('stage', stage), ('le', _format_number(bound)))
+                    lines.append(f'{metric}_bucket{_format_labels(labels)} {cumulative}')
+                labels = (('stage', stage), ('le', '+Inf'))
+                lines.append(f'{metric}_bucket{_format_labels(labels)} {timer.count}')
+                stage_label = _format_labels((('stage', stage),))
+                lines.append(f'{metric}_sum{stage_label} {_format_number(timer.total)}')
+                lines.append(f'{metric}_count{stage_label} {timer.count}')
+
+            by_name: Dict[str, List[Tuple[Labels, float]]] = {}
+            for (name, labels), value in sorted(self._counters.items()):
+                by_name.setdefault(name, []).append((labels, value))
+
+        for name, samples in by_name.items():
+            full_name = f'{METRIC_PREFIX}_{name}'
+            lines.append(f'# HELP {full_name} {COUNTER_HELP.get(name, name)}')
+            lines.append(f'# TYPE {full_name} counter')
+            for labels, value in samples:
+                lines.append(f'{full_name}{_format_labels(labels)} {_format_number(value)}')
+
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsServer:
+    """HTTP-сервер метрик в фоновом потоке: `/metrics` (Prometheus) и `/metrics.json`."""
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        host: str = DEFAULT_METRICS_HOST,
+        port: int = DEFAULT_METRICS_PORT,
+    ) -> None:
+        from http.server import ThreadingHTTPServer
+
+        self.registry = registry
+        self._server = ThreadingHTTPServer((host, port), _make_handler(registry))
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        host, port = self._server.server_address[:2]
+        return host, port
+
+    def start(self) -> 'MetricsServer':
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._server.serve_forever, name='metrics-http', daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+
+def _make_handler(registry: MetricsRegistry):
+    from http.server import BaseHTTPRequestHandler
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 - имя задано http.server
+            path = self.path.split('?', 1)[0]
+            if path == '/metrics':
+                body = registry.render_prometheus().encode('utf-8')
+                content_type = 'text/plain; version=0.0.4; charset=utf-8'
+            elif path == '/metrics.json':
+                body = json.dumps(registry.snapshot()).encode('utf-8')
+                content_type = 'application/json'
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            # запросы сборщика метрик не засоряют вывод скрипта
+            pass
+
+    return MetricsHandler
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ''
+    pairs = ','.join(f'{key}="{_escape(value)}"' for key, value in labels)
+    return '{' + pairs + '}'
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def _format_number(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+REGISTRY = MetricsRegistry()
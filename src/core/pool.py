@@ -0,0 +1,212 @@
+import random
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from src.core.selection import (
+    DEFAULT_SELECTION_POLICY,
+    POLICY_FIRST,
+    POLICY_LONGEST,
+    POLICY_RANDOM,
+    POLICY_SHORTEST,
+)
+from src.parser.quote import Quote, status_message
+
+
+DEFAULT_POOL_PATH = 'quote_pool.sqlite3'
+
+_POLICY_ORDER = {
+    POLICY_FIRST: "id",
+    POLICY_SHORTEST: "length, id",
+    POLICY_LONGEST: "length DESC, id",
+    POLICY_RANDOM: "length, id",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS quotes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    quote TEXT NOT NULL,
+    source TEXT NOT NULL DEFAULT '',
+    message TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    added_at REAL NOT NULL,
+    used_at REAL,
+    UNIQUE (quote, source)
+);
+CREATE INDEX IF NOT EXISTS idx_quotes_available ON quotes (used_at, length);
+CREATE TABLE IF NOT EXISTS available_lengths (
+    length INTEGER PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS quotes_added AFTER INSERT ON quotes
+WHEN NEW.used_at IS NULL BEGIN
+    INSERT INTO available_lengths (length, count) VALUES (NEW.length, 1)
+    ON CONFLICT (length) DO UPDATE SET count = count + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS quotes_taken AFTER UPDATE OF used_at ON quotes
+WHEN OLD.used_at IS NULL AND NEW.used_at IS NOT NULL BEGIN
+    UPDATE available_lengths SET count = count - 1 WHERE length = OLD.length;
+END;
+CREATE TRIGGER IF NOT EXISTS quotes_released AFTER UPDATE OF used_at ON quotes
+WHEN OLD.used_at IS NOT NULL AND NEW.used_at IS NULL BEGIN
+    INSERT INTO available_lengths (length, count) VALUES (NEW.length, 1)
+    ON CONFLICT (length) DO UPDATE SET count = count + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS quotes_removed AFTER DELETE ON quotes
+WHEN OLD.used_at IS NULL BEGIN
+    UPDATE available_lengths SET count = count - 1 WHERE length = OLD.length;
+END;
+"""
+
+# счётчики пересчитываются при открытии: так подхватываются пулы, созданные без них
+_RECOUNT = """
+DELETE FROM available_lengths;
+INSERT INTO available_lengths (length, count)
+SELECT length, COUNT(*) FROM quotes WHERE used_at IS NULL GROUP BY length;
+"""
+
+
+class QuotePool:
+    """Локальный пул цитат на SQLite.
+
+    Результаты `QuoteParser.fetch_all()` складываются в пул, а при следующем
+    цикле подходящая по длине цитата берётся из него без обращения к сайту.
+    Каждая цитата выдаётся не более одного раза. Пул можно использовать из
+    нескольких потоков (фоновая подгрузка, демон): соединение общее, доступ
+    к нему сериализуется блокировкой.
+    """
+
+    def __init__(self, path: str = DEFAULT_POOL_PATH, rng: Optional[random.Random] = None) -> None:
+        self.path = path
+        self._rng = rng or random.Random()
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._conn.executescript(_RECOUNT)
+        self._conn.commit()
+
+    def add_many(self, entries: Iterable[Dict[str, Optional[str]]]) -> int:
+        """Добавляет цитаты в пул, пропуская дубликаты. Возвращает число новых записей."""
+
+        now = time.time()
+        rows = []
+        for entry in entries:
+            message = status_message(entry)
+            if not message:
+                continue
+            rows.append((entry.get('quote'), entry.get('source') or '', message, len(message), now))
+
+        if not rows:
+            return 0
+
+        with self._lock:
+            # `rowcount`, а не `total_changes`: тот учитывает и записи триггеров
+            cursor = self._conn.executemany(
+                "INSERT OR IGNORE INTO quotes (quote, source, message, length, added_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def take(
+        self,
+        max_status_length: int,
+        policy: str = DEFAULT_SELECTION_POLICY,
+    ) -> Tuple[Optional[Dict[str, Optional[str]]], Optional[str]]:
+        """Выдаёт неиспользованную цитату, которая помещается в лимит.
+
+        Политика `first` берёт самую старую цитату, `shortest`/`longest` —
+        самую короткую/длинную из подходящих, `random` — равновероятно случайную.
+        Выборка идёт по индексу `(used_at, length)`, без просмотра самой таблицы.
+        """
+
+        order = _POLICY_ORDER.get(policy)
+        if order is None:
+            raise ValueError(f"Неизвестная политика выбора цитаты: {policy}")
+
+        with self._lock:
+            if policy == POLICY_RANDOM:
+                row = self._random_row(max_status_length)
+            else:
+                row = self._conn.execute(
+                    "SELECT id, quote, source, message FROM quotes"
+                    f" WHERE used_at IS NULL AND length <= ? ORDER BY {order} LIMIT 1",
+                    (max_status_length,),
+                ).fetchone()
+            if row is None:
+                return None, None
+
+            row_id, quote, source, message = row
+            self._conn.execute("UPDATE quotes SET used_at = ? WHERE id = ?", (time.time(), row_id))
+            self._conn.commit()
+            return Quote(quote, source or None), message
+
+    def _random_row(self, max_status_length: int) -> Optional[Tuple[int, str, str, str]]:
+        """Равновероятно выбранная подходящая запись.
+
+        Число свободных записей каждой длины хранится в `available_lengths`
+        (его ведут триггеры); длина выбирается с весом этого числа, а запись —
+        случайным смещением внутри неё по индексу `(used_at, length)`. Так
+        каждая подходящая цитата выпадает с одинаковой вероятностью, а
+        `OFFSET` проходит записи только одной длины.
+        """
+
+        counts = self._conn.execute(
+            "SELECT length, count FROM available_lengths WHERE length <= ? AND count > 0"
+            " ORDER BY length",
+            (max_status_length,),
+        ).fetchall()
+        rank = self._rng.randrange(sum(count for _, count in counts)) if counts else None
+        if rank is None:
+            return None
+        for length, count in counts:
+            if rank < count:
+                break
+            rank -= count
+
+        return self._conn.execute(
+            "SELECT id, quote, source, message FROM quotes"
+            " WHERE used_at IS NULL AND length = ? ORDER BY id LIMIT 1 OFFSET ?",
+            (length, rank),
+        ).fetchone()
+
+    def mark_used(self, entry: Dict[str, Optional[str]]) -> None:
+        """Помечает цитату использованной (например, выбранную прямо из свежей страницы)."""
+
+        with self._lock:
+            self._conn.execute(
+                "UPDATE quotes SET used_at = ? WHERE quote = ? AND source = ? AND used_at IS NULL",
+                (time.time(), entry.get('quote'), entry.get('source') or ''),
+            )
+            self._conn.commit()
+
+    def release(self, entry: Dict[str, Optional[str]]) -> None:
+        """Возвращает в пул выданную, но так и не опубликованную цитату."""
+
+        with self._lock:
+            self._conn.execute(
+                "UPDATE quotes SET used_at = NULL WHERE quote = ? AND source = ?",
+                (entry.get('quote'), entry.get('source') or ''),
+            )
+            self._conn.commit()
+
+    def available(self, max_status_length: Optional[int] = None) -> int:
+        """Количество неиспользованных цитат (опционально — только помещающихся в лимит)."""
+
+        with self._lock:
+            if max_status_length is None:
+                row = self._conn.execute(
+                    "SELECT COUNT(*) FROM quotes WHERE used_at IS NULL"
+                ).fetchone()
+            else:
+                row = self._conn.execute(
+                    "SELECT COUNT(*) FROM quotes WHERE used_at IS NULL AND length <= ?",
+                    (max_status_length,),
+                ).fetchone()
+            return int(row[0])
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
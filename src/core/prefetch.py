@@ -0,0 +1,162 @@
+"""Фоновая подгрузка цитат: производитель/потребитель на ограниченной очереди.
+
+Фоновый поток заранее получает цитаты, отбирает те, что помещаются в лимит
+статуса, форматирует их и складывает в очередь глубиной `depth`. Шаг обновления
+статуса только забирает готовую строку, поэтому его задержка не зависит от
+скорости сайта-источника.
+
+Цитата в очереди ещё не опубликована: в историю она записывается только при
+выдаче из очереди, а при остановке неиспользованные цитаты возвращаются в пул.
+"""
+
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from src.parser.quote import Quote
+
+DEFAULT_PREFETCH_DEPTH = 3
+DEFAULT_PREFETCH_RETRY_SECONDS = 5.0
+_POLL_SECONDS = 0.5
+
+FetchResult = Tuple[Optional[Dict[str, Optional[str]]], Optional[str], int, bool]
+
+
+@dataclass
+class PreparedStatus:
+    """Готовая строка статуса, уже проверенная на лимит длины."""
+
+    entry: Dict[str, Optional[str]]
+    message: str
+    attempts: int
+    prepared_at: float = field(default_factory=time.monotonic)
+
+
+class QuotePrefetcher:
+    """Держит очередь из `depth` готовых строк статуса, пополняя её в фоне.
+
+    `fetch` — функция без аргументов в формате `fetch_quote_with_retries`:
+    возвращает (цитата, строка, попытки, помещается_ли). В очередь попадают
+    только строки, которые помещаются в лимит; при ошибке источника поток
+    ждёт `retry_interval` и пробует снова.
+
+    `fetch` не должен записывать цитату в `history` (`record=False`): это
+    делает `get()`, когда строка уходит на публикацию. Цитаты, оставшиеся в
+    очереди при `close()`, возвращаются в `pool`.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], FetchResult],
+        depth: int = DEFAULT_PREFETCH_DEPTH,
+        retry_interval: float = DEFAULT_PREFETCH_RETRY_SECONDS,
+        history: Optional[Any] = None,
+        pool: Optional[Any] = None,
+    ) -> None:
+        self._fetch = fetch
+        self.depth = max(1, int(depth))
+        self.retry_interval = max(0.0, float(retry_interval))
+        self.history = history
+        self.pool = pool
+        self._queue: "queue.Queue[PreparedStatus]" = queue.Queue(maxsize=self.depth)
+        # ключи цитат в очереди: история их ещё не знает, а повторы не нужны
+        self._queued: Set[str] = set()
+        self._queued_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.produced = 0
+        self.errors = 0
+
+    def start(self) -> "QuotePrefetcher":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='quote-prefetch', daemon=True)
+            self._thread.start()
+        return self
+
+    def ready(self) -> int:
+        """Сколько готовых строк сейчас в очереди."""
+
+        return self._queue.qsize()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[PreparedStatus]:
+        """Забирает готовую строку; ждёт не дольше `timeout` (None — пока не появится).
+
+        Возвращает None по таймауту или после `close()`.
+        """
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._stop.is_set():
+            wait = _POLL_SECONDS
+            if deadline is not None:
+                wait = min(wait, deadline - time.monotonic())
+                if wait <= 0:
+                    return None
+            try:
+                prepared = self._queue.get(timeout=wait)
+            except queue.Empty:
+                continue
+            with self._queued_lock:
+                self._queued.discard(_key(prepared.entry))
+            if self.history is not None:
+                self.history.record(prepared.entry)
+            return prepared
+        return None
+
+    def close(self, timeout: float = 1.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        while True:
+            try:
+                prepared = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self._release(prepared.entry)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                entry, message, attempts, within_limit = self._fetch()
+            except Exception as exc:  # сбой источника не должен останавливать поток
+                self.errors += 1
+                print(f"Ошибка фоновой загрузки цитаты: {exc}")
+                self._stop.wait(self.retry_interval)
+                continue
+
+            if not (entry and message and within_limit):
+                self._stop.wait(self.retry_interval)
+                continue
+
+            key = _key(entry)
+            with self._queued_lock:
+                duplicate = key in self._queued
+                self._queued.add(key)
+            if duplicate:
+                continue
+
+            prepared = PreparedStatus(entry=entry, message=message, attempts=attempts)
+            while not self._stop.is_set():
+                try:
+                    self._queue.put(prepared, timeout=_POLL_SECONDS)
+                except queue.Full:
+                    continue
+                self.produced += 1
+                break
+            else:
+                with self._queued_lock:
+                    self._queued.discard(key)
+                self._release(entry)
+
+    def _release(self, entry: Dict[str, Optional[str]]) -> None:
+        if self.pool is None:
+            return
+        try:
+            self.pool.release(entry)
+        except Exception:  # пул уже закрыт: цитата просто не вернётся
+            pass
+
+
+def _key(entry: Dict[str, Optional[str]]) -> str:
+    return Quote.from_entry(entry).content_hash
@@ -0,0 +1,187 @@
+"""Профилирование цикла обновления (`--profile`).
+
+`CycleProfiler` прогоняет несколько циклов под профилировщиком и сводит
+результаты всех циклов вместе:
+- `cprofile` — детерминированный `cProfile`; профили циклов объединяются
+  в один `pstats` (файл `<prefix>.pstats`, открывается `python -m pstats`,
+  snakeviz и т.п.);
+- `sampling` — только сэмплирующий профилировщик с малыми накладными
+  расходами.
+
+В обоих режимах фоновый поток раз в `interval` секунд снимает стеки всех
+потоков через `sys._current_frames()` и пишет их в формате collapsed stacks
+(`<prefix>.collapsed`, строка `поток;функция;...;функция число`), который
+понимают `flamegraph.pl`, speedscope и inferno.
+"""
+
+import io
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+if TYPE_CHECKING:
+    import pstats
+
+PROFILE_CPROFILE = 'cprofile'
+PROFILE_SAMPLING = 'sampling'
+PROFILE_MODES = (PROFILE_CPROFILE, PROFILE_SAMPLING)
+
+DEFAULT_PROFILE_CYCLES = 5
+DEFAULT_PROFILE_OUTPUT = '.cache/profile/update'
+DEFAULT_SAMPLE_INTERVAL = 0.005
+
+
+class StackSampler:
+    """Фоновый поток, периодически снимающий стеки всех остальных потоков."""
+
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL) -> None:
+        self.interval = max(0.0005, float(interval))
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'StackSampler':
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def sample(self) -> None:
+        """Снимает один срез стеков (все потоки, кроме самого сэмплера)."""
+
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        own = threading.get_ident()
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack: List[str] = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            stack.append(_clean(names.get(ident, f'thread-{ident}')))
+            self.stacks[';'.join(reversed(stack))] += 1
+        self.samples += 1
+
+    def write_collapsed(self, path: str) -> None:
+        _ensure_parent(path)
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f'{stack} {count}\n')
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+
+class CycleProfiler:
+    """Прогоняет `cycle()` заданное число раз и сохраняет сводный профиль."""
+
+    def __init__(
+        self,
+        mode: str = PROFILE_CPROFILE,
+        output_prefix: str = DEFAULT_PROFILE_OUTPUT,
+        interval: float = DEFAULT_SAMPLE_INTERVAL,
+    ) -> None:
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Неизвестный режим профилирования: {mode}")
+        self.mode = mode
+        self.output_prefix = output_prefix
+        self.sampler = StackSampler(interval)
+        self.stats: Optional['pstats.Stats'] = None
+        self.durations: List[float] = []
+
+    @property
+    def pstats_path(self) -> str:
+        return f'{self.output_prefix}.pstats'
+
+    @property
+    def collapsed_path(self) -> str:
+        return f'{self.output_prefix}.collapsed'
+
+    def run(self, cycle: Callable[[], Any], cycles: int = DEFAULT_PROFILE_CYCLES) -> List[Any]:
+        """Выполняет `cycles` циклов и записывает файлы профиля; возвращает их результаты."""
+
+        results = []
+        self.sampler.start()
+        try:
+            for _ in range(max(1, int(cycles))):
+                results.append(self._run_cycle(cycle))
+        finally:
+            self.sampler.stop()
+
+        if self.stats is not None:
+            _ensure_parent(self.pstats_path)
+            self.stats.dump_stats(self.pstats_path)
+        self.sampler.write_collapsed(self.collapsed_path)
+        return results
+
+    def summary(self, limit: int = 15) -> str:
+        """Краткий отчёт: время циклов и самые затратные функции по cumulative time."""
+
+        lines = [f"Циклов: {len(self.durations)}, сэмплов стека: {self.sampler.samples}"]
+        if self.durations:
+            total = sum(self.durations)
+            lines.append(
+                f"Время цикла: среднее {total / len(self.durations):.3f} с, "
+                f"максимум {max(self.durations):.3f} с, всего {total:.3f} с"
+            )
+        if self.stats is not None:
+            import pstats
+
+            buffer = io.StringIO()
+            self.stats.stream = buffer
+            self.stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+            lines.append(buffer.getvalue().rstrip())
+        return '\n'.join(lines)
+
+    def files(self) -> Dict[str, str]:
+        files = {'collapsed': self.collapsed_path}
+        if self.stats is not None:
+            files['pstats'] = self.pstats_path
+        return files
+
+    def _run_cycle(self, cycle: Callable[[], Any]) -> Any:
+        import cProfile
+        import pstats
+
+        profiler = cProfile.Profile() if self.mode == PROFILE_CPROFILE else None
+        started = time.perf_counter()
+        try:
+            if profiler is None:
+                return cycle()
+            return profiler.runcall(cycle)
+        finally:
+            self.durations.append(time.perf_counter() - started)
+            if profiler is not None:
+                if self.stats is None:
+                    self.stats = pstats.Stats(profiler)
+                else:
+                    self.stats.add(profiler)
+
+
+def _frame_label(frame: Any) -> str:
+    code = frame.f_code
+    filename = os.path.basename(code.co_filename)
+    return _clean(f'{code.co_name} ({filename}:{code.co_firstlineno})')
+
+
+def _clean(label: str) -> str:
+    # `;` разделяет кадры, а пробел перед числом — стек и счётчик
+    return label.replace(';', ':').replace('\n', ' ')
+
+
+def _ensure_parent(path: str) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
@@ -1,43 +1,162 @@
+from __future__ import annotations
+
+import argparse
+import math
+import sys
 import time
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+
+from src.core.accounts import Account, due_accounts, next_due_time
+from src.core.builders import (
+    build_async_parser,
+    build_github_accounts,
+    build_github_client,
+    build_metrics_server,
+    build_parser,
+    build_prefetcher,
+    build_quote_history,
+    build_quote_pool,
+)
+from src.core.history import QuoteHistory
+from src.core.metrics import (
+    COUNTER_API_ERRORS,
+    COUNTER_FETCH_ERRORS,
+    COUNTER_SKIPPED_UPDATES,
+    COUNTER_TRUNCATIONS,
+    REGISTRY,
+    STAGE_MUTATION,
+    STAGE_VERIFY,
+    MetricsServer,
+)
+from src.core.prefetch import QuotePrefetcher
+from src.core.profiling import (
+    DEFAULT_PROFILE_CYCLES,
+    DEFAULT_PROFILE_OUTPUT,
+    DEFAULT_SAMPLE_INTERVAL,
+    PROFILE_CPROFILE,
+    PROFILE_MODES,
+    CycleProfiler,
+)
+from src.core.selection import (
+    DEFAULT_SELECTION_POLICY,
+    SELECTION_POLICIES,
+    enforce_status_length,
+    fetch_quote_concurrently,
+    fetch_quote_with_retries,
+)
 
-from src.core.builders import build_parser, build_github_client
-from src.core.selection import enforce_status_length, select_quote_for_length, fetch_quote_with_retries
-from src.parser.site_parser import QuoteParser
-from src.github.status_client import GitHubStatusClient, GitHubStatusError
+if TYPE_CHECKING:
+    # тяжёлые модули (requests, bs4, asyncio, sqlite3) импортируются там, где нужны
+    from src.core.pool import QuotePool
+    from src.parser.aggregator import QuoteAggregator
+    from src.parser.async_parser import AsyncQuoteParser
+    from src.parser.site_parser import QuoteParser
+    from src.github.status_client import GitHubStatusClient
 
 
 DEFAULT_MAX_STATUS_LENGTH = 80
+DEFAULT_FANOUT_WORKERS = 8
 
 
-def update_once(
-    parser: QuoteParser,
-    github_client: Optional[GitHubStatusClient],
-    refresh_interval: int,
+def fetch_status_message(
+    parser: Union[QuoteParser, QuoteAggregator],
     max_status_length: int,
-    github_enabled: bool,
     parser_max_attempts: int,
     parser_retry_interval: float,
-) -> bool:
+    pool: Optional[QuotePool] = None,
+    selection_policy: str = DEFAULT_SELECTION_POLICY,
+    async_parser: Optional[AsyncQuoteParser] = None,
+    prefetcher: Optional[QuotePrefetcher] = None,
+    history: Optional[QuoteHistory] = None,
+) -> Tuple[bool, Optional[str]]:
+    """Получает цитату под лимит и печатает её. Возвращает (успех, строка статуса).
+
+    С `prefetcher` цитата не загружается, а берётся готовой из очереди фоновой
+    подгрузки.
+    """
+
+    ok, _, status_message = fetch_status_entry(
+        parser,
+        max_status_length,
+        parser_max_attempts,
+        parser_retry_interval,
+        pool=pool,
+        selection_policy=selection_policy,
+        async_parser=async_parser,
+        prefetcher=prefetcher,
+        history=history,
+    )
+    return ok, status_message
+
+
+def fetch_status_entry(
+    parser: Union[QuoteParser, QuoteAggregator],
+    max_status_length: int,
+    parser_max_attempts: int,
+    parser_retry_interval: float,
+    pool: Optional[QuotePool] = None,
+    selection_policy: str = DEFAULT_SELECTION_POLICY,
+    async_parser: Optional[AsyncQuoteParser] = None,
+    prefetcher: Optional[QuotePrefetcher] = None,
+    history: Optional[QuoteHistory] = None,
+    record: bool = True,
+) -> Tuple[bool, Optional[Dict[str, Optional[str]]], Optional[str]]:
+    """Как `fetch_status_message`, но возвращает и саму цитату: (успех, цитата, строка).
+
+    С `record=False` цитата не записывается в историю — это делает вызывающий,
+    когда статус действительно опубликован. Цитату из `prefetcher` очередь
+    записывает сама при выдаче.
+    """
+
+    if prefetcher is not None:
+        prepared = prefetcher.get()
+        if prepared is None:
+            print("Очередь предзагрузки цитат остановлена.")
+            return False, None, None
+        selected_entry, status_message = prepared.entry, prepared.message
+        print("Цитата взята из очереди предзагрузки.")
+        _print_quote(selected_entry)
+        return True, selected_entry, status_message
+
     try:
-        selected_entry, status_message, attempts, within_limit = fetch_quote_with_retries(
-            parser,
-            max_status_length,
-            parser_max_attempts,
-            parser_retry_interval,
-        )
+        if async_parser is not None:
+            import asyncio
+
+            selected_entry, status_message, attempts, within_limit = asyncio.run(
+                fetch_quote_concurrently(
+                    async_parser,
+                    max_status_length,
+                    parser_max_attempts,
+                    parser_retry_interval,
+                    pool=pool,
+                    policy=selection_policy,
+                    history=history,
+                    record=record,
+                )
+            )
+        else:
+            selected_entry, status_message, attempts, within_limit = fetch_quote_with_retries(
+                parser,
+                max_status_length,
+                parser_max_attempts,
+                parser_retry_interval,
+                pool=pool,
+                policy=selection_policy,
+                history=history,
+                record=record,
+            )
     except Exception as exc:  # pragma: no cover - network errors
+        REGISTRY.inc(COUNTER_FETCH_ERRORS)
         print(f"Ошибка при получении страницы: {exc}")
-        return False
+        return False, None, None
 
     if not status_message:
         print("Нет строки для обновления статуса GitHub.")
-        return True
+        return True, None, None
 
-    quote = selected_entry.get('quote') if selected_entry else None
-    source = selected_entry.get('source') if selected_entry else None
-
-    if attempts > 1 and within_limit:
+    if attempts == 0:
+        print("Цитата взята из локального пула.")
+    elif attempts > 1 and within_limit:
         print(f"Цитата найдена за {attempts} попыток.")
     elif not within_limit:
         print(
@@ -45,6 +164,14 @@ def update_once(
             " и при необходимости обрежем."
         )
 
+    _print_quote(selected_entry)
+    return True, selected_entry, status_message
+
+
+def _print_quote(entry: Optional[Dict[str, Optional[str]]]) -> None:
+    quote = entry.get('quote') if entry else None
+    source = entry.get('source') if entry else None
+
     if quote:
         print(f"QUOTE: {quote}")
     else:
@@ -55,50 +182,321 @@ def update_once(
     else:
         print("SOURCE: не найдено")
 
-    if not github_enabled:
-        return True
 
-    if not github_client:
-        return True
+def publish_status(
+    github_client: GitHubStatusClient,
+    status_message: str,
+    max_status_length: int,
+    refresh_interval: int,
+    label: Optional[str] = None,
+) -> bool:
+    """Обрезает строку под лимит, устанавливает статус и проверяет результат."""
+
+    from src.github.status_client import GitHubRateLimitError, GitHubStatusError
+
+    prefix = f"[{label}] " if label else ""
 
     status_message, truncated = enforce_status_length(status_message, max_status_length)
     if truncated:
+        REGISTRY.inc(COUNTER_TRUNCATIONS)
         print(
-            f"Предупреждение: статус длиннее {max_status_length} символов и был обрезан: "
+            f"{prefix}Предупреждение: статус длиннее {max_status_length} символов и был обрезан: "
             f"{status_message}"
         )
 
     if github_client.debug:
-        print(f"[debug] formatted status message: {status_message}")
+        print(f"{prefix}[debug] formatted status message: {status_message}")
 
     try:
-        github_client.set_status(status_message, expires_in_seconds=refresh_interval)
-        matched, current_status = github_client.verify_status(
-            status_message,
-            attempts=3,
-            delay_seconds=2.0,
-        )
+        skipped_before = github_client.skipped_updates
+        with REGISTRY.timer(STAGE_MUTATION):
+            result = github_client.set_status(status_message, expires_in_seconds=refresh_interval)
+        if github_client.skipped_updates != skipped_before:
+            REGISTRY.inc(COUNTER_SKIPPED_UPDATES)
+            print(f"{prefix}Статус GitHub уже актуален, обновление пропущено.")
+            return True
+        with REGISTRY.timer(STAGE_VERIFY):
+            matched, current_status = github_client.verify_status(
+                status_message,
+                attempts=3,
+                delay_seconds=1.0,
+                result=result,
+            )
         if matched:
-            print("Статус GitHub обновлён и подтверждён.")
+            print(f"{prefix}Статус GitHub обновлён и подтверждён.")
         else:
             actual_text = current_status.message if current_status else "<пусто>"
             print(
-                "Предупреждение: GitHub статус не совпадает с ожидаемым. "
+                f"{prefix}Предупреждение: GitHub статус не совпадает с ожидаемым. "
                 f"Текущее значение: {actual_text}"
             )
+    except GitHubRateLimitError as err:
+        REGISTRY.inc(COUNTER_API_ERRORS, kind='rate_limit')
+        # лимит временный: пропускаем цикл, но не останавливаем скрипт
+        wait = f" (повтор не раньше чем через {round(err.retry_after)} с)" if err.retry_after else ""
+        print(f"{prefix}GitHub ограничил частоту запросов, статус не обновлён{wait}.")
     except GitHubStatusError as err:
-        print(f"Не удалось обновить статус GitHub: {err}")
+        REGISTRY.inc(COUNTER_API_ERRORS, kind='status')
+        print(f"{prefix}Не удалось обновить статус GitHub: {err}")
         return False
 
+    if github_client.debug:
+        budget = github_client.rate_limit_budget()
+        if budget.remaining is not None:
+            print(f"{prefix}[debug] лимит GitHub API: осталось {budget.remaining} из {budget.limit}")
+
     return True
 
 
-def main() -> None:
+def update_once(
+    parser: Union[QuoteParser, QuoteAggregator],
+    github_client: Optional[GitHubStatusClient],
+    refresh_interval: int,
+    max_status_length: int,
+    github_enabled: bool,
+    parser_max_attempts: int,
+    parser_retry_interval: float,
+    pool: Optional[QuotePool] = None,
+    selection_policy: str = DEFAULT_SELECTION_POLICY,
+    async_parser: Optional[AsyncQuoteParser] = None,
+    prefetcher: Optional[QuotePrefetcher] = None,
+    history: Optional[QuoteHistory] = None,
+) -> bool:
+    with REGISTRY.cycle():
+        ok, status_message = fetch_status_message(
+            parser,
+            max_status_length,
+            parser_max_attempts,
+            parser_retry_interval,
+            pool=pool,
+            selection_policy=selection_policy,
+            async_parser=async_parser,
+            prefetcher=prefetcher,
+            history=history,
+        )
+        if not ok:
+            return False
+
+        if not status_message:
+            return True
+
+        if not github_enabled:
+            return True
+
+        if not github_client:
+            return True
+
+        return publish_status(github_client, status_message, max_status_length, refresh_interval)
+
+
+def update_accounts_once(
+    parser: Union[QuoteParser, QuoteAggregator],
+    accounts: List[Account],
+    parser_max_attempts: int,
+    parser_retry_interval: float,
+    pool: Optional[QuotePool] = None,
+    selection_policy: str = DEFAULT_SELECTION_POLICY,
+    async_parser: Optional[AsyncQuoteParser] = None,
+    prefetcher: Optional[QuotePrefetcher] = None,
+    history: Optional[QuoteHistory] = None,
+    max_workers: int = DEFAULT_FANOUT_WORKERS,
+) -> bool:
+    """Получает одну цитату и параллельно ставит её статусом всем `accounts`.
+
+    Цитата подбирается под самый строгий `max_status_length` среди аккаунтов,
+    поэтому помещается во все. Ошибка одного аккаунта не мешает остальным;
+    False возвращается только при ошибке получения цитаты.
+    """
+
+    if not accounts:
+        return True
+
+    with REGISTRY.cycle():
+        ok, status_message = fetch_status_message(
+            parser,
+            min(account.max_status_length for account in accounts),
+            parser_max_attempts,
+            parser_retry_interval,
+            pool=pool,
+            selection_policy=selection_policy,
+            async_parser=async_parser,
+            prefetcher=prefetcher,
+            history=history,
+        )
+        if not ok:
+            return False
+
+        if not status_message:
+            return True
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        workers = max(1, min(len(accounts), max_workers))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='status-fanout') as executor:
+            outcomes = list(
+                executor.map(
+                    lambda account: publish_status(
+                        account.client,
+                        status_message,
+                        account.max_status_length,
+                        account.refresh_interval,
+                        label=account.name,
+                    ),
+                    accounts,
+                )
+            )
+
+        print(f"Статус обновлён для {sum(outcomes)} из {len(accounts)} аккаунтов.")
+        return True
+
+
+def run_accounts(
+    parser: Union[QuoteParser, QuoteAggregator],
+    accounts: List[Account],
+    parser_max_attempts: int,
+    parser_retry_interval: float,
+    pool: Optional[QuotePool] = None,
+    selection_policy: str = DEFAULT_SELECTION_POLICY,
+    async_parser: Optional[AsyncQuoteParser] = None,
+    prefetcher: Optional[QuotePrefetcher] = None,
+    history: Optional[QuoteHistory] = None,
+    debug: bool = False,
+) -> None:
+    """Цикл обновления нескольких аккаунтов, каждого по своему интервалу.
+
+    Аккаунты, у которых подошёл срок, обслуживаются одной выборкой цитаты.
+    Цикл завершается, когда ни у одного аккаунта не осталось интервала.
+    """
+
+    if not accounts:
+        print("Нет ни одного аккаунта GitHub для обновления.")
+        return
+
+    while True:
+        now = time.monotonic()
+        due = due_accounts(accounts, now)
+        if due:
+            success = update_accounts_once(
+                parser,
+                due,
+                parser_max_attempts,
+                parser_retry_interval,
+                pool=pool,
+                selection_policy=selection_policy,
+                async_parser=async_parser,
+                prefetcher=prefetcher,
+                history=history,
+            )
+            if debug:
+                _print_parser_stats(parser)
+            if not success:
+                break
+            finished = time.monotonic()
+            for account in due:
+                account.schedule_next(finished)
+
+        wake_at = next_due_time(accounts)
+        if wake_at == math.inf:
+            break
+
+        delay = max(0.0, wake_at - time.monotonic())
+        if delay:
+            print(f"Следующее обновление статуса через {round(delay)} секунд...")
+            time.sleep(delay)
+
+
+def _print_parser_stats(parser: Union[QuoteParser, QuoteAggregator]) -> None:
+    stats = parser.connection_stats()
+    print(
+        f"[debug] HTTP парсера: запросов {stats['requests']}, "
+        f"новых соединений {stats['connections']}, "
+        f"переиспользовано {stats['reused']}"
+    )
+    from src.parser.aggregator import QuoteAggregator
+
+    if isinstance(parser, QuoteAggregator):
+        for health in parser.health_report():
+            latency = health['latency']
+            print(
+                f"[debug] источник {health['name']}: "
+                f"вес {health['effective_weight']:.2f}/{health['weight']:.2f}, "
+                f"задержка {latency if latency is None else round(latency, 3)} с, "
+                f"ошибки {health['errors']}/{health['requests']}"
+                + (", на паузе" if health['cooldown'] else "")
+            )
+
+
+def _close_all(
+    parser: Union[QuoteParser, QuoteAggregator],
+    async_parser: Optional[AsyncQuoteParser],
+    pool: Optional[QuotePool],
+    prefetcher: Optional[QuotePrefetcher] = None,
+    metrics_server: Optional[MetricsServer] = None,
+) -> None:
+    if metrics_server is not None:
+        metrics_server.close()
+    if prefetcher is not None:
+        prefetcher.close()
+    if async_parser is not None:
+        async_parser.close()
+    parser.close()
+    if pool is not None:
+        pool.close()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    cli = argparse.ArgumentParser(description='Обновление статуса GitHub цитатой')
+    cli.add_argument(
+        '--profile',
+        action='store_true',
+        help='прогнать несколько циклов update_once под профилировщиком и выйти',
+    )
+    cli.add_argument('--profile-cycles', type=int, default=DEFAULT_PROFILE_CYCLES)
+    cli.add_argument('--profile-mode', choices=PROFILE_MODES, default=PROFILE_CPROFILE)
+    cli.add_argument(
+        '--profile-output',
+        default=DEFAULT_PROFILE_OUTPUT,
+        help='префикс файлов профиля: <префикс>.pstats и <префикс>.collapsed',
+    )
+    cli.add_argument(
+        '--profile-interval',
+        type=float,
+        default=DEFAULT_SAMPLE_INTERVAL,
+        help='период сэмплирования стеков, секунды',
+    )
+    return cli.parse_args(argv)
+
+
+def profile_cycles(cycle: Any, args: argparse.Namespace) -> None:
+    """Выполняет `args.profile_cycles` циклов под профилировщиком и печатает сводку."""
+
+    profiler = CycleProfiler(
+        mode=args.profile_mode,
+        output_prefix=args.profile_output,
+        interval=args.profile_interval,
+    )
+    print(f"Профилирование: {args.profile_cycles} циклов, режим {args.profile_mode}.")
+    profiler.run(cycle, cycles=args.profile_cycles)
+    print(profiler.summary())
+    for kind, path in profiler.files().items():
+        print(f"Профиль ({kind}) сохранён в {path}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
     from src.core.config import load_config
 
+    args = parse_args(argv)
     config = load_config()
     parser_cfg = config.get('parser') or {}
-    parser = build_parser(config)
+    try:
+        parser = build_parser(config)
+    except ValueError as exc:
+        print(f"Ошибка в настройках парсера: {exc}")
+        sys.exit(1)
+    async_parser = build_async_parser(config, parser)
+    pool = build_quote_pool(config)
+    history = build_quote_history(config)
+    metrics_server = build_metrics_server(config)
     github_config = config.get('github') or {}
     # top-level loop and interval
     loop_enabled = bool(config.get('loop', True))
@@ -117,20 +515,136 @@ def main() -> None:
     if parser_retry_interval < 0:
         parser_retry_interval = 0.0
 
-    github_client, github_enabled = build_github_client(github_config, debug=global_debug)
+    selection_policy = parser_cfg.get('selection_policy') or DEFAULT_SELECTION_POLICY
+    if selection_policy not in SELECTION_POLICIES:
+        print(
+            f"Предупреждение: неизвестная политика выбора '{selection_policy}', "
+            f"используем '{DEFAULT_SELECTION_POLICY}'."
+        )
+        selection_policy = DEFAULT_SELECTION_POLICY
+
     max_status_length = int(
         github_config.get('max_status_length') or DEFAULT_MAX_STATUS_LENGTH
     )
 
+    if args.profile:
+        github_client, github_enabled = build_github_client(github_config, debug=global_debug)
+        try:
+            profile_cycles(
+                lambda: update_once(
+                    parser,
+                    github_client,
+                    refresh_interval,
+                    max_status_length,
+                    github_enabled,
+                    parser_max_attempts,
+                    parser_retry_interval,
+                    pool=pool,
+                    selection_policy=selection_policy,
+                    async_parser=async_parser,
+                    history=history,
+                ),
+                args,
+            )
+        finally:
+            _close_all(parser, async_parser, pool, metrics_server=metrics_server)
+        return
+
     # if loop globally disabled, force single-run
     if not loop_enabled:
         refresh_interval = 0
 
+    if github_config.get('accounts'):
+        accounts = build_github_accounts(
+            github_config,
+            max_status_length,
+            refresh_interval,
+            debug=global_debug,
+        )
+        if not loop_enabled:
+            for account in accounts:
+                account.refresh_interval = 0
+        prefetcher = None
+        if accounts and any(account.refresh_interval > 0 for account in accounts):
+            prefetcher = build_prefetcher(
+                config,
+                min(account.max_status_length for account in accounts),
+                parser_max_attempts,
+                parser_retry_interval,
+                parser=parser,
+                pool=pool,
+                selection_policy=selection_policy,
+                async_parser=async_parser,
+                history=history,
+            )
+        try:
+            run_accounts(
+                parser,
+                accounts,
+                parser_max_attempts,
+                parser_retry_interval,
+                pool=pool,
+                selection_policy=selection_policy,
+                async_parser=async_parser,
+                prefetcher=prefetcher,
+                history=history,
+                debug=global_debug,
+            )
+        except KeyboardInterrupt:
+            print("Остановка по Ctrl+C.")
+        finally:
+            _close_all(parser, async_parser, pool, prefetcher, metrics_server)
+        return
+
+    github_client, github_enabled = build_github_client(github_config, debug=global_debug)
+
     # if github is enabled but we couldn't construct a client (e.g. missing token),
     # fall back to single-run to avoid repeated failing attempts
     if github_enabled and not github_client:
         refresh_interval = 0
 
+    prefetcher = None
+    if refresh_interval > 0:
+        prefetcher = build_prefetcher(
+            config,
+            max_status_length,
+            parser_max_attempts,
+            parser_retry_interval,
+            parser=parser,
+            pool=pool,
+            selection_policy=selection_policy,
+            async_parser=async_parser,
+            history=history,
+        )
+
+    if config.get('daemon', False) and refresh_interval > 0:
+        import asyncio
+
+        from src.core.daemon import run_daemon
+
+        try:
+            asyncio.run(
+                run_daemon(
+                    parser,
+                    github_client,
+                    refresh_interval,
+                    max_status_length,
+                    github_enabled,
+                    parser_max_attempts,
+                    parser_retry_interval,
+                    pool=pool,
+                    selection_policy=selection_policy,
+                    async_parser=async_parser,
+                    prefetcher=prefetcher,
+                    history=history,
+                )
+            )
+        except KeyboardInterrupt:
+            print("Остановка по Ctrl+C.")
+        finally:
+            _close_all(parser, async_parser, pool, prefetcher, metrics_server)
+        return
+
     try:
         while True:
             success = update_once(
@@ -141,7 +655,15 @@ def main() -> None:
                 github_enabled,
                 parser_max_attempts,
                 parser_retry_interval,
+                pool=pool,
+                selection_policy=selection_policy,
+                async_parser=async_parser,
+                prefetcher=prefetcher,
+                history=history,
             )
+            if global_debug:
+                _print_parser_stats(parser)
+
             if not success:
                 break
 
@@ -152,3 +674,5 @@ def main() -> None:
             time.sleep(refresh_interval)
     except KeyboardInterrupt:
         print("Остановка по Ctrl+C.")
+    finally:
+        _close_all(parser, async_parser, pool, prefetcher, metrics_server)
@@ -1,17 +1,27 @@
+import random
 import time
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, List, Mapping, Optional, Tuple
+
+from src.core.metrics import (
+    COUNTER_ATTEMPTS,
+    COUNTER_FALLBACKS,
+    COUNTER_POOL_HITS,
+    REGISTRY,
+    STAGE_SELECT,
+)
+from src.parser.quote import format_status_message, status_message
 
 
 DEFAULT_MAX_STATUS_LENGTH = 80
 TRUNCATION_SUFFIX = "..."
 
+POLICY_FIRST = 'first'
+POLICY_SHORTEST = 'shortest'
+POLICY_LONGEST = 'longest'
+POLICY_RANDOM = 'random'
 
-def format_status_message(quote: Optional[str], source: Optional[str]) -> Optional[str]:
-    if not quote:
-        return None
-    if source:
-        return f'"{quote}" — {source}'
-    return f'"{quote}"'
+SELECTION_POLICIES = (POLICY_FIRST, POLICY_SHORTEST, POLICY_LONGEST, POLICY_RANDOM)
+DEFAULT_SELECTION_POLICY = POLICY_FIRST
 
 
 def enforce_status_length(message: str, limit: int) -> Tuple[str, bool]:
@@ -29,27 +39,74 @@ def enforce_status_length(message: str, limit: int) -> Tuple[str, bool]:
     return f"{clipped}{TRUNCATION_SUFFIX}", True
 
 
+def fits_status_length(max_status_length: int, history: Optional[Any] = None):
+    """Предикат для `QuoteParser.fetch_all(stop_when=...)`: цитата помещается в лимит.
+
+    С `history` (`QuoteHistory`) недавно опубликованные цитаты не подходят.
+    """
+
+    def predicate(entry: Mapping[str, Optional[str]]) -> bool:
+        message = status_message(entry)
+        if not message or len(message) > max_status_length:
+            return False
+        return history is None or not history.seen(entry)
+
+    return predicate
+
+
 def select_quote_for_length(
-    candidates: List[Dict[str, Optional[str]]],
+    candidates: List[Mapping[str, Optional[str]]],
     max_status_length: int,
-) -> Tuple[Optional[Dict[str, Optional[str]]], Optional[str]]:
-    """Возвращает первую цитату, которая помещается в лимит, либо первую доступную."""
+    policy: str = DEFAULT_SELECTION_POLICY,
+    history: Optional[Any] = None,
+) -> Tuple[Optional[Mapping[str, Optional[str]]], Optional[str]]:
+    """Возвращает цитату, которая помещается в лимит, либо первую доступную.
+
+    При политике `first` берётся первая подходящая цитата; `shortest`,
+    `longest` и `random` выбирают среди всех подходящих за один проход
+    (`random` — reservoir sampling). Цитаты, которые есть в `history`,
+    пропускаются.
+    """
 
-    fallback_entry: Optional[Dict[str, Optional[str]]] = None
+    if policy not in SELECTION_POLICIES:
+        raise ValueError(f"Неизвестная политика выбора цитаты: {policy}")
+
+    fallback_entry: Optional[Mapping[str, Optional[str]]] = None
     fallback_message: Optional[str] = None
+    best_entry: Optional[Mapping[str, Optional[str]]] = None
+    best_message: Optional[str] = None
+    fitting = 0
 
     for entry in candidates:
-        message = format_status_message(entry.get('quote'), entry.get('source'))
+        message = status_message(entry)
         if not message:
             continue
+        if history is not None and history.seen(entry):
+            continue
 
         if fallback_entry is None:
             fallback_entry = entry
             fallback_message = message
 
-        if len(message) <= max_status_length:
+        length = len(message)
+        if length > max_status_length:
+            continue
+        if policy == POLICY_FIRST:
             return entry, message
 
+        fitting += 1
+        if policy == POLICY_SHORTEST:
+            better = best_message is None or length < len(best_message)
+        elif policy == POLICY_LONGEST:
+            better = best_message is None or length > len(best_message)
+        else:
+            better = random.randrange(fitting) == 0
+        if better:
+            best_entry, best_message = entry, message
+
+    if best_message is not None:
+        return best_entry, best_message
+
     return fallback_entry, fallback_message
 
 
@@ -58,25 +115,54 @@ def fetch_quote_with_retries(
     max_status_length: int,
     max_attempts: int,
     retry_interval: float,
-) -> Tuple[Optional[Dict[str, Optional[str]]], Optional[str], int, bool]:
-    """Повторяет запрос страницы, пока не найдёт цитату в пределах лимита."""
+    pool: Optional[Any] = None,
+    policy: str = DEFAULT_SELECTION_POLICY,
+    history: Optional[Any] = None,
+    record: bool = True,
+) -> Tuple[Optional[Mapping[str, Optional[str]]], Optional[str], int, bool]:
+    """Повторяет запрос страницы, пока не найдёт цитату в пределах лимита.
+
+    Если передан `pool`, сначала пробует взять подходящую цитату из него
+    (тогда `attempts == 0`), а все скачанные результаты складывает в пул.
+    Без пула и при политике `first` разбор страницы (и чтение ответа в потоковом
+    режиме парсера) прекращается на первой подходящей цитате.
+
+    С `history` недавно опубликованные цитаты не выбираются и не попадают в пул,
+    а выбранная цитата записывается в историю. С `record=False` история только
+    фильтрует кандидатов: запись делает тот, кто публикует цитату (очередь
+    предзагрузки).
+    """
+
+    if pool is not None:
+        with REGISTRY.timer(STAGE_SELECT):
+            entry, message = _take_unseen(pool, max_status_length, policy, history)
+        if message:
+            return _finish(history, entry, message, 0, True, record)
 
     attempts = 0
-    fallback_entry: Optional[Dict[str, Optional[str]]] = None
+    fallback_entry: Optional[Mapping[str, Optional[str]]] = None
     fallback_message: Optional[str] = None
     unlimited = max_attempts <= 0
+    stop_when = None
+    if pool is None and policy == POLICY_FIRST:
+        stop_when = fits_status_length(max_status_length, history)
 
     while True:
         attempts += 1
-        results = parser.fetch_all()
+        results = parser.fetch_all(stop_when=stop_when)
         if results:
-            entry, message = select_quote_for_length(results, max_status_length)
+            with REGISTRY.timer(STAGE_SELECT):
+                if pool is not None:
+                    pool.add_many(_unseen(results, history))
+                entry, message = select_quote_for_length(results, max_status_length, policy, history)
             if message:
                 if fallback_entry is None:
                     fallback_entry = entry
                     fallback_message = message
                 if len(message) <= max_status_length:
-                    return entry, message, attempts, True
+                    if pool is not None:
+                        pool.mark_used(entry)
+                    return _finish(history, entry, message, attempts, True, record)
 
         if not unlimited and attempts >= max_attempts:
             break
@@ -84,4 +170,94 @@ def fetch_quote_with_retries(
         if retry_interval > 0:
             time.sleep(retry_interval)
 
-    return fallback_entry, fallback_message, attempts, False
+    return _finish(history, fallback_entry, fallback_message, attempts, False, record)
+
+
+async def fetch_quote_concurrently(
+    async_parser: Any,
+    max_status_length: int,
+    max_attempts: int,
+    retry_interval: float = 0.0,
+    pool: Optional[Any] = None,
+    policy: str = DEFAULT_SELECTION_POLICY,
+    history: Optional[Any] = None,
+    record: bool = True,
+) -> Tuple[Optional[Mapping[str, Optional[str]]], Optional[str], int, bool]:
+    """Асинхронный аналог `fetch_quote_with_retries` поверх `AsyncQuoteParser`.
+
+    Запросы страниц идут параллельно; как только какая-то страница дала цитату
+    в пределах лимита, остальные запросы отменяются. Между волнами по
+    `concurrency` запросов выдерживается пауза `retry_interval`, чтобы при
+    `max_attempts: 0` не засыпать сайт запросами. `attempts` — число
+    обработанных страниц.
+    """
+
+    if pool is not None:
+        with REGISTRY.timer(STAGE_SELECT):
+            entry, message = _take_unseen(pool, max_status_length, policy, history)
+        if message:
+            return _finish(history, entry, message, 0, True, record)
+
+    attempts = 0
+    fallback_entry: Optional[Mapping[str, Optional[str]]] = None
+    fallback_message: Optional[str] = None
+
+    pages = async_parser.iter_pages(max_requests=max_attempts, retry_interval=retry_interval)
+    try:
+        async for results in pages:
+            attempts += 1
+            if not results:
+                continue
+            with REGISTRY.timer(STAGE_SELECT):
+                if pool is not None:
+                    pool.add_many(_unseen(results, history))
+                entry, message = select_quote_for_length(results, max_status_length, policy, history)
+            if not message:
+                continue
+            if fallback_entry is None:
+                fallback_entry = entry
+                fallback_message = message
+            if len(message) <= max_status_length:
+                if pool is not None:
+                    pool.mark_used(entry)
+                return _finish(history, entry, message, attempts, True, record)
+    finally:
+        await pages.aclose()
+
+    return _finish(history, fallback_entry, fallback_message, attempts, False, record)
+
+
+def _take_unseen(pool: Any, max_status_length: int, policy: str, history: Optional[Any]):
+    """Берёт из пула первую цитату, которой нет в истории; повторы просто расходуются."""
+
+    while True:
+        entry, message = pool.take(max_status_length, policy)
+        if not message or history is None or not history.seen(entry):
+            return entry, message
+
+
+def _unseen(results: List[Mapping[str, Optional[str]]], history: Optional[Any]):
+    if history is None:
+        return results
+    return [entry for entry in results if not history.seen(entry)]
+
+
+def _finish(
+    history: Optional[Any],
+    entry: Optional[Mapping[str, Optional[str]]],
+    message: Optional[str],
+    attempts: int,
+    within_limit: bool,
+    record: bool = True,
+) -> Tuple[Optional[Mapping[str, Optional[str]]], Optional[str], int, bool]:
+    """Записывает выбранную цитату в историю и в метрики, возвращает итог выборки."""
+
+    if record and history is not None and entry is not None:
+        history.record(entry)
+    if attempts == 0:
+        REGISTRY.inc(COUNTER_POOL_HITS)
+    else:
+        REGISTRY.inc(COUNTER_ATTEMPTS, attempts)
+    if message and not within_limit:
+        REGISTRY.inc(COUNTER_FALLBACKS)
+    return entry, message, attempts, within_limit
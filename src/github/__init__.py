@@ -1,5 +1,33 @@
-"""GitHub integration helpers."""
+"""GitHub integration helpers.
 
-from .status_client import GitHubStatusClient, GitHubStatusError
+Exports are imported on first access (PEP 562), so importing the package
+does not load `requests` until a client is actually needed.
+"""
 
-__all__ = ["GitHubStatusClient", "GitHubStatusError"]
+import importlib
+
+_EXPORTS = {
+    "GitHubRateLimitError": ".status_client",
+    "GitHubStatusClient": ".status_client",
+    "GitHubStatusError": ".status_client",
+    "RateLimitBudget": ".rate_limit",
+    "RateLimiter": ".rate_limit",
+    "StatusBatchResult": ".status_client",
+    "StatusCache": ".status_cache",
+    "StatusResult": ".status_client",
+    "StatusUpdate": ".status_client",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,175 @@
+"""Client-side scheduling around GitHub API rate limits.
+
+GitHub reports the primary budget in `X-RateLimit-*` headers (and in the
+GraphQL `rateLimit` object), and signals secondary limits with 403/429 plus
+`Retry-After`. `RateLimiter` keeps that state per token, serialises requests,
+spaces them out and tells the caller how long to wait before the next one.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional
+
+from .status_cache import parse_timestamp
+
+DEFAULT_MIN_INTERVAL_SECONDS = 0.0
+DEFAULT_MAX_WAIT_SECONDS = 60.0
+# Below this many remaining points, requests are spread evenly until reset.
+LOW_BUDGET_THRESHOLD = 50
+# Used when a secondary limit is hit without Retry-After (GitHub suggests >= 1 minute).
+DEFAULT_SECONDARY_BACKOFF_SECONDS = 60.0
+
+
+@dataclass
+class RateLimitBudget:
+    """Snapshot of what GitHub last reported for a token."""
+
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    used: Optional[int] = None
+    reset_at: Optional[float] = None
+    last_cost: Optional[int] = None
+    blocked_until: float = 0.0
+
+
+class RateLimiter:
+    """Tracks the remaining budget of one token and paces requests to it."""
+
+    def __init__(
+        self,
+        min_interval: float = DEFAULT_MIN_INTERVAL_SECONDS,
+        clock=time.time,
+    ) -> None:
+        self.min_interval = max(0.0, float(min_interval))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._budget = RateLimitBudget()
+        self._next_slot = 0.0
+
+    def budget(self) -> RateLimitBudget:
+        with self._lock:
+            return RateLimitBudget(**vars(self._budget))
+
+    def reserve(self, max_wait: Optional[float] = None) -> float:
+        """Books the next request slot and returns how many seconds to wait for it.
+
+        Slots are handed out in call order, so concurrent callers sharing a
+        token queue up instead of bursting. When the wait would exceed
+        `max_wait`, nothing is booked and the caller should give up.
+        """
+
+        with self._lock:
+            now = self._clock()
+            start = max(now, self._next_slot, self._budget.blocked_until)
+            spacing = self.min_interval
+
+            budget = self._budget
+            if budget.remaining is not None and budget.reset_at and budget.reset_at > start:
+                if budget.remaining <= 0:
+                    start = budget.reset_at
+                elif budget.remaining < LOW_BUDGET_THRESHOLD:
+                    spacing = max(spacing, (budget.reset_at - start) / budget.remaining)
+
+            wait = start - now
+            if max_wait is None or wait <= max_wait:
+                self._next_slot = start + spacing
+            return wait
+
+    def update_from_headers(self, headers: Mapping[str, Any]) -> None:
+        limit = _to_int(_header(headers, "X-RateLimit-Limit"))
+        remaining = _to_int(_header(headers, "X-RateLimit-Remaining"))
+        used = _to_int(_header(headers, "X-RateLimit-Used"))
+        reset = _to_int(_header(headers, "X-RateLimit-Reset"))
+        with self._lock:
+            if limit is not None:
+                self._budget.limit = limit
+            if remaining is not None:
+                self._budget.remaining = remaining
+            if used is not None:
+                self._budget.used = used
+            if reset is not None:
+                self._budget.reset_at = float(reset)
+
+    def update_from_graphql(self, rate_limit: Optional[Mapping[str, Any]]) -> None:
+        """Applies a GraphQL `rateLimit { limit cost remaining resetAt }` object."""
+
+        if not isinstance(rate_limit, Mapping):
+            return
+        reset_at = parse_timestamp(rate_limit.get("resetAt"))
+        with self._lock:
+            for key, attr in (("limit", "limit"), ("remaining", "remaining"), ("cost", "last_cost")):
+                value = _to_int(rate_limit.get(key))
+                if value is not None:
+                    setattr(self._budget, attr, value)
+            if reset_at is not None:
+                self._budget.reset_at = reset_at
+
+    def block(self, headers: Optional[Mapping[str, Any]] = None) -> float:
+        """Records a rate-limit rejection and returns seconds until requests may resume."""
+
+        now = self._clock()
+        retry_after = parse_retry_after(_header(headers, "Retry-After"), now)
+        with self._lock:
+            if retry_after is None:
+                if self._budget.remaining == 0 and self._budget.reset_at and self._budget.reset_at > now:
+                    retry_after = self._budget.reset_at - now
+                else:
+                    retry_after = DEFAULT_SECONDARY_BACKOFF_SECONDS
+            self._budget.blocked_until = max(self._budget.blocked_until, now + retry_after)
+            return self._budget.blocked_until - now
+
+
+def parse_retry_after(value: Any, now: float) -> Optional[float]:
+    """`Retry-After` is either delta-seconds or an HTTP date."""
+
+    seconds = _to_int(value)
+    if seconds is not None:
+        return float(max(0, seconds))
+    if not isinstance(value, str):
+        return None
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, moment.timestamp() - now)
+
+
+_registry: Dict[str, RateLimiter] = {}
+_registry_lock = threading.Lock()
+
+
+def limiter_for_token(token: Optional[str], min_interval: float = DEFAULT_MIN_INTERVAL_SECONDS) -> RateLimiter:
+    """Returns the process-wide limiter of a token, so clients sharing it share the budget."""
+
+    key = hashlib.sha256((token or "").encode("utf-8")).hexdigest()
+    with _registry_lock:
+        limiter = _registry.get(key)
+        if limiter is None:
+            limiter = _registry[key] = RateLimiter(min_interval=min_interval)
+        else:
+            limiter.min_interval = max(limiter.min_interval, float(min_interval))
+        return limiter
+
+
+def _header(headers: Optional[Mapping[str, Any]], name: str) -> Any:
+    if headers is None:
+        return None
+    try:
+        return headers.get(name)
+    except AttributeError:
+        return None
+
+
+def _to_int(value: Any) -> Optional[int]:
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
@@ -0,0 +1,119 @@
+"""Persisted record of the last confirmed status per account.
+
+Lets `GitHubStatusClient` skip `changeUserStatus` when the status it is about
+to set is already live with a long enough expiry, or, with a refresh window,
+when the live expiry is still comfortably far away.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+DEFAULT_STATUS_CACHE_PATH = ".cache/github_status.json"
+# A cached expiry this close to the requested one still counts as "unchanged".
+EXPIRY_TOLERANCE_SECONDS = 60.0
+
+
+@dataclass
+class CachedStatus:
+    message: str
+    emoji: Optional[str]
+    expires_at: Optional[str]
+
+    def covers(
+        self,
+        message: str,
+        emoji: Optional[str],
+        expires_at: Optional[str],
+        tolerance: float = EXPIRY_TOLERANCE_SECONDS,
+        refresh_window: Optional[float] = None,
+        now: Optional[float] = None,
+    ) -> bool:
+        """True when setting (message, emoji, expires_at) would change nothing visible.
+
+        The live status must show the same text and emoji, and must not expire
+        noticeably earlier than requested (a later expiry is fine). A loop asks
+        for an expiry one interval later every cycle, so with `refresh_window`
+        the status also counts as covered while it has more than that many
+        seconds left; it is only extended once it is about to run out.
+        """
+
+        if self.message != message or (self.emoji or None) != (emoji or None):
+            return False
+        if expires_at is None or self.expires_at is None:
+            return expires_at is None and self.expires_at is None
+
+        cached = parse_timestamp(self.expires_at)
+        wanted = parse_timestamp(expires_at)
+        if cached is None or wanted is None:
+            return False
+        if cached >= wanted - tolerance:
+            return True
+        if refresh_window is None:
+            return False
+        current = time.time() if now is None else now
+        return cached - current > refresh_window
+
+
+class StatusCache:
+    """JSON file `{key: {message, emoji, expires_at}}` shared by all accounts."""
+
+    def __init__(self, path: str = DEFAULT_STATUS_CACHE_PATH) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, CachedStatus] = self._load()
+
+    def get(self, key: str) -> Optional[CachedStatus]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key: str, status: CachedStatus) -> None:
+        with self._lock:
+            self._entries[key] = status
+            self._save()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._save()
+
+    def _load(self) -> Dict[str, CachedStatus]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        entries = {}
+        for key, value in raw.items() if isinstance(raw, dict) else ():
+            try:
+                entries[key] = CachedStatus(**value)
+            except TypeError:
+                continue
+        return entries
+
+    def _save(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({key: asdict(value) for key, value in self._entries.items()}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[float]:
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
@@ -3,14 +3,43 @@
 from __future__ import annotations
 
 import json
+import random
 import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from .rate_limit import (
+    DEFAULT_MAX_WAIT_SECONDS,
+    DEFAULT_MIN_INTERVAL_SECONDS,
+    RateLimitBudget,
+    RateLimiter,
+    limiter_for_token,
+)
+from .status_cache import CachedStatus, StatusCache
 
 GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+DEFAULT_POOL_SIZE = 10
+DEFAULT_BATCH_SIZE = 20
+
+VERIFY_AUTO = "auto"
+VERIFY_MUTATION = "mutation"
+VERIFY_POLL = "poll"
+VERIFY_OFF = "off"
+VERIFY_MODES = (VERIFY_AUTO, VERIFY_MUTATION, VERIFY_POLL, VERIFY_OFF)
+DEFAULT_VERIFY_MODE = VERIFY_AUTO
+MAX_VERIFY_DELAY_SECONDS = 30.0
+
+STATUS_FIELDS = """
+    status {
+      message
+      emoji
+      expiresAt
+    }
+"""
 
 STATUS_MUTATION = """
 mutation($input: ChangeUserStatusInput!) {
@@ -33,6 +62,12 @@ query {
             expiresAt
         }
     }
+    rateLimit {
+        limit
+        cost
+        remaining
+        resetAt
+    }
 }
 """
 
@@ -41,6 +76,14 @@ class GitHubStatusError(RuntimeError):
     """Raised when GitHub status update fails."""
 
 
+class GitHubRateLimitError(GitHubStatusError):
+    """Raised when GitHub rate limits the token for longer than the client may wait."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 @dataclass
 class StatusResult:
     message: str
@@ -48,6 +91,47 @@ class StatusResult:
     expires_at: Optional[str]
 
 
+@dataclass
+class StatusUpdate:
+    """One `changeUserStatus` call inside a batch."""
+
+    message: str
+    emoji: Optional[str] = None
+    expires_in_seconds: Optional[int] = None
+    organization_id: Optional[str] = None
+
+
+@dataclass
+class StatusBatchResult:
+    """Outcome of a single update from `set_status_many`.
+
+    `result` is None in dry-run mode or when the item failed; `error` holds the
+    GraphQL error message(s) reported for this item only.
+    """
+
+    update: StatusUpdate
+    result: Optional[StatusResult] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def build_github_session(pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """Creates a keep-alive session that several clients (accounts) can share.
+
+    Authorization is sent per request by each client, so one connection pool
+    serves all tokens.
+    """
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
 class GitHubStatusClient:
     """Small helper around GitHub's GraphQL API to change user status."""
 
@@ -59,24 +143,44 @@ class GitHubStatusClient:
         timeout: int = 10,
         dry_run: bool = False,
         debug: bool = False,
+        session: Optional[requests.Session] = None,
+        verify_mode: str = DEFAULT_VERIFY_MODE,
+        min_interval: float = DEFAULT_MIN_INTERVAL_SECONDS,
+        max_wait_seconds: float = DEFAULT_MAX_WAIT_SECONDS,
+        rate_limiter: Optional[RateLimiter] = None,
+        status_cache: Optional[StatusCache] = None,
+        cache_key: str = "default",
+        refresh_cache: bool = False,
+        refresh_window: Optional[float] = None,
     ) -> None:
         if not token and not dry_run:
             raise ValueError("GitHub token is required unless dry_run is True")
+        if verify_mode not in VERIFY_MODES:
+            raise ValueError(f"Unknown verify_mode {verify_mode!r}, expected one of {VERIFY_MODES}")
 
         self.api_url = api_url
         self.default_emoji = default_emoji
         self.timeout = timeout
         self.dry_run = dry_run or not token
         self.debug = debug
-        self._session = requests.Session()
+        self.verify_mode = verify_mode
+        self.max_wait_seconds = max(0.0, float(max_wait_seconds))
+        # Clients built from the same token share one budget and one request queue.
+        self.rate_limiter = rate_limiter or limiter_for_token(token, min_interval)
+        self.status_cache = status_cache
+        self.cache_key = cache_key
+        self.refresh_cache = refresh_cache
+        self.refresh_window = refresh_window
+        self.skipped_updates = 0
+        self._cache_refreshed = False
+        self._session = session or requests.Session()
+        self._headers: Dict[str, str] = {}
         if token:
-            self._session.headers.update(
-                {
-                    "Authorization": f"Bearer {token}",
-                    "Accept": "application/vnd.github+json",
-                    "Content-Type": "application/json",
-                }
-            )
+            self._headers = {
+                "Authorization": f"Bearer {token}",
+                "Accept": "application/vnd.github+json",
+                "Content-Type": "application/json",
+            }
 
     def set_status(
         self,
@@ -113,13 +217,20 @@ class GitHubStatusClient:
             print(json.dumps(payload, ensure_ascii=False, indent=2))
             return None
 
-        response = self._session.post(self.api_url, json=payload, timeout=self.timeout)
-        try:
-            response.raise_for_status()
-        except requests.HTTPError as exc:  # pragma: no cover - exercised via tests
-            raise GitHubStatusError(f"GitHub API request failed: {exc}") from exc
-
-        data = response.json()
+        live = self._cached_status()
+        wanted = payload["variables"]["input"]
+        if live and live.covers(
+            wanted["message"],
+            wanted.get("emoji"),
+            wanted.get("expiresAt"),
+            refresh_window=self.refresh_window,
+        ):
+            if self.debug:
+                print("[debug] status already live, skipping changeUserStatus")
+            self.skipped_updates += 1
+            return StatusResult(message=live.message, emoji=live.emoji, expires_at=live.expires_at)
+
+        data = self._post(payload)
         if self.debug:
             print("[debug] changeUserStatus response:", json.dumps(data, ensure_ascii=False))
         if data.get("errors"):
@@ -132,11 +243,75 @@ class GitHubStatusClient:
                 "GitHub API returned empty status",
             )
 
-        return StatusResult(
-            message=status.get("message"),
-            emoji=status.get("emoji"),
-            expires_at=status.get("expiresAt"),
-        )
+        result = _status_from_payload(status)
+        self._remember(result)
+        return result
+
+    def set_status_many(
+        self,
+        updates: Sequence[StatusUpdate],
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> List[StatusBatchResult]:
+        """Sends several `changeUserStatus` mutations as aliased GraphQL documents.
+
+        Updates are packed `batch_size` at a time into one POST each
+        (`s0: changeUserStatus(...)`, `s1: ...`), and the response is split
+        back per alias. GraphQL errors are attached to the item named in their
+        `path`; errors without a path mark every item of that batch as failed.
+
+        Raises:
+            GitHubStatusError: when the HTTP request itself fails.
+        """
+
+        results: List[StatusBatchResult] = []
+        size = max(1, batch_size)
+        for start in range(0, len(updates), size):
+            results.extend(self._send_batch(list(updates[start:start + size])))
+        return results
+
+    def _send_batch(self, updates: List[StatusUpdate]) -> List[StatusBatchResult]:
+        for update in updates:
+            if not update.message:
+                raise ValueError("Status message is required")
+
+        payload = self._build_batch_payload(updates)
+
+        if self.debug:
+            print("[debug] prepared status batch:", json.dumps(payload, ensure_ascii=False))
+
+        if self.dry_run:
+            print(f"[dry-run] Would send {len(updates)} status mutations:")
+            print(json.dumps(payload, ensure_ascii=False, indent=2))
+            return [StatusBatchResult(update) for update in updates]
+
+        data = self._post(payload)
+        if self.debug:
+            print("[debug] status batch response:", json.dumps(data, ensure_ascii=False))
+
+        item_errors: Dict[str, List[str]] = {}
+        batch_errors: List[str] = []
+        for error in data.get("errors") or []:
+            path = error.get("path") or []
+            message = error.get("message") or str(error)
+            if path and isinstance(path[0], str):
+                item_errors.setdefault(path[0], []).append(message)
+            else:
+                batch_errors.append(message)
+
+        payload_data = data.get("data") or {}
+        results = []
+        for idx, update in enumerate(updates):
+            alias = f"s{idx}"
+            errors = item_errors.get(alias, []) + batch_errors
+            status = (payload_data.get(alias) or {}).get("status")
+            if errors:
+                results.append(StatusBatchResult(update, error="; ".join(errors)))
+            elif not status:
+                results.append(StatusBatchResult(update, error="GitHub API returned empty status"))
+            else:
+                results.append(StatusBatchResult(update, result=_status_from_payload(status)))
+        return results
 
     def fetch_status(self) -> Optional[StatusResult]:
         """Returns the current user status via GraphQL viewer query."""
@@ -145,17 +320,7 @@ class GitHubStatusClient:
             print("[dry-run] Would request current status")
             return None
 
-        response = self._session.post(
-            self.api_url,
-            json={"query": VIEWER_STATUS_QUERY},
-            timeout=self.timeout,
-        )
-        try:
-            response.raise_for_status()
-        except requests.HTTPError as exc:  # pragma: no cover - network errors
-            raise GitHubStatusError(f"GitHub API request failed: {exc}") from exc
-
-        data = response.json()
+        data = self._post({"query": VIEWER_STATUS_QUERY})
         if self.debug:
             print("[debug] viewer status response:", json.dumps(data, ensure_ascii=False))
         if data.get("errors"):
@@ -163,13 +328,12 @@ class GitHubStatusClient:
 
         status = ((data.get("data") or {}).get("viewer") or {}).get("status")
         if not status:
+            self._remember(None)
             return None
 
-        return StatusResult(
-            message=status.get("message"),
-            emoji=status.get("emoji"),
-            expires_at=status.get("expiresAt"),
-        )
+        result = _status_from_payload(status)
+        self._remember(result)
+        return result
 
     def verify_status(
         self,
@@ -177,16 +341,34 @@ class GitHubStatusClient:
         *,
         attempts: int = 3,
         delay_seconds: float = 2.0,
+        result: Optional[StatusResult] = None,
+        mode: Optional[str] = None,
     ) -> tuple[bool, Optional[StatusResult]]:
         """Checks if GitHub status matches expected text.
 
+        `result` is the `StatusResult` returned by `set_status`. Modes:
+        `auto` trusts a matching mutation result and polls the viewer only on
+        mismatch; `mutation` checks the mutation result only; `poll` always
+        queries the viewer; `off` skips verification. Polling waits between
+        attempts with exponential backoff (`delay_seconds * 2**n`, capped) and
+        jitter.
+
         Returns tuple (matched, last_status). When `dry_run` is True the method returns (True, None).
         """
 
-        if self.dry_run:
-            return True, None
+        mode = mode or self.verify_mode
+        if self.dry_run or mode == VERIFY_OFF:
+            return True, result
+
+        if mode in (VERIFY_AUTO, VERIFY_MUTATION) and result is not None:
+            if result.message == expected_message:
+                return True, result
+            if mode == VERIFY_MUTATION:
+                return False, result
+        elif mode == VERIFY_MUTATION:
+            return False, None
 
-        last_status: Optional[StatusResult] = None
+        last_status: Optional[StatusResult] = result
         for attempt in range(max(1, attempts)):
             status = self.fetch_status()
             last_status = status
@@ -194,25 +376,163 @@ class GitHubStatusClient:
                 return True, status
 
             if attempt < attempts - 1:
-                time.sleep(max(0.0, delay_seconds))
+                time.sleep(_backoff_delay(delay_seconds, attempt))
 
         return False, last_status
 
+    def _cached_status(self) -> Optional[CachedStatus]:
+        """Last known live status; seeded once from GitHub when `refresh_cache` is set."""
+
+        if self.status_cache is None:
+            return None
+        cached = self.status_cache.get(self.cache_key)
+        if cached is None and self.refresh_cache and not self._cache_refreshed:
+            self._cache_refreshed = True
+            self.fetch_status()
+            cached = self.status_cache.get(self.cache_key)
+        return cached
+
+    def _remember(self, status: Optional[StatusResult]) -> None:
+        if self.status_cache is None:
+            return
+        if status is None:
+            self.status_cache.delete(self.cache_key)
+        else:
+            self.status_cache.put(
+                self.cache_key,
+                CachedStatus(message=status.message, emoji=status.emoji, expires_at=status.expires_at),
+            )
+
+    def rate_limit_budget(self) -> RateLimitBudget:
+        """Returns the last budget GitHub reported for this client's token."""
+
+        return self.rate_limiter.budget()
+
+    def _post(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POSTs a GraphQL document, pacing it through the token's rate limiter.
+
+        A rate-limited response is retried once if GitHub asks to wait no longer
+        than `max_wait_seconds`; otherwise `GitHubRateLimitError` is raised.
+        Transport failures (connection errors, timeouts) and malformed responses
+        surface as `GitHubStatusError`, like HTTP errors.
+        """
+
+        for attempt in range(2):
+            self._wait_for_slot()
+            try:
+                response = self._session.post(
+                    self.api_url,
+                    json=payload,
+                    headers=self._headers,
+                    timeout=self.timeout,
+                )
+            except requests.RequestException as exc:
+                raise GitHubStatusError(f"GitHub API request failed: {exc}") from exc
+            self.rate_limiter.update_from_headers(response.headers)
+
+            if response.status_code in (403, 429) and _is_rate_limited(response):
+                retry_after = self.rate_limiter.block(response.headers)
+            else:
+                try:
+                    response.raise_for_status()
+                except requests.HTTPError as exc:  # pragma: no cover - exercised via tests
+                    raise GitHubStatusError(f"GitHub API request failed: {exc}") from exc
+                try:
+                    data = response.json()
+                except ValueError as exc:
+                    raise GitHubStatusError(f"GitHub API returned invalid JSON: {exc}") from exc
+                if not _has_rate_limited_error(data):
+                    self.rate_limiter.update_from_graphql((data.get("data") or {}).get("rateLimit"))
+                    return data
+                retry_after = self.rate_limiter.block(None)
+
+            if attempt == 0 and retry_after <= self.max_wait_seconds:
+                if self.debug:
+                    print(f"[debug] GitHub rate limit hit, retrying in {retry_after:.1f}s")
+                continue
+            raise GitHubRateLimitError(
+                f"GitHub rate limit exceeded, retry after {retry_after:.0f}s",
+                retry_after=retry_after,
+            )
+
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def _wait_for_slot(self) -> None:
+        wait = self.rate_limiter.reserve(self.max_wait_seconds)
+        if wait > self.max_wait_seconds:
+            raise GitHubRateLimitError(
+                f"GitHub rate limit budget exhausted, retry after {wait:.0f}s",
+                retry_after=wait,
+            )
+        if wait > 0:
+            if self.debug:
+                print(f"[debug] waiting {wait:.2f}s for GitHub rate limit slot")
+            time.sleep(wait)
+
     def _build_payload(
         self,
         message: str,
         emoji: Optional[str],
         expires_in_seconds: Optional[int],
     ) -> Dict[str, Any]:
-        input_payload: Dict[str, Any] = {"message": message}
+        input_payload = self._build_input(StatusUpdate(message, emoji, expires_in_seconds))
+        return {"query": STATUS_MUTATION, "variables": {"input": input_payload}}
+
+    def _build_batch_payload(self, updates: List[StatusUpdate]) -> Dict[str, Any]:
+        params = ", ".join(f"$input{idx}: ChangeUserStatusInput!" for idx in range(len(updates)))
+        fields = "".join(
+            f"  s{idx}: changeUserStatus(input: $input{idx}) {{{STATUS_FIELDS}  }}\n"
+            for idx in range(len(updates))
+        )
+        return {
+            "query": f"mutation({params}) {{\n{fields}}}",
+            "variables": {
+                f"input{idx}": self._build_input(update) for idx, update in enumerate(updates)
+            },
+        }
 
-        emoji_to_use = emoji or self.default_emoji
+    def _build_input(self, update: StatusUpdate) -> Dict[str, Any]:
+        input_payload: Dict[str, Any] = {"message": update.message}
+
+        emoji_to_use = update.emoji or self.default_emoji
         if emoji_to_use:
             input_payload["emoji"] = emoji_to_use
 
-        if expires_in_seconds and expires_in_seconds > 0:
-            expires_at = datetime.now(timezone.utc) + timedelta(seconds=expires_in_seconds)
+        if update.expires_in_seconds and update.expires_in_seconds > 0:
+            expires_at = datetime.now(timezone.utc) + timedelta(seconds=update.expires_in_seconds)
             iso_value = expires_at.isoformat().replace("+00:00", "Z")
             input_payload["expiresAt"] = iso_value
 
-        return {"query": STATUS_MUTATION, "variables": {"input": input_payload}}
\ No newline at end of file
+        if update.organization_id:
+            input_payload["organizationId"] = update.organization_id
+
+        return input_payload
+
+
+def _backoff_delay(base: float, attempt: int) -> float:
+    """Exponential backoff with "equal jitter": half fixed, half random."""
+
+    delay = min(MAX_VERIFY_DELAY_SECONDS, max(0.0, base) * (2 ** attempt))
+    return delay / 2 + random.uniform(0.0, delay / 2)
+
+
+def _is_rate_limited(response: requests.Response) -> bool:
+    if response.status_code == 429:
+        return True
+    headers = response.headers
+    return headers.get("Retry-After") is not None or headers.get("X-RateLimit-Remaining") == "0"
+
+
+def _has_rate_limited_error(data: Dict[str, Any]) -> bool:
+    return any(
+        isinstance(error, dict) and error.get("type") == "RATE_LIMITED"
+        for error in data.get("errors") or []
+    )
+
+
+def _status_from_payload(status: Dict[str, Any]) -> StatusResult:
+    return StatusResult(
+        message=status.get("message"),
+        emoji=status.get("emoji"),
+        expires_at=status.get("expiresAt"),
+    )
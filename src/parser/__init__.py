@@ -1,5 +1,31 @@
-"""Package for parser-related modules."""
+"""Package for parser-related modules.
 
-from .site_parser import QuoteParser, get_quote_and_source, get_string_from_site
+Exports are imported on first access (PEP 562), so `src.parser.quote` can be
+used without loading requests and BeautifulSoup.
+"""
+import importlib
 
-__all__ = ["QuoteParser", "get_quote_and_source", "get_string_from_site"]
+_EXPORTS = {
+    "QuoteParser": ".site_parser",
+    "AsyncQuoteParser": ".async_parser",
+    "QuoteAggregator": ".aggregator",
+    "QuoteSource": ".aggregator",
+    "ParsePool": ".process_pool",
+    "Quote": ".quote",
+    "get_quote_and_source": ".site_parser",
+    "get_string_from_site": ".site_parser",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,208 @@
+"""Агрегация цитат из нескольких источников.
+
+`QuoteAggregator` опрашивает несколько `QuoteParser` параллельно, выбирая их
+взвешенным round-robin (smooth WRR, как в nginx). Эффективный вес источника
+уменьшается при ошибках и высокой задержке, а после серии ошибок источник
+на время выводится из ротации.
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+DEFAULT_WEIGHT = 1
+DEFAULT_SOURCE_CONCURRENCY = 2
+DEFAULT_LATENCY_TARGET = 1.0
+HEALTH_ALPHA = 0.3
+FAILURES_BEFORE_COOLDOWN = 3
+COOLDOWN_SECONDS = 60.0
+MIN_HEALTH_FACTOR = 0.05
+
+
+class SourceHealth:
+    """Скользящие (EWMA) оценки задержки и доли ошибок источника."""
+
+    def __init__(self):
+        self.latency = None
+        self.error_rate = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+
+    def record(self, latency, ok):
+        self.requests += 1
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += HEALTH_ALPHA * (latency - self.latency)
+        self.error_rate += HEALTH_ALPHA * ((0.0 if ok else 1.0) - self.error_rate)
+
+        if ok:
+            self.consecutive_failures = 0
+            return
+        self.errors += 1
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= FAILURES_BEFORE_COOLDOWN:
+            self.cooldown_until = time.monotonic() + COOLDOWN_SECONDS
+
+    def factor(self, latency_target):
+        """Множитель веса: 1.0 для здорового быстрого источника, меньше — для медленного/сбоящего."""
+
+        factor = 1.0 - self.error_rate
+        if self.latency and self.latency > latency_target:
+            factor *= latency_target / self.latency
+        return max(MIN_HEALTH_FACTOR, factor)
+
+
+class QuoteSource:
+    """Источник цитат: парсер, вес и бюджет одновременных запросов."""
+
+    def __init__(self, name, parser, weight=DEFAULT_WEIGHT, concurrency=DEFAULT_SOURCE_CONCURRENCY):
+        self.name = name
+        self.parser = parser
+        self.weight = max(0.0, float(weight))
+        self.concurrency = max(1, int(concurrency))
+        self.health = SourceHealth()
+        self.current_weight = 0.0
+        self._budget = threading.BoundedSemaphore(self.concurrency)
+
+    def in_cooldown(self, now):
+        return self.health.cooldown_until > now
+
+    def try_acquire(self):
+        """Занимает слот бюджета одновременных запросов; False, если бюджет исчерпан."""
+
+        return self._budget.acquire(blocking=False)
+
+    def release(self):
+        self._budget.release()
+
+
+class QuoteAggregator:
+    """Параллельный сбор цитат из нескольких источников с учётом их здоровья.
+
+    Интерфейс совместим с `QuoteParser`: `fetch_all(stop_when=None)`,
+    `fetch()`, `connection_stats()`, `close()`.
+    """
+
+    def __init__(self, sources, fanout=None, latency_target=DEFAULT_LATENCY_TARGET):
+        if not sources:
+            raise ValueError("Не задано ни одного источника цитат")
+        self.sources = list(sources)
+        self.fanout = max(1, int(fanout)) if fanout else len(self.sources)
+        self.latency_target = latency_target
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=sum(source.concurrency for source in self.sources),
+            thread_name_prefix='quote-source',
+        )
+
+    def choose_sources(self):
+        """Выбирает до `fanout` источников взвешенным round-robin с учётом здоровья."""
+
+        now = time.monotonic()
+        with self._lock:
+            candidates = [s for s in self.sources if s.weight > 0 and not s.in_cooldown(now)]
+            if not candidates:
+                # все источники «болеют» — пробуем все, иначе цикл встанет
+                candidates = [s for s in self.sources if s.weight > 0] or list(self.sources)
+
+            chosen = []
+            for _ in range(min(self.fanout, len(candidates))):
+                pool = [s for s in candidates if s not in chosen]
+                effective = {id(s): s.weight * s.health.factor(self.latency_target) for s in pool}
+                total = sum(effective.values())
+                for source in pool:
+                    source.current_weight += effective[id(source)]
+                best = max(pool, key=lambda s: s.current_weight)
+                best.current_weight -= total
+                chosen.append(best)
+            return chosen
+
+    def fetch_all(self, stop_when=None):
+        """Возвращает цитаты выбранных источников в порядке завершения запросов.
+
+        Если задан `stop_when` и какой-то источник уже вернул подходящую цитату,
+        результат возвращается сразу, не дожидаясь медленных источников.
+        Исключение пробрасывается, только если не ответил ни один источник.
+        """
+
+        futures = {}
+        for source in self.choose_sources():
+            if not source.try_acquire():
+                continue
+            futures[self._executor.submit(self._fetch_source, source, stop_when)] = source
+
+        if not futures:
+            return []
+
+        results = []
+        last_error = None
+        succeeded = False
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    entries = future.result()
+                except Exception as exc:  # ошибка одного источника не останавливает цикл
+                    last_error = exc
+                    continue
+                succeeded = True
+                results.extend(entries)
+                if stop_when is not None and any(stop_when(entry) for entry in entries):
+                    return results
+
+        if not succeeded and last_error is not None:
+            raise last_error
+        return results
+
+    def fetch(self):
+        results = self.fetch_all()
+        if results:
+            return results[0]
+        return {"quote": None, "source": None}
+
+    def health_report(self):
+        """Снимок состояния источников: вес, задержка, доля ошибок, пауза."""
+
+        now = time.monotonic()
+        return [
+            {
+                'name': source.name,
+                'weight': source.weight,
+                'effective_weight': source.weight * source.health.factor(self.latency_target),
+                'latency': source.health.latency,
+                'error_rate': source.health.error_rate,
+                'requests': source.health.requests,
+                'errors': source.health.errors,
+                'cooldown': source.in_cooldown(now),
+            }
+            for source in self.sources
+        ]
+
+    def connection_stats(self):
+        totals = {'requests': 0, 'connections': 0, 'reused': 0}
+        for source in self.sources:
+            for key, value in source.parser.connection_stats().items():
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        for source in self.sources:
+            source.parser.close()
+
+    def _fetch_source(self, source, stop_when):
+        started = time.monotonic()
+        ok = False
+        try:
+            entries = source.parser.fetch_all(stop_when=stop_when)
+            ok = True
+            return entries
+        finally:
+            with self._lock:
+                source.health.record(time.monotonic() - started, ok)
+            source.release()
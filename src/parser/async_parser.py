@@ -0,0 +1,85 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+
+DEFAULT_CONCURRENCY = 4
+
+
+class AsyncQuoteParser:
+    """Асинхронный движок поверх `QuoteParser`.
+
+    Запускает несколько запросов страницы одновременно (не больше `concurrency`)
+    и отдаёт результаты по мере готовности. Сами запросы выполняются блокирующим
+    `QuoteParser.fetch_all()` в пуле потоков, поэтому остальной код парсера
+    переиспользуется без изменений.
+
+    Пример использования:
+        ap = AsyncQuoteParser(QuoteParser(...), concurrency=4)
+        async for results in ap.iter_pages(max_requests=20):
+            ...  # прерывание цикла отменяет ещё не выполненные запросы
+    """
+
+    def __init__(self, parser, concurrency=DEFAULT_CONCURRENCY):
+        self.parser = parser
+        self.concurrency = max(1, int(concurrency or 1))
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.concurrency,
+            thread_name_prefix='quote-fetch',
+        )
+
+    async def fetch_all(self):
+        """Асинхронный аналог `QuoteParser.fetch_all()` для одной страницы."""
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.parser.fetch_all)
+
+    async def fetch_many(self, n):
+        """Скачивает `n` страниц параллельно и возвращает все цитаты одним списком."""
+
+        results = []
+        if n <= 0:
+            return results
+        async for page in self.iter_pages(max_requests=n):
+            results.extend(page)
+        return results
+
+    async def iter_pages(self, max_requests=0, retry_interval=0.0):
+        """Асинхронный генератор результатов страниц в порядке завершения запросов.
+
+        Держит в работе до `concurrency` запросов; `max_requests <= 0` — без
+        ограничения. С `retry_interval > 0` запросы идут волнами по
+        `concurrency` штук: следующая волна начинается через `retry_interval`
+        секунд после завершения предыдущей, как пауза между попытками в
+        последовательном режиме. При закрытии генератора (или ошибке запроса)
+        ожидающие запросы отменяются; уже начатые в потоках завершатся в фоне,
+        а их результат будет отброшен.
+        """
+
+        loop = asyncio.get_running_loop()
+        unlimited = max_requests <= 0
+        paced = retry_interval > 0
+        started = 0
+        pending = set()
+
+        try:
+            while True:
+                # с паузой новая волна начинается только после завершения текущей
+                if not (paced and pending):
+                    if paced and started and (unlimited or started < max_requests):
+                        await asyncio.sleep(retry_interval)
+                    while len(pending) < self.concurrency and (unlimited or started < max_requests):
+                        pending.add(loop.run_in_executor(self._executor, self.parser.fetch_all))
+                        started += 1
+
+                if not pending:
+                    return
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,211 @@
+"""HTML-бэкенды для `QuoteParser`.
+
+Каждый бэкенд реализует один и тот же минимальный интерфейс:
+`compile(selector)` → скомпилированный селектор, `parse(html)` → корень
+документа, `select(node, compiled)`, `select_one(node, compiled)`, `text(node)`
+и `attr(node, name)`. Селекторы компилируются один раз в `SelectorPlan`
+(`compile_plan` кэширует планы для одинаковой конфигурации), а логика
+извлечения цитат (`extract_entries`) общая и от бэкенда не зависит.
+"""
+
+from contextlib import nullcontext
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Optional
+
+from .quote import Quote
+
+
+BACKEND_HTML_PARSER = 'html.parser'
+BACKEND_LXML = 'lxml'
+BACKEND_SELECTOLAX = 'selectolax'
+
+BACKENDS = (BACKEND_HTML_PARSER, BACKEND_LXML, BACKEND_SELECTOLAX)
+DEFAULT_BACKEND = BACKEND_HTML_PARSER
+
+# имена стадий совпадают с `src.core.metrics`
+STAGE_FETCH = 'fetch'
+STAGE_PARSE = 'parse'
+STAGE_EXTRACT = 'extract'
+
+
+class SoupBackend:
+    """BeautifulSoup + soupsieve; `features` — построитель дерева (`html.parser` или `lxml`)."""
+
+    def __init__(self, features=BACKEND_HTML_PARSER):
+        # bs4 и soupsieve импортируются только при выборе этого бэкенда
+        import soupsieve
+        from bs4 import BeautifulSoup, FeatureNotFound
+
+        self.name = features
+        self._soup = BeautifulSoup
+        self._soupsieve = soupsieve
+        try:
+            BeautifulSoup('', features)
+        except FeatureNotFound as exc:
+            raise ValueError(
+                f"HTML-бэкенд '{features}' недоступен: установите пакет {features}"
+            ) from exc
+
+    def compile(self, selector):
+        try:
+            return self._soupsieve.compile(selector)
+        except self._soupsieve.SelectorSyntaxError as exc:
+            raise ValueError(f"Некорректный CSS-селектор '{selector}': {exc}") from exc
+
+    def parse(self, html):
+        return self._soup(html, self.name)
+
+    def select(self, node, compiled):
+        return compiled.select(node)
+
+    def select_one(self, node, compiled):
+        return compiled.select_one(node)
+
+    def text(self, node):
+        return node.get_text(" ", strip=True)
+
+    def attr(self, node, name):
+        return node.get(name)
+
+
+class SelectolaxBackend:
+    """selectolax (движок lexbor): быстрый парсер и CSS-селекторы на C."""
+
+    name = BACKEND_SELECTOLAX
+
+    def __init__(self):
+        try:
+            from selectolax.lexbor import LexborHTMLParser as html_parser
+        except ImportError:
+            try:
+                from selectolax.parser import HTMLParser as html_parser
+            except ImportError as exc:
+                raise ValueError(
+                    "HTML-бэкенд 'selectolax' недоступен: установите пакет selectolax"
+                ) from exc
+        self._html_parser = html_parser
+
+    def compile(self, selector):
+        # У selectolax нет отдельного объекта селектора: проверяем синтаксис на
+        # пустом документе и дальше используем ту же строку.
+        try:
+            self._html_parser('<html></html>').css(selector)
+        except Exception as exc:
+            raise ValueError(f"Некорректный CSS-селектор '{selector}': {exc}") from exc
+        return selector
+
+    def parse(self, html):
+        return self._html_parser(html)
+
+    def select(self, node, compiled):
+        return node.css(compiled)
+
+    def select_one(self, node, compiled):
+        return node.css_first(compiled)
+
+    def text(self, node):
+        return node.text(separator=" ", strip=True)
+
+    def attr(self, node, name):
+        return node.attributes.get(name)
+
+
+@dataclass(frozen=True)
+class SelectorPlan:
+    """Скомпилированные селекторы одной конфигурации парсера."""
+
+    backend: str
+    block: Optional[Any]
+    quote: Optional[Any]
+    source: Optional[Any]
+    source_attr: Optional[str]
+
+
+def get_backend(name=None):
+    """Возвращает бэкенд по имени из `parser.backend`."""
+
+    return _get_backend(name or DEFAULT_BACKEND)
+
+
+@lru_cache(maxsize=None)
+def _get_backend(name):
+    if name in (BACKEND_HTML_PARSER, BACKEND_LXML):
+        return SoupBackend(name)
+    if name == BACKEND_SELECTOLAX:
+        return SelectolaxBackend()
+    raise ValueError(
+        f"Неизвестный HTML-бэкенд '{name}'. Доступны: {', '.join(BACKENDS)}"
+    )
+
+
+@lru_cache(maxsize=128)
+def compile_plan(backend_name, block_selector, quote_selector, source_selector, source_attr):
+    """Компилирует селекторы один раз; парсеры с одинаковой конфигурацией делят план.
+
+    Raises:
+        ValueError: если бэкенд недоступен или селектор некорректен.
+    """
+
+    backend = get_backend(backend_name)
+    return SelectorPlan(
+        backend=backend.name,
+        block=backend.compile(block_selector) if block_selector else None,
+        quote=backend.compile(quote_selector) if quote_selector else None,
+        source=backend.compile(source_selector) if source_selector else None,
+        source_attr=source_attr,
+    )
+
+
+def timed(metrics, stage):
+    """Таймер стадии `stage` в `metrics` (реестр с методом `timer`) или пустой контекст."""
+
+    return metrics.timer(stage) if metrics is not None else nullcontext()
+
+
+def extract_entries(backend, plan, html, stop_when=None, url=None, metrics=None):
+    """Разбирает страницу и возвращает список записей `Quote` (с адресом `url`).
+
+    Если задан `stop_when`, разбор прекращается после первой цитаты, для которой
+    предикат вернул True (сама цитата входит в результат). С `metrics` время
+    построения дерева и извлечения по селекторам пишется в стадии `parse` и
+    `extract`.
+    """
+
+    with timed(metrics, STAGE_PARSE):
+        root = backend.parse(html)
+
+    with timed(metrics, STAGE_EXTRACT):
+        blocks = backend.select(root, plan.block) if plan.block is not None else [root]
+        results = []
+
+        for block in blocks:
+            quote = _extract_quote(backend, block, plan.quote)
+            if not quote:
+                continue
+            source = _extract_source(backend, block, plan.source, plan.source_attr)
+            entry = Quote(quote, source, url)
+            results.append(entry)
+            if stop_when is not None and stop_when(entry):
+                break
+
+    return results
+
+
+def _extract_quote(backend, node, quote_selector):
+    if quote_selector is None:
+        return None
+    q_el = backend.select_one(node, quote_selector)
+    if q_el is None:
+        return None
+    return " ".join(backend.text(q_el).split())
+
+
+def _extract_source(backend, node, source_selector, source_attr):
+    if source_selector is None:
+        return None
+    s_el = backend.select_one(node, source_selector)
+    if s_el is None or not source_attr:
+        return None
+    source = backend.attr(s_el, source_attr)
+    return source.strip() if source else None
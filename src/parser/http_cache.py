@@ -0,0 +1,185 @@
+"""Дисковый кэш HTTP-ответов для статичных страниц цитат.
+
+Кэш хранит тело ответа и его валидаторы (`ETag`, `Last-Modified`), учитывает
+`Cache-Control` (`no-store`, `no-cache`, `max-age`) и вытесняет давно не
+использованные записи, когда суммарный размер превышает `max_bytes`.
+"""
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+
+DEFAULT_CACHE_DIR = '.cache/http'
+DEFAULT_CACHE_MAX_BYTES = 10 * 1024 * 1024
+
+
+def parse_cache_control(value):
+    """Разбирает заголовок `Cache-Control` в словарь директив."""
+
+    directives = {}
+    for part in (value or '').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, arg = part.partition('=')
+        directives[name.strip().lower()] = arg.strip().strip('"') or None
+    return directives
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    body: str
+    digest: str
+    stored_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    max_age: Optional[int] = None
+    no_cache: bool = False
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        if self.no_cache or self.max_age is None:
+            return False
+        now = time.time() if now is None else now
+        return now - self.stored_at < self.max_age
+
+    def validators(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """Кэш ответов на диске: `<sha256(url)>.body` + `<sha256(url)>.json`."""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max(0, int(max_bytes))
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, url) -> Optional[CachedResponse]:
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'r', encoding='utf-8') as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+
+        # mtime тела используется как время последнего обращения для LRU
+        os.utime(body_path, None)
+        return CachedResponse(url=url, body=body, **meta)
+
+    def put(self, url, body, headers) -> Optional[CachedResponse]:
+        """Сохраняет ответ, если `Cache-Control` это разрешает и у него есть смысл хранения."""
+
+        cache_control = parse_cache_control(headers.get('Cache-Control'))
+        if 'no-store' in cache_control:
+            self.delete(url)
+            return None
+
+        entry = CachedResponse(
+            url=url,
+            body=body,
+            digest=hashlib.sha256(body.encode('utf-8')).hexdigest(),
+            stored_at=time.time(),
+            etag=headers.get('ETag'),
+            last_modified=headers.get('Last-Modified'),
+        )
+        self._apply_cache_control(entry, cache_control)
+        if not (entry.etag or entry.last_modified or entry.max_age):
+            # без валидаторов и срока свежести кэш бесполезен
+            return None
+
+        body_path, meta_path = self._paths(url)
+        with open(body_path, 'w', encoding='utf-8') as f:
+            f.write(body)
+        self._write_meta(meta_path, entry)
+        self._evict()
+        return entry
+
+    def refresh(self, cached, headers) -> CachedResponse:
+        """Обновляет метаданные записи после ответа 304 Not Modified."""
+
+        cached.stored_at = time.time()
+        cached.etag = headers.get('ETag') or cached.etag
+        cached.last_modified = headers.get('Last-Modified') or cached.last_modified
+        if headers.get('Cache-Control'):
+            self._apply_cache_control(cached, parse_cache_control(headers.get('Cache-Control')))
+        _, meta_path = self._paths(cached.url)
+        self._write_meta(meta_path, cached)
+        return cached
+
+    def delete(self, url):
+        for path in self._paths(url):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _apply_cache_control(self, entry, cache_control):
+        entry.no_cache = 'no-cache' in cache_control
+        max_age = cache_control.get('max-age')
+        try:
+            entry.max_age = int(max_age) if max_age is not None else None
+        except ValueError:
+            entry.max_age = None
+
+    def _write_meta(self, meta_path, entry):
+        meta = {
+            'digest': entry.digest,
+            'stored_at': entry.stored_at,
+            'etag': entry.etag,
+            'last_modified': entry.last_modified,
+            'max_age': entry.max_age,
+            'no_cache': entry.no_cache,
+        }
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.body'):
+                continue
+            key = name[:-len('.body')]
+            body_path = os.path.join(self.directory, name)
+            meta_path = os.path.join(self.directory, f'{key}.json')
+            try:
+                stat = os.stat(body_path)
+                size = stat.st_size + os.path.getsize(meta_path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, size, key))
+        return entries
+
+    def _evict(self):
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            for suffix in ('.body', '.json'):
+                try:
+                    os.remove(os.path.join(self.directory, key + suffix))
+                except FileNotFoundError:
+                    pass
+            total -= size
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return (
+            os.path.join(self.directory, f'{key}.body'),
+            os.path.join(self.directory, f'{key}.json'),
+        )
@@ -0,0 +1,102 @@
+"""Разбор HTML в пуле процессов.
+
+Разбор страницы (BeautifulSoup/lxml/selectolax) упирается в CPU, а потоки
+из-за GIL используют одно ядро. `ParsePool` отдаёт HTML рабочим процессам:
+каждый из них один раз компилирует селекторы (`compile_plan` кэширован в
+процессе) и возвращает компактные записи `(quote, source)`.
+"""
+
+import os
+import threading
+from typing import NamedTuple
+
+from .backends import compile_plan, extract_entries, get_backend
+from .quote import Quote
+
+
+DEFAULT_PARSE_CHUNKSIZE = 1
+# spawn безопасен при наличии потоков в родителе (fork мог бы унаследовать их блокировки)
+DEFAULT_START_METHOD = 'spawn'
+
+
+class ParseSpec(NamedTuple):
+    """Всё, что нужно процессу для разбора страницы; передаётся по pickle."""
+
+    backend: str
+    block_selector: str
+    quote_selector: str
+    source_selector: str
+    source_attr: str
+
+
+def parse_records(spec, html):
+    """Выполняется в рабочем процессе: HTML → список кортежей `(quote, source)`."""
+
+    plan = compile_plan(
+        spec.backend,
+        spec.block_selector,
+        spec.quote_selector,
+        spec.source_selector,
+        spec.source_attr,
+    )
+    entries = extract_entries(get_backend(spec.backend), plan, html)
+    return [(entry['quote'], entry['source']) for entry in entries]
+
+
+def _parse_records_star(args):
+    return parse_records(*args)
+
+
+class ParsePool:
+    """Пул процессов для разбора страниц; процессы запускаются при первом вызове.
+
+    Пример использования:
+        pool = ParsePool(workers=8)
+        parser = QuoteParser(url, ..., parse_pool=pool)
+    """
+
+    def __init__(self, workers=None, chunksize=DEFAULT_PARSE_CHUNKSIZE, start_method=DEFAULT_START_METHOD):
+        self.workers = max(1, int(workers or os.cpu_count() or 1))
+        self.chunksize = max(1, int(chunksize or 1))
+        self.start_method = start_method
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # multiprocessing нужен только при включённом пуле
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                )
+            return self._executor
+
+    def parse(self, spec, html, url=None):
+        """Разбирает одну страницу в рабочем процессе, возвращает список `Quote`."""
+
+        records = self._get_executor().submit(parse_records, spec, html).result()
+        return _to_entries(records, url)
+
+    def parse_many(self, spec, pages, url=None):
+        """Разбирает несколько страниц, отдавая их процессам пачками по `chunksize`."""
+
+        results = self._get_executor().map(
+            _parse_records_star,
+            [(spec, html) for html in pages],
+            chunksize=self.chunksize,
+        )
+        return [_to_entries(records, url) for records in results]
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+
+def _to_entries(records, url=None):
+    return [Quote(quote, source, url) for quote, source in records]
@@ -0,0 +1,101 @@
+"""Компактная запись цитаты.
+
+`Quote` заменяет словари `{"quote": ..., "source": ...}`: хранит поля в
+`__slots__`, лениво кэширует готовую строку статуса, её длину и хеш
+содержимого. Запись остаётся read-only `Mapping` с ключами `quote`/`source`,
+поэтому код, работающий со словарями (`entry.get('quote')`, `entry['source']`,
+сравнение со словарём), продолжает работать без изменений.
+"""
+
+import hashlib
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+QUOTE_KEYS = ('quote', 'source')
+
+
+def format_status_message(quote, source):
+    if not quote:
+        return None
+    if source:
+        return f'"{quote}" — {source}'
+    return f'"{quote}"'
+
+
+@dataclass(slots=True, eq=False)
+class Quote(Mapping):
+    """Цитата, её источник и адрес страницы, с которой она получена."""
+
+    quote: str
+    source: Optional[str] = None
+    url: Optional[str] = None
+    _message: Optional[str] = field(default=None, init=False, repr=False)
+    _digest: Optional[str] = field(default=None, init=False, repr=False)
+
+    @classmethod
+    def from_entry(cls, entry, url=None):
+        """Превращает словарь (или уже `Quote`) в `Quote`."""
+
+        if isinstance(entry, cls):
+            return entry
+        return cls(entry.get('quote'), entry.get('source'), url)
+
+    @property
+    def message(self):
+        """Строка статуса `"<цитата>" — <источник>` (вычисляется один раз)."""
+
+        if self._message is None:
+            self._message = format_status_message(self.quote, self.source)
+        return self._message
+
+    @property
+    def length(self):
+        message = self.message
+        return len(message) if message else 0
+
+    @property
+    def content_hash(self):
+        """Короткий стабильный хеш цитаты и источника (без учёта пробелов и регистра)."""
+
+        if self._digest is None:
+            normalized = ' '.join((self.quote or '').split()).casefold()
+            source = ' '.join((self.source or '').split()).casefold()
+            self._digest = hashlib.blake2b(
+                f'{normalized}\x1f{source}'.encode('utf-8'),
+                digest_size=8,
+            ).hexdigest()
+        return self._digest
+
+    def __getitem__(self, key):
+        if key == 'quote':
+            return self.quote
+        if key == 'source':
+            return self.source
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(QUOTE_KEYS)
+
+    def __len__(self):
+        return len(QUOTE_KEYS)
+
+    def __hash__(self):
+        return hash((self.quote, self.source))
+
+    def __getstate__(self):
+        return (self.quote, self.source, self.url)
+
+    def __setstate__(self, state):
+        self.quote, self.source, self.url = state
+        self._message = None
+        self._digest = None
+
+
+def status_message(entry):
+    """Строка статуса для `Quote` (из кэша) или для словаря с ключами quote/source."""
+
+    if isinstance(entry, Quote):
+        return entry.message
+    return format_status_message(entry.get('quote'), entry.get('source'))
@@ -14,6 +14,7 @@ def test_selectors(parser_cfg, timeout=10):
         parser_cfg.get('source_attr', 'data-source'),
         parser_cfg.get('block_selector'),
         timeout=timeout,
+        backend=parser_cfg.get('backend'),
     )
     return parser.fetch_all()
 
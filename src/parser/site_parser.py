@@ -1,5 +1,73 @@
+import codecs
+from urllib.parse import urlsplit
+
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .backends import (
+    DEFAULT_BACKEND,
+    STAGE_FETCH,
+    STAGE_PARSE,
+    compile_plan,
+    extract_entries,
+    get_backend,
+    timed,
+)
+from .process_pool import ParseSpec
+from .streaming import CompoundSelector, iter_block_fragments
+
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_RETRIES = 0
+DEFAULT_BACKOFF_FACTOR = 0.5
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+DEFAULT_STREAM_CHUNK_SIZE = 16 * 1024
+# страницы, которые при каждом запросе отдают новое содержимое, не кэшируются
+UNCACHEABLE_PATH_SUFFIXES = ('/random',)
+
+
+def _accept_encoding():
+    encodings = ['gzip', 'deflate']
+    try:  # urllib3 распаковывает br, только если установлен brotli
+        import brotli  # noqa: F401
+        encodings.append('br')
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+            encodings.append('br')
+        except ImportError:
+            pass
+    return ', '.join(encodings)
+
+
+def build_session(
+    pool_size=DEFAULT_POOL_SIZE,
+    max_retries=DEFAULT_MAX_RETRIES,
+    backoff_factor=DEFAULT_BACKOFF_FACTOR,
+    keep_alive=True,
+):
+    """Создаёт `requests.Session` с пулом keep-alive соединений и политикой повторов."""
+
+    session = requests.Session()
+    retry = Retry(
+        total=max(0, int(max_retries)),
+        backoff_factor=max(0.0, float(backoff_factor)),
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=max(1, int(pool_size)),
+        pool_maxsize=max(1, int(pool_size)),
+        max_retries=retry,
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['Accept-Encoding'] = _accept_encoding()
+    session.headers['Connection'] = 'keep-alive' if keep_alive else 'close'
+    return session
 
 
 class QuoteParser:
@@ -19,6 +87,13 @@ class QuoteParser:
         source_attr='data-source',
         block_selector=None,
         timeout=10,
+        session=None,
+        backend=DEFAULT_BACKEND,
+        streaming=False,
+        chunk_size=DEFAULT_STREAM_CHUNK_SIZE,
+        cache=None,
+        parse_pool=None,
+        metrics=None,
     ):
         self.url = url
         self.quote_selector = quote_selector
@@ -26,48 +101,183 @@ class QuoteParser:
         self.source_attr = source_attr
         self.block_selector = block_selector
         self.timeout = timeout
+        self.session = session or build_session()
+        self.backend = get_backend(backend or DEFAULT_BACKEND)
+        self.streaming = bool(streaming)
+        self.chunk_size = max(1, int(chunk_size or DEFAULT_STREAM_CHUNK_SIZE))
+        # Селекторы компилируются (и проверяются) сразу: ошибка всплывёт при
+        # старте, а не при первом запросе в долгоживущем цикле.
+        self.plan = compile_plan(
+            self.backend.name,
+            block_selector,
+            quote_selector,
+            source_selector,
+            source_attr,
+        )
+        self._fragment_plan = None
+        if self.streaming:
+            CompoundSelector(block_selector)
+            # в потоковом режиме каждый фрагмент уже является блоком
+            self._fragment_plan = compile_plan(
+                self.backend.name,
+                None,
+                quote_selector,
+                source_selector,
+                source_attr,
+            )
+        self.parse_pool = parse_pool
+        self.parse_spec = ParseSpec(
+            self.backend.name,
+            block_selector,
+            quote_selector,
+            source_selector,
+            source_attr,
+        )
+        self.cache = cache if cache is not None and self._is_cacheable_url(url) else None
+        # реестр метрик (`src.core.metrics.MetricsRegistry`) для таймеров стадий
+        self.metrics = metrics
+        self._parsed = None
+        self.requests_sent = 0
+        self.cache_hits = 0
+
+    @staticmethod
+    def _is_cacheable_url(url):
+        path = urlsplit(url or '').path.rstrip('/')
+        return not any(path.endswith(suffix) for suffix in UNCACHEABLE_PATH_SUFFIXES)
+
+    def _get_html_cached(self):
+        """Возвращает (html, digest, from_cache), используя условный GET."""
 
-    def _get_soup(self):
         if not self.url:
             raise ValueError("URL не указан")
-        resp = requests.get(self.url, timeout=self.timeout)
+
+        cached = self.cache.get(self.url)
+        if cached is not None and cached.is_fresh():
+            self.cache_hits += 1
+            return cached.body, cached.digest, True
+
+        headers = cached.validators() if cached is not None else {}
+        with timed(self.metrics, STAGE_FETCH):
+            resp = self.session.get(self.url, timeout=self.timeout, headers=headers)
+            body = resp.text
+        self.requests_sent += 1
+        if resp.status_code == 304 and cached is not None:
+            self.cache_hits += 1
+            self.cache.refresh(cached, resp.headers)
+            return cached.body, cached.digest, True
+
         resp.raise_for_status()
-        return BeautifulSoup(resp.text, 'html.parser')
-
-    def _extract_quote(self, node):
-        if not self.quote_selector:
-            return None
-        q_el = node.select_one(self.quote_selector)
-        if not q_el:
-            return None
-        return " ".join(q_el.get_text(" ", strip=True).split())
-
-    def _extract_source(self, node):
-        if not self.source_selector:
-            return None
-        s_el = node.select_one(self.source_selector)
-        if not s_el or not self.source_attr:
-            return None
-        source = s_el.get(self.source_attr)
-        return source.strip() if source else None
-
-    def fetch_all(self):
-        """Возвращает список словарей с ключами 'quote' и 'source'."""
-
-        soup = self._get_soup()
-
-        blocks = soup.select(self.block_selector) if self.block_selector else [soup]
-        results = []
+        stored = self.cache.put(self.url, body, resp.headers)
+        return body, stored.digest if stored else None, False
+
+    def _fetch_cached(self, stop_when=None):
+        html, digest, from_cache = self._get_html_cached()
+        if from_cache and self._parsed is not None and self._parsed[0] == digest:
+            results = self._parsed[1]
+        else:
+            results = self.parse(html)
+            self._parsed = (digest, results) if digest else None
+
+        return _cut_at(list(results), stop_when)
+
+    def _get_html(self):
+        if not self.url:
+            raise ValueError("URL не указан")
+        with timed(self.metrics, STAGE_FETCH):
+            resp = self.session.get(self.url, timeout=self.timeout)
+            self.requests_sent += 1
+            resp.raise_for_status()
+            return resp.text
+
+    def connection_stats(self):
+        """Статистика переиспользования соединений: запросы, новые соединения, повторные."""
 
-        for block in blocks:
-            quote = self._extract_quote(block)
-            if not quote:
+        connections = 0
+        # Один и тот же адаптер смонтирован и на http://, и на https://.
+        adapters = {id(adapter): adapter for adapter in self.session.adapters.values()}
+        for adapter in adapters.values():
+            pools = getattr(getattr(adapter, 'poolmanager', None), 'pools', None)
+            if pools is None:
                 continue
-            source = self._extract_source(block)
-            results.append({"quote": quote, "source": source})
+            for key in pools.keys():
+                pool = pools.get(key)
+                connections += getattr(pool, 'num_connections', 0) if pool else 0
+
+        return {
+            'requests': self.requests_sent,
+            'connections': connections,
+            'reused': max(0, self.requests_sent - connections),
+        }
+
+    def close(self):
+        self.session.close()
+        if self.parse_pool is not None:
+            self.parse_pool.close()
+
+    def parse(self, html, stop_when=None):
+        """Извлекает цитаты из готового HTML (без сетевого запроса).
+
+        С `parse_pool` разбор выполняется в отдельном процессе; `stop_when` тогда
+        только обрезает готовый список.
+        """
+
+        if self.parse_pool is not None:
+            # разбор и извлечение идут в другом процессе, замеряются одной стадией
+            with timed(self.metrics, STAGE_PARSE):
+                results = self.parse_pool.parse(self.parse_spec, html, url=self.url)
+            return _cut_at(results, stop_when)
+        return extract_entries(
+            self.backend, self.plan, html, stop_when=stop_when, url=self.url, metrics=self.metrics
+        )
+
+    def _stream_entries(self, stop_when=None):
+        if not self.url:
+            raise ValueError("URL не указан")
 
+        results = []
+        # чтение и разбор чередуются, поэтому весь потоковый запрос — стадия `fetch`
+        with timed(self.metrics, STAGE_FETCH), self.session.get(
+            self.url, timeout=self.timeout, stream=True
+        ) as resp:
+            self.requests_sent += 1
+            resp.raise_for_status()
+            for fragment in iter_block_fragments(self._iter_text(resp), self.block_selector):
+                for entry in extract_entries(self.backend, self._fragment_plan, fragment, url=self.url):
+                    results.append(entry)
+                    if stop_when is not None and stop_when(entry):
+                        # выход из `with` закрывает ответ, остаток страницы не читается
+                        return results
         return results
 
+    def _iter_text(self, resp):
+        content_type = resp.headers.get('Content-Type') or ''
+        encoding = resp.encoding if 'charset' in content_type.lower() and resp.encoding else 'utf-8'
+        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        for chunk in resp.iter_content(chunk_size=self.chunk_size):
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        tail = decoder.decode(b'', final=True)
+        if tail:
+            yield tail
+
+    def fetch_all(self, stop_when=None):
+        """Возвращает список словарей с ключами 'quote' и 'source'.
+
+        `stop_when` — необязательный предикат: после первой цитаты, для которой он
+        вернул True, разбор прекращается. В потоковом режиме (`streaming=True`)
+        при этом прекращается и чтение ответа.
+
+        Если задан HTTP-кэш и адрес не `/random`, используется условный GET;
+        при ответе 304 (или свежей записи в кэше) повторный разбор не выполняется.
+        """
+
+        if self.cache is not None:
+            return self._fetch_cached(stop_when)
+        if self.streaming:
+            return self._stream_entries(stop_when)
+        return self.parse(self._get_html(), stop_when=stop_when)
+
     def fetch(self):
         """Совместимость: возвращает первую найденную цитату."""
 
@@ -77,6 +287,16 @@ class QuoteParser:
         return {"quote": None, "source": None}
 
 
+def _cut_at(results, stop_when):
+    """Оставляет цитаты до первой, для которой `stop_when` вернул True (включительно)."""
+
+    if stop_when is not None:
+        for idx, entry in enumerate(results):
+            if stop_when(entry):
+                return results[:idx + 1]
+    return results
+
+
 def get_quote_and_source(url, quote_selector, source_selector=None, source_attr='data-source', timeout=10):
     """Совместимая функция-обёртка, использует `QuoteParser`."""
     parser = QuoteParser(
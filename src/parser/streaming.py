@@ -0,0 +1,130 @@
+"""Потоковое извлечение цитат: HTML подаётся кусками по мере загрузки.
+
+Инкрементальный `html.parser.HTMLParser` отслеживает элементы, подходящие под
+`block_selector`, и как только такой элемент закрывается, его фрагмент разбирается
+обычным бэкендом. Так не нужно строить дерево всей страницы, и чтение ответа
+можно прервать, когда нужная цитата уже найдена.
+"""
+
+import html
+import re
+from html.parser import HTMLParser
+
+
+VOID_ELEMENTS = frozenset({
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr',
+})
+
+_COMPOUND_PART = re.compile(
+    r'''(?P<tag>^[a-zA-Z][\w-]*|^\*)'''
+    r'''|\.(?P<cls>[\w-]+)'''
+    r'''|\#(?P<id>[\w-]+)'''
+    r'''|\[\s*(?P<attr>[\w:-]+)\s*(?:=\s*(?P<q>["']?)(?P<value>[^"'\]]*)(?P=q)\s*)?\]'''
+)
+
+
+class CompoundSelector:
+    """Простой селектор одного элемента: `tag.class#id[attr][attr=value]`.
+
+    В потоковом режиме предки элемента ещё не известны полностью, поэтому
+    комбинаторы (пробел, `>`, `+`, `~`) и списки через запятую не поддерживаются.
+    """
+
+    def __init__(self, selector):
+        self.selector = selector
+        self.tag = None
+        self.classes = set()
+        self.attrs = []
+
+        text = (selector or '').strip()
+        if not text:
+            raise ValueError("Потоковый режим требует непустой block_selector")
+
+        pos = 0
+        while pos < len(text):
+            match = _COMPOUND_PART.match(text, pos)
+            if not match or match.end() == pos:
+                raise ValueError(
+                    f"block_selector '{selector}' не поддерживается в потоковом режиме:"
+                    " допустим только простой селектор вида tag.class#id[attr=value]"
+                )
+            if match.group('tag'):
+                self.tag = None if match.group('tag') == '*' else match.group('tag').lower()
+            elif match.group('cls'):
+                self.classes.add(match.group('cls'))
+            elif match.group('id'):
+                self.attrs.append(('id', match.group('id')))
+            else:
+                self.attrs.append((match.group('attr').lower(), match.group('value')))
+            pos = match.end()
+
+    def matches(self, tag, attrs):
+        if self.tag and tag != self.tag:
+            return False
+        values = dict(attrs)
+        if self.classes and not self.classes.issubset((values.get('class') or '').split()):
+            return False
+        for name, expected in self.attrs:
+            if name not in values:
+                return False
+            if expected is not None and values[name] != expected:
+                return False
+        return True
+
+
+class BlockStreamExtractor(HTMLParser):
+    """Накапливает HTML-фрагменты элементов, подходящих под `block_selector`."""
+
+    def __init__(self, block_selector):
+        super().__init__(convert_charrefs=True)
+        self.selector = CompoundSelector(block_selector)
+        self._stack = []
+        self._parts = []
+        self._ready = []
+
+    def handle_starttag(self, tag, attrs):
+        if not self._stack:
+            if not self.selector.matches(tag, attrs):
+                return
+        self._parts.append(self.get_starttag_text())
+        if tag not in VOID_ELEMENTS:
+            self._stack.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        if self._stack:
+            self._parts.append(self.get_starttag_text())
+
+    def handle_endtag(self, tag):
+        if not self._stack or tag not in self._stack:
+            return
+        # Незакрытые вложенные теги (например, <p>) закрываем неявно.
+        while self._stack:
+            opened = self._stack.pop()
+            self._parts.append(f'</{opened}>')
+            if opened == tag:
+                break
+        if not self._stack:
+            self._ready.append(''.join(self._parts))
+            self._parts = []
+
+    def handle_data(self, data):
+        if self._stack:
+            self._parts.append(html.escape(data, quote=False))
+
+    def pop_blocks(self):
+        """Возвращает фрагменты блоков, закрывшихся с прошлого вызова."""
+
+        ready, self._ready = self._ready, []
+        return ready
+
+
+def iter_block_fragments(chunks, block_selector):
+    """Генератор HTML-фрагментов блоков по мере поступления текстовых кусков."""
+
+    extractor = BlockStreamExtractor(block_selector)
+    for chunk in chunks:
+        extractor.feed(chunk)
+        yield from extractor.pop_blocks()
+    extractor.close()
+    yield from extractor.pop_blocks()
@@ -0,0 +1,95 @@
+import math
+from unittest.mock import MagicMock, patch
+
+from src.core.accounts import Account, due_accounts, next_due_time
+from src.core.builders import build_github_accounts
+from src.core.runner import update_accounts_once
+
+
+def make_account(name, max_len=80, interval=60):
+    client = MagicMock()
+    client.debug = False
+    client.verify_status.return_value = (True, None)
+    return Account(name=name, client=client, max_status_length=max_len, refresh_interval=interval)
+
+
+def test_update_accounts_once_fetches_once_and_fans_out():
+    parser = MagicMock()
+    parser.fetch_all.return_value = [
+        {"quote": "Очень длинная цитата, которая не поместится в короткий статус", "source": None},
+        {"quote": "Коротко", "source": None},
+    ]
+    accounts = [make_account('wide', max_len=80), make_account('narrow', max_len=20)]
+
+    assert update_accounts_once(parser, accounts, parser_max_attempts=1, parser_retry_interval=0)
+
+    parser.fetch_all.assert_called_once()
+    for account in accounts:
+        account.client.set_status.assert_called_once_with('"Коротко"', expires_in_seconds=60)
+
+
+def test_failing_account_does_not_block_others():
+    from src.github.status_client import GitHubStatusError
+
+    parser = MagicMock()
+    parser.fetch_all.return_value = [{"quote": "ok", "source": None}]
+    broken, healthy = make_account('broken'), make_account('healthy')
+    broken.client.set_status.side_effect = GitHubStatusError('boom')
+
+    assert update_accounts_once(parser, [broken, healthy], parser_max_attempts=1, parser_retry_interval=0)
+    healthy.client.set_status.assert_called_once()
+
+
+
+def test_account_with_transport_error_does_not_block_others():
+    import requests
+
+    from src.github.rate_limit import RateLimiter
+    from src.github.status_client import GitHubStatusClient
+
+    parser = MagicMock()
+    parser.fetch_all.return_value = [{"quote": "ok", "source": None}]
+    session = MagicMock()
+    session.post.side_effect = requests.ConnectionError('connection reset')
+    broken, healthy = make_account('broken'), make_account('healthy')
+    broken.client = GitHubStatusClient('token', session=session, rate_limiter=RateLimiter())
+
+    assert update_accounts_once(parser, [broken, healthy], parser_max_attempts=1, parser_retry_interval=0)
+    session.post.assert_called_once()
+    healthy.client.set_status.assert_called_once()
+
+
+def test_account_scheduling():
+    fast, slow, once = make_account('fast', interval=10), make_account('slow', interval=30), make_account('once', interval=0)
+
+    for account in (fast, slow, once):
+        account.schedule_next(100.0)
+
+    assert once.next_due == math.inf
+    assert next_due_time([fast, slow, once]) == 110.0
+    assert due_accounts([fast, slow, once], 115.0) == [fast]
+
+
+def test_build_github_accounts_share_session_and_inherit_defaults():
+    config = {
+        'emoji': ':books:',
+        'max_status_length': 70,
+        'accounts': [
+            {'name': 'work', 'token_env': 'TEST_WORK_TOKEN'},
+            {'name': 'bot', 'token': 'inline', 'emoji': ':robot:', 'refresh_interval_seconds': 600},
+            {'name': 'missing', 'token_env': 'TEST_MISSING_TOKEN'},
+        ],
+    }
+
+    with patch.dict('os.environ', {'TEST_WORK_TOKEN': 'secret'}, clear=False):
+        accounts = build_github_accounts(config, 80, 3600)
+
+    assert [account.name for account in accounts] == ['work', 'bot']
+    work, bot = accounts
+    assert work.client._headers['Authorization'] == 'Bearer secret'
+    assert work.client.default_emoji == ':books:'
+    assert work.max_status_length == 70
+    assert work.refresh_interval == 3600
+    assert bot.client.default_emoji == ':robot:'
+    assert bot.refresh_interval == 600
+    assert work.client._session is bot.client._session
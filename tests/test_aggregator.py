@@ -0,0 +1,112 @@
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.core.builders import build_parser
+from src.core.runner import _print_parser_stats
+from src.core.selection import fits_status_length
+from src.parser.aggregator import DEFAULT_SOURCE_CONCURRENCY, QuoteAggregator, QuoteSource
+
+
+def make_source(name, results=None, delay=0.0, error=None, weight=1):
+    parser = MagicMock()
+
+    def fetch_all(stop_when=None):
+        time.sleep(delay)
+        if error:
+            raise error
+        return list(results or [])
+
+    parser.fetch_all.side_effect = fetch_all
+    parser.connection_stats.return_value = {'requests': 1, 'connections': 1, 'reused': 0}
+    return QuoteSource(name, parser, weight=weight)
+
+
+def test_fetch_all_returns_without_waiting_for_slow_source():
+    fast = make_source('fast', [{"quote": "коротко", "source": None}])
+    slow = make_source('slow', [{"quote": "медленно", "source": None}], delay=0.5)
+    aggregator = QuoteAggregator([slow, fast])
+
+    started = time.monotonic()
+    results = aggregator.fetch_all(stop_when=fits_status_length(80))
+    elapsed = time.monotonic() - started
+    aggregator.close()
+
+    assert results == [{"quote": "коротко", "source": None}]
+    assert elapsed < 0.4
+
+
+def test_failing_source_is_tolerated_and_penalised():
+    good = make_source('good', [{"quote": "ok", "source": None}])
+    bad = make_source('bad', error=RuntimeError('down'))
+    aggregator = QuoteAggregator([good, bad])
+
+    for _ in range(3):
+        assert aggregator.fetch_all() == [{"quote": "ok", "source": None}]
+    aggregator.close()
+
+    report = {item['name']: item for item in aggregator.health_report()}
+    assert report['bad']['errors'] == 3
+    assert report['bad']['cooldown'] is True
+    assert report['bad']['effective_weight'] < report['good']['effective_weight']
+    assert aggregator.choose_sources() == [good]
+
+
+def test_all_sources_failing_raises():
+    aggregator = QuoteAggregator([make_source('bad', error=RuntimeError('down'))])
+    with pytest.raises(RuntimeError):
+        aggregator.fetch_all()
+    aggregator.close()
+
+
+def test_weighted_round_robin_follows_weights():
+    heavy = make_source('heavy', weight=3)
+    light = make_source('light', weight=1)
+    aggregator = QuoteAggregator([heavy, light], fanout=1)
+
+    picks = [aggregator.choose_sources()[0].name for _ in range(8)]
+    aggregator.close()
+
+    assert picks.count('heavy') == 6
+    assert picks.count('light') == 2
+
+
+def test_build_parser_with_sources_inherits_defaults():
+    config = {
+        'timeout': 7,
+        'parser': {
+            'quote_selector': 'div.field-name-body a > p',
+            'block_selector': 'article.node-quote',
+            'concurrency': 1,
+            'sources': [
+                {'name': 'random', 'url': 'https://citaty.info/random', 'weight': 3},
+                {'name': 'short', 'url': 'https://citaty.info/short', 'timeout': 2, 'concurrency': 4},
+            ],
+        },
+    }
+
+    aggregator = build_parser(config)
+    aggregator.close()
+
+    assert isinstance(aggregator, QuoteAggregator)
+    random_source, short_source = aggregator.sources
+    assert random_source.weight == 3
+    assert random_source.concurrency == DEFAULT_SOURCE_CONCURRENCY
+    assert random_source.parser.timeout == 7
+    assert short_source.parser.timeout == 2
+    assert short_source.concurrency == 4
+    assert short_source.parser.block_selector == 'article.node-quote'
+
+
+def test_debug_stats_report_source_health(capsys):
+    aggregator = QuoteAggregator([make_source('good', [{"quote": "ok", "source": None}])])
+    aggregator.fetch_all()
+    aggregator.close()
+
+    _print_parser_stats(aggregator)
+    _print_parser_stats(aggregator.sources[0].parser)
+
+    out = capsys.readouterr().out
+    assert out.count('[debug] HTTP парсера: запросов 1') == 2
+    assert '[debug] источник good' in out
@@ -0,0 +1,102 @@
+import asyncio
+import threading
+import time
+
+from src.core.selection import fetch_quote_concurrently
+from src.parser.async_parser import AsyncQuoteParser
+
+
+class SlowParser:
+    def __init__(self, pages):
+        self._pages = list(pages)
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def fetch_all(self):
+        with self._lock:
+            self.calls += 1
+            delay, results = self._pages.pop(0) if self._pages else (0.0, [])
+        if isinstance(delay, threading.Event):
+            delay.wait(5)
+        else:
+            time.sleep(delay)
+        return results
+
+
+def test_fetch_many_collects_all_pages():
+    parser = SlowParser([
+        (0.01, [{"quote": "a", "source": None}]),
+        (0.01, [{"quote": "b", "source": None}]),
+        (0.01, [{"quote": "c", "source": None}]),
+    ])
+    async_parser = AsyncQuoteParser(parser, concurrency=3)
+
+    results = asyncio.run(async_parser.fetch_many(3))
+    async_parser.close()
+
+    assert sorted(item['quote'] for item in results) == ['a', 'b', 'c']
+    assert parser.calls == 3
+
+
+def test_fetch_quote_concurrently_returns_first_fitting_page():
+    slow_pages = threading.Event()
+    parser = SlowParser([
+        (slow_pages, [{"quote": "A" * 120, "source": "Long"}]),
+        (0.01, [{"quote": "короткая", "source": "Автор"}]),
+        (slow_pages, [{"quote": "B" * 120, "source": "Long"}]),
+    ])
+    async_parser = AsyncQuoteParser(parser, concurrency=3)
+
+    entry, message, attempts, within_limit = asyncio.run(
+        fetch_quote_concurrently(async_parser, max_status_length=80, max_attempts=0)
+    )
+    # медленные страницы всё ещё висят: результат получен, не дожидаясь их
+    still_blocked = not slow_pages.is_set()
+    slow_pages.set()
+    async_parser.close()
+
+    assert still_blocked
+    assert within_limit is True
+    assert entry['quote'] == 'короткая'
+    assert attempts == 1
+
+
+def test_fetch_quote_concurrently_falls_back_after_limit():
+    parser = SlowParser([
+        (0.0, [{"quote": "A" * 120, "source": "Long"}]),
+        (0.0, [{"quote": "B" * 110, "source": "Also long"}]),
+    ])
+    async_parser = AsyncQuoteParser(parser, concurrency=1)
+
+    entry, message, attempts, within_limit = asyncio.run(
+        fetch_quote_concurrently(async_parser, max_status_length=80, max_attempts=2)
+    )
+    async_parser.close()
+
+    assert attempts == 2
+    assert within_limit is False
+    assert entry['quote'].startswith('A')
+
+
+def test_fetch_quote_concurrently_pauses_between_waves(monkeypatch):
+    long_page = (0.0, [{"quote": "A" * 120, "source": "Long"}])
+    parser = SlowParser([long_page] * 5 + [(0.0, [{"quote": "короткая", "source": None}])])
+    async_parser = AsyncQuoteParser(parser, concurrency=2)
+    pauses = []
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(delay, *args, **kwargs):
+        pauses.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(asyncio, 'sleep', fake_sleep)
+    entry, message, attempts, within_limit = asyncio.run(
+        fetch_quote_concurrently(async_parser, max_status_length=80, max_attempts=0, retry_interval=0.1)
+    )
+    async_parser.close()
+
+    # три волны по два запроса и две паузы между ними
+    assert within_limit is True
+    assert attempts in (5, 6)  # в последней волне страницы завершаются в любом порядке
+    assert parser.calls == 6
+    assert pauses == [0.1, 0.1]
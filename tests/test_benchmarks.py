@@ -0,0 +1,46 @@
+from benchmarks.fixtures import FIXTURE_SIZES, load_fixtures
+from benchmarks.harness import build_report, compare_reports, measure, percentile
+from benchmarks.run import FakeGitHubClient, make_fixture_parser, run_benchmarks
+
+
+def test_fixtures_contain_expected_number_of_quotes():
+    for name, html in load_fixtures().items():
+        parser = make_fixture_parser(html)
+        assert len(parser.fetch_all()) == FIXTURE_SIZES[name]
+
+
+def test_measure_reports_latency_and_memory():
+    stats = measure(lambda: sum(range(100)), iterations=10, warmup=1)
+
+    assert stats['iterations'] == 10
+    assert stats['ops_per_sec'] > 0
+    assert stats['p50_ms'] <= stats['p99_ms']
+    assert stats['peak_memory_kb'] >= 0
+
+
+def test_percentile_nearest_rank():
+    samples = list(range(1, 101))
+    assert percentile(samples, 0.5) == 50
+    assert percentile(samples, 0.99) == 99
+
+
+def test_compare_reports_flags_regressions():
+    baseline = build_report({'a': {'p50_ms': 1.0}, 'b': {'p50_ms': 1.0}})
+    current = build_report({'a': {'p50_ms': 1.5}, 'b': {'p50_ms': 1.01}})
+
+    rows = {name: regressed for name, _, _, _, regressed in compare_reports(baseline, current)}
+
+    assert rows == {'a': True, 'b': False}
+
+
+def test_run_benchmarks_smoke():
+    results = run_benchmarks(iterations=1, warmup=0)
+
+    assert 'fetch_all[large]' in results
+    assert 'update_once[typical]' in results
+
+
+def test_fake_github_client_confirms_status():
+    client = FakeGitHubClient()
+    client.set_status('"Quote"')
+    assert client.verify_status('"Quote"') == (True, client.status)
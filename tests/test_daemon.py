@@ -0,0 +1,122 @@
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.core.daemon import IntervalScheduler, run_daemon
+from src.core.history import QuoteHistory
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_scheduler_keeps_fixed_grid_despite_work_duration():
+    clock = FakeClock()
+    scheduler = IntervalScheduler(10, clock=clock)
+
+    clock.now = 103.0
+    assert scheduler.advance() == 110.0
+    assert scheduler.delay() == 7.0
+
+    clock.now = 119.5
+    assert scheduler.advance() == 120.0
+    assert scheduler.missed == 0
+
+
+def test_scheduler_skips_missed_ticks():
+    clock = FakeClock()
+    scheduler = IntervalScheduler(10, clock=clock)
+
+    clock.now = 135.0
+    assert scheduler.advance() == 140.0
+    assert scheduler.missed == 3
+
+    with pytest.raises(ValueError):
+        IntervalScheduler(0)
+
+
+def test_daemon_updates_on_schedule_until_stopped():
+    parser = MagicMock()
+    parser.fetch_all.return_value = [{"quote": "Цитата", "source": None}]
+    client = MagicMock()
+    client.debug = False
+    client.skipped_updates = 0
+    client.verify_status.return_value = (True, None)
+    published = []
+    client.set_status.side_effect = lambda message, **kwargs: published.append(time.monotonic())
+
+    async def scenario():
+        stop = asyncio.Event()
+        task = asyncio.create_task(
+            run_daemon(parser, client, 1, 80, True, 1, 0, stop_event=stop)
+        )
+        task.get_loop().call_later(0.05, stop.set)
+        return await task
+
+    started = time.monotonic()
+    cycles = asyncio.run(scenario())
+
+    assert cycles == 1
+    assert len(published) == 1
+    assert time.monotonic() - started < 0.9
+
+
+def test_daemon_survives_failing_publish():
+    parser = MagicMock()
+    parser.fetch_all.return_value = [{"quote": "Цитата", "source": None}]
+    client = MagicMock()
+    client.debug = False
+    client.skipped_updates = 0
+    client.set_status.side_effect = ConnectionError('connection reset by peer')
+
+    async def scenario():
+        stop = asyncio.Event()
+        task = asyncio.create_task(
+            run_daemon(parser, client, 1, 80, True, 1, 0, stop_event=stop)
+        )
+        task.get_loop().call_later(0.05, stop.set)
+        return await task
+
+    assert asyncio.run(scenario()) == 1
+    client.set_status.assert_called_once()
+
+
+def test_daemon_stops_without_waiting_for_a_hanging_fetch(tmp_path):
+    site_down = threading.Event()
+    calls = []
+
+    def fetch_all(stop_when=None):
+        calls.append(None)
+        if len(calls) > 1:
+            site_down.wait(5)
+        return [{"quote": f"Цитата {len(calls)}", "source": None}]
+
+    parser = MagicMock()
+    parser.fetch_all.side_effect = fetch_all
+    history = QuoteHistory(str(tmp_path / 'history.json'))
+
+    async def scenario():
+        stop = asyncio.Event()
+        task = asyncio.create_task(
+            run_daemon(parser, None, 0.05, 80, False, 0, 0, history=history, stop_event=stop)
+        )
+        task.get_loop().call_later(0.2, stop.set)
+        return await task
+
+    started = time.monotonic()
+    cycles = asyncio.run(scenario())
+    elapsed = time.monotonic() - started
+    site_down.set()
+
+    assert cycles == 1
+    assert elapsed < 2
+    # в историю попала только опубликованная цитата, а не брошенная загрузка
+    assert len(history) == 1
+    assert history.seen({"quote": "Цитата 1", "source": None})
@@ -0,0 +1,145 @@
+import socket
+import struct
+import time
+
+import pytest
+import requests
+
+from benchmarks.fixtures import PARSER_CONFIG
+from benchmarks.servers import FakeCitatyServer, FakeGitHubServer, StubServer, load_pages
+from src.github.rate_limit import RateLimiter
+from src.github.status_client import GitHubRateLimitError, GitHubStatusClient, StatusUpdate
+from src.parser.site_parser import QuoteParser
+
+
+@pytest.fixture
+def citaty():
+    with FakeCitatyServer(quotes_per_page=5, page_count=3) as server:
+        yield server
+
+
+@pytest.fixture
+def github():
+    with FakeGitHubServer(rate_limit=3) as server:
+        yield server
+
+
+def make_client(server, token='token-a', **kwargs):
+    return GitHubStatusClient(
+        token, api_url=server.url, rate_limiter=RateLimiter(), max_wait_seconds=0, **kwargs
+    )
+
+
+def test_citaty_server_serves_parsable_listing(citaty):
+    parser = QuoteParser(
+        citaty.url,
+        PARSER_CONFIG['quote_selector'],
+        PARSER_CONFIG['source_selector'],
+        PARSER_CONFIG['source_attr'],
+        PARSER_CONFIG['block_selector'],
+    )
+
+    quotes = parser.fetch_all()
+
+    assert len(quotes) == 5
+    assert all(item['quote'] and item['source'] for item in quotes)
+    assert citaty.stats()['requests'] == 1
+    assert requests.get(f'{citaty.base_url}/page/4').text == citaty.pages[1].decode('utf-8')
+    assert requests.get(f'{citaty.base_url}/missing').status_code == 404
+
+
+def test_citaty_server_injects_errors_and_latency():
+    with FakeCitatyServer(page_count=1, error_rate=1.0, latency=0.01) as server:
+        response = requests.get(server.url)
+
+    assert response.status_code == 503
+    assert server.stats()['errors'] == 1
+
+
+def test_load_pages_reads_recorded_html(tmp_path):
+    (tmp_path / 'b.html').write_text('<p>b</p>', encoding='utf-8')
+    (tmp_path / 'a.html').write_text('<p>a</p>', encoding='utf-8')
+    (tmp_path / 'notes.txt').write_text('skip', encoding='utf-8')
+
+    assert load_pages(tmp_path) == ['<p>a</p>', '<p>b</p>']
+    empty = tmp_path / 'empty'
+    empty.mkdir()
+    with pytest.raises(ValueError):
+        load_pages(empty)
+
+
+def test_github_server_round_trips_status_and_rate_limit(github):
+    client = make_client(github)
+
+    result = client.set_status('"Quote" — Source', emoji=':speech_balloon:')
+    matched, status = client.verify_status('"Quote" — Source', mode='poll')
+
+    assert result.message == '"Quote" — Source'
+    assert matched and status.emoji == ':speech_balloon:'
+    assert github.status_for('token-a')['message'] == '"Quote" — Source'
+    assert github.status_for('token-b') is None
+    budget = client.rate_limit_budget()
+    assert (budget.limit, budget.remaining) == (3, 1)
+
+
+def test_github_server_batches_and_rejects_long_messages(github):
+    client = make_client(github, token='token-batch')
+
+    results = client.set_status_many([StatusUpdate('short'), StatusUpdate('x' * 81)])
+
+    assert results[0].ok and results[0].result.message == 'short'
+    assert not results[1].ok and 'too long' in results[1].error
+    assert github.stats()['mutations'] == 1
+
+
+def test_github_server_enforces_budget_per_token(github):
+    query = {'query': 'query { viewer { status { message } } }'}
+
+    def viewer(token):
+        return requests.post(github.url, json=query, headers={'Authorization': f'Bearer {token}'})
+
+    remaining = [viewer('token-limited').headers['X-RateLimit-Remaining'] for _ in range(3)]
+    limited = viewer('token-limited')
+
+    assert remaining == ['2', '1', '0']
+    assert limited.status_code == 403
+    assert limited.headers['X-RateLimit-Remaining'] == '0'
+    assert github.stats()['rate_limited'] == 1
+    assert viewer('token-other').status_code == 200
+
+
+def test_client_paces_requests_by_reported_budget(github):
+    client = make_client(github, token='token-client')
+    client.set_status('one')
+    client.set_status('two')
+
+    # остался 1 запрос до сброса через час: следующий слот далеко за max_wait_seconds=0
+    with pytest.raises(GitHubRateLimitError):
+        client.set_status('three')
+
+
+def test_github_server_requires_token(github):
+    response = requests.post(github.url, json={'query': 'query { viewer { status { message } } }'})
+
+    assert response.status_code == 401
+
+
+def test_stub_server_ignores_clients_that_disconnect_early(capsys):
+    with FakeCitatyServer(page_count=1, latency=0.05) as server:
+        for _ in range(3):
+            conn = socket.create_connection(server.address)
+            conn.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+            conn.sendall(b'GET /random HTTP/1.1\r\nHost: test\r\n\r\n')
+            conn.close()
+        time.sleep(0.3)
+        assert requests.get(server.url).status_code == 200
+
+    assert 'Traceback' not in capsys.readouterr().err
+
+
+def test_stub_server_subclass_must_implement_handle():
+    class Incomplete(StubServer):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -2,12 +2,13 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from src.github.status_client import GitHubStatusClient, GitHubStatusError, StatusResult
+from src.github.status_client import GitHubStatusClient, GitHubStatusError, StatusResult, StatusUpdate
 
 
 def _make_response(payload):
     response = MagicMock()
     response.status_code = 200
+    response.headers = {}
     response.json.return_value = payload
     response.raise_for_status.return_value = None
     return response
@@ -123,3 +124,94 @@ def test_verify_status_eventual_success():
     assert ok is True
     assert result is not None and result.message == '"Wanted"'
     assert fetch_mock.call_count == 2
+
+
+def test_set_status_many_packs_aliases_and_splits_errors():
+    payload = {
+        "data": {
+            "s0": {"status": {"message": '"One"', "emoji": None, "expiresAt": None}},
+            "s1": None,
+        },
+        "errors": [{"message": "Organization not found", "path": ["s1"]}],
+    }
+
+    with patch('requests.Session.post', return_value=_make_response(payload)) as mock_post:
+        client = GitHubStatusClient("token")
+        results = client.set_status_many(
+            [
+                StatusUpdate('"One"', expires_in_seconds=60),
+                StatusUpdate('"Two"', organization_id="O_123"),
+            ]
+        )
+
+    assert mock_post.call_count == 1
+    sent = mock_post.call_args.kwargs['json']
+    assert 's0: changeUserStatus(input: $input0)' in sent['query']
+    assert 's1: changeUserStatus(input: $input1)' in sent['query']
+    assert 'expiresAt' in sent['variables']['input0']
+    assert sent['variables']['input1']['organizationId'] == "O_123"
+
+    first, second = results
+    assert first.ok and first.result.message == '"One"'
+    assert not second.ok and second.result is None
+    assert "Organization not found" in second.error
+
+
+def test_set_status_many_respects_batch_size():
+    def respond(*args, **kwargs):
+        variables = kwargs['json']['variables']
+        return _make_response(
+            {"data": {f"s{idx}": {"status": {"message": "m", "emoji": None, "expiresAt": None}}
+                      for idx in range(len(variables))}}
+        )
+
+    with patch('requests.Session.post', side_effect=respond) as mock_post:
+        client = GitHubStatusClient("token")
+        results = client.set_status_many([StatusUpdate(f"m{idx}") for idx in range(5)], batch_size=2)
+
+    assert mock_post.call_count == 3
+    assert len(results) == 5 and all(item.ok for item in results)
+
+
+def test_verify_status_trusts_matching_mutation_result():
+    client = GitHubStatusClient("token")
+    client.fetch_status = MagicMock()  # type: ignore[assignment]
+    written = StatusResult(message='"Wanted"', emoji=None, expires_at=None)
+
+    ok, result = client.verify_status('"Wanted"', result=written)
+
+    assert ok is True and result is written
+    client.fetch_status.assert_not_called()
+
+
+def test_verify_status_auto_polls_with_backoff_on_mismatch():
+    client = GitHubStatusClient("token")
+    client.fetch_status = MagicMock(  # type: ignore[assignment]
+        side_effect=[
+            StatusResult(message='"Old"', emoji=None, expires_at=None),
+            StatusResult(message='"Old"', emoji=None, expires_at=None),
+            StatusResult(message='"Wanted"', emoji=None, expires_at=None),
+        ]
+    )
+    stale = StatusResult(message='"Old"', emoji=None, expires_at=None)
+
+    with patch('time.sleep', return_value=None) as mock_sleep:
+        ok, _ = client.verify_status('"Wanted"', attempts=3, delay_seconds=1.0, result=stale)
+
+    assert ok is True
+    first_delay, second_delay = (call.args[0] for call in mock_sleep.call_args_list)
+    assert 0.5 <= first_delay <= 1.0
+    assert 1.0 <= second_delay <= 2.0
+
+
+def test_verify_status_mutation_and_off_modes_never_poll():
+    client = GitHubStatusClient("token", verify_mode="mutation")
+    client.fetch_status = MagicMock()  # type: ignore[assignment]
+    stale = StatusResult(message='"Old"', emoji=None, expires_at=None)
+
+    assert client.verify_status('"Wanted"', result=stale) == (False, stale)
+    assert client.verify_status('"Wanted"', result=stale, mode="off") == (True, stale)
+    client.fetch_status.assert_not_called()
+
+    with pytest.raises(ValueError):
+        GitHubStatusClient("token", verify_mode="sometimes")
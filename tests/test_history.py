@@ -0,0 +1,122 @@
+from src.core.history import BloomFilter, QuoteHistory
+from src.core.pool import QuotePool
+from src.core.selection import fetch_quote_with_retries, select_quote_for_length
+from src.parser.quote import Quote
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeParser:
+    def __init__(self, pages):
+        self.pages = list(pages)
+        self.calls = 0
+
+    def fetch_all(self, stop_when=None):
+        self.calls += 1
+        return self.pages.pop(0) if self.pages else []
+
+
+def test_lru_history_ignores_case_whitespace_and_persists(tmp_path):
+    path = tmp_path / 'history.json'
+    history = QuoteHistory(str(path))
+    history.record({"quote": "Hello   world", "source": "Author"})
+
+    assert history.seen(Quote("hello world", "author"))
+    assert not history.seen({"quote": "hello world", "source": "Other"})
+
+    reloaded = QuoteHistory(str(path))
+    assert reloaded.seen({"quote": "Hello world", "source": "Author"})
+
+
+def test_lru_history_is_bounded_by_size_and_age():
+    clock = FakeClock()
+    history = QuoteHistory(None, max_entries=2, max_age_days=1, clock=clock)
+    for idx in range(3):
+        history.record({"quote": f"q{idx}", "source": None})
+
+    assert len(history) == 2
+    assert not history.seen({"quote": "q0", "source": None})
+    assert history.seen({"quote": "q2", "source": None})
+
+    clock.now += 86400 + 1
+    assert not history.seen({"quote": "q2", "source": None})
+    assert len(history) == 0
+
+
+def test_bloom_history_rotates_generations(tmp_path):
+    clock = FakeClock()
+    path = tmp_path / 'bloom.json'
+    history = QuoteHistory(str(path), mode='bloom', max_age_days=2, bloom_capacity=100, clock=clock)
+    history.record({"quote": "old", "source": None})
+
+    clock.now += 86400
+    assert history.seen({"quote": "old", "source": None})
+    history.record({"quote": "new", "source": None})
+
+    reloaded = QuoteHistory(str(path), mode='bloom', max_age_days=2, bloom_capacity=100, clock=clock)
+    assert reloaded.seen({"quote": "old", "source": None})
+
+    clock.now += 86400
+    assert not history.seen({"quote": "old", "source": None})
+    assert history.seen({"quote": "new", "source": None})
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, 0.01)
+    keys = [f'key-{idx}' for idx in range(1000)]
+    for key in keys:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+    false_hits = sum(f'other-{idx}' in bloom for idx in range(1000))
+    assert false_hits < 50
+
+
+def test_select_skips_quotes_from_history():
+    history = QuoteHistory(None)
+    history.record({"quote": "seen", "source": None})
+    candidates = [{"quote": "seen", "source": None}, {"quote": "fresh", "source": None}]
+
+    entry, message = select_quote_for_length(candidates, 80, history=history)
+
+    assert entry["quote"] == "fresh"
+    assert message == '"fresh"'
+
+
+def test_fetch_retries_until_unseen_quote_and_records_it():
+    history = QuoteHistory(None)
+    history.record({"quote": "repeat", "source": None})
+    parser = FakeParser([
+        [{"quote": "repeat", "source": None}],
+        [{"quote": "repeat", "source": None}, {"quote": "novel", "source": None}],
+    ])
+
+    entry, message, attempts, within_limit = fetch_quote_with_retries(
+        parser, 80, 3, 0, history=history
+    )
+
+    assert entry["quote"] == "novel"
+    assert attempts == 2
+    assert within_limit
+    assert history.seen({"quote": "novel", "source": None})
+
+
+def test_pool_entries_already_in_history_are_skipped(tmp_path):
+    pool = QuotePool(str(tmp_path / 'pool.sqlite3'))
+    history = QuoteHistory(None)
+    pool.add_many([{"quote": "a", "source": None}, {"quote": "b", "source": None}])
+    history.record({"quote": "a", "source": None})
+
+    entry, _, attempts, _ = fetch_quote_with_retries(
+        FakeParser([]), 80, 1, 0, pool=pool, history=history
+    )
+
+    assert entry["quote"] == "b"
+    assert attempts == 0
+    pool.close()
@@ -0,0 +1,89 @@
+import os
+from unittest.mock import Mock, patch
+
+from src.parser import site_parser
+from src.parser.http_cache import HttpCache, parse_cache_control
+from tests.test_site_parser import HTML_SNIPPET
+
+
+def make_response(status_code, text='', headers=None):
+    mock = Mock()
+    mock.status_code = status_code
+    mock.text = text
+    mock.headers = headers or {}
+    mock.raise_for_status = Mock()
+    return mock
+
+
+def make_parser(url, cache):
+    return site_parser.QuoteParser(
+        url,
+        'div.field-name-body a > p',
+        'a.copy-to-clipboard',
+        'data-source',
+        'article.node-quote',
+        cache=cache,
+    )
+
+
+def test_parse_cache_control():
+    assert parse_cache_control('public, max-age=60, no-cache') == {
+        'public': None,
+        'max-age': '60',
+        'no-cache': None,
+    }
+
+
+def test_conditional_get_reuses_parsed_results_on_304(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    parser = make_parser('https://citaty.info/man/mark-tven', cache)
+
+    with patch('requests.Session.get') as mock_get:
+        mock_get.side_effect = [
+            make_response(200, HTML_SNIPPET, {'ETag': '"v1"'}),
+            make_response(304, headers={'ETag': '"v1"'}),
+        ]
+        first = parser.fetch_all()
+        with patch.object(parser, 'parse', wraps=parser.parse) as mock_parse:
+            second = parser.fetch_all()
+
+    assert first == second
+    assert len(second) == 2
+    mock_parse.assert_not_called()
+    assert mock_get.call_args.kwargs['headers'] == {'If-None-Match': '"v1"'}
+    assert parser.cache_hits == 1
+
+
+def test_fresh_entry_skips_request(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    parser = make_parser('https://citaty.info/man/mark-tven', cache)
+
+    with patch('requests.Session.get') as mock_get:
+        mock_get.return_value = make_response(200, HTML_SNIPPET, {'Cache-Control': 'max-age=600'})
+        parser.fetch_all()
+        parser.fetch_all()
+
+    assert mock_get.call_count == 1
+
+
+def test_random_pages_and_no_store_are_not_cached(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    random_parser = make_parser('https://citaty.info/random', cache)
+    assert random_parser.cache is None
+
+    assert cache.put('https://citaty.info/tag/x', HTML_SNIPPET, {'Cache-Control': 'no-store', 'ETag': '"a"'}) is None
+    assert cache.get('https://citaty.info/tag/x') is None
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    body = 'x' * 400
+    cache = HttpCache(str(tmp_path), max_bytes=1300)
+
+    cache.put('https://a', body, {'ETag': '"a"'})
+    cache.put('https://b', body, {'ETag': '"b"'})
+    os.utime(cache._paths('https://a')[0], (1, 1))
+    cache.put('https://c', body, {'ETag': '"c"'})
+
+    assert cache.get('https://a') is None
+    assert cache.get('https://c') is not None
+    assert cache.size() <= 1300
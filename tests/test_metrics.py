@@ -0,0 +1,117 @@
+import json
+import urllib.request
+from unittest.mock import Mock, patch
+
+from src.core.metrics import (
+    COUNTER_API_ERRORS,
+    COUNTER_ATTEMPTS,
+    COUNTER_FALLBACKS,
+    COUNTER_TRUNCATIONS,
+    REGISTRY,
+    MetricsRegistry,
+    MetricsServer,
+)
+from src.core.runner import publish_status
+from src.core.selection import fetch_quote_with_retries
+from src.github.status_client import GitHubRateLimitError
+from src.parser import site_parser
+from tests.test_site_parser import HTML_SNIPPET, make_response
+
+
+class StepClock:
+    def __init__(self, step):
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+
+def test_timer_records_histogram_and_counters_render_as_prometheus():
+    registry = MetricsRegistry(buckets=(0.1, 1.0), clock=StepClock(0.5))
+    with registry.timer('fetch'):
+        pass
+    registry.inc('api_errors_total', kind='status')
+    registry.inc('api_errors_total', kind='status')
+
+    assert registry.stage('fetch')['count'] == 1
+    assert registry.stage('fetch')['total_seconds'] == 0.5
+    assert registry.counter('api_errors_total', kind='status') == 2
+
+    text = registry.render_prometheus()
+    assert '# TYPE auto_quoter_stage_duration_seconds histogram' in text
+    assert 'auto_quoter_stage_duration_seconds_bucket{stage="fetch",le="0.1"} 0' in text
+    assert 'auto_quoter_stage_duration_seconds_bucket{stage="fetch",le="1"} 1' in text
+    assert 'auto_quoter_stage_duration_seconds_bucket{stage="fetch",le="+Inf"} 1' in text
+    assert 'auto_quoter_stage_duration_seconds_sum{stage="fetch"} 0.5' in text
+    assert 'auto_quoter_api_errors_total{kind="status"} 2' in text
+
+
+def test_cycle_writes_json_snapshot(tmp_path):
+    registry = MetricsRegistry()
+    registry.snapshot_path = str(tmp_path / 'metrics' / 'snapshot.json')
+    with registry.cycle():
+        registry.inc('fetch_attempts_total', 3)
+
+    with open(registry.snapshot_path, encoding='utf-8') as f:
+        snapshot = json.load(f)
+    assert snapshot['counters'] == {'cycles_total': 1, 'fetch_attempts_total': 3}
+    assert snapshot['stages']['cycle']['count'] == 1
+
+
+def test_metrics_server_serves_prometheus_and_json():
+    registry = MetricsRegistry()
+    registry.inc('cycles_total')
+    server = MetricsServer(registry, port=0).start()
+    try:
+        base = f'http://127.0.0.1:{server.address[1]}'
+        with urllib.request.urlopen(f'{base}/metrics', timeout=5) as resp:
+            assert resp.headers['Content-Type'].startswith('text/plain')
+            assert 'auto_quoter_cycles_total 1' in resp.read().decode('utf-8')
+        with urllib.request.urlopen(f'{base}/metrics.json', timeout=5) as resp:
+            assert json.load(resp)['counters'] == {'cycles_total': 1}
+    finally:
+        server.close()
+
+
+def test_parser_reports_fetch_parse_and_extract_stages():
+    registry = MetricsRegistry()
+    with patch('requests.Session.get') as mock_get:
+        mock_get.return_value = make_response(HTML_SNIPPET)
+        parser = site_parser.QuoteParser(
+            'https://citaty.info/short',
+            'div.field-name-body a > p',
+            'a.copy-to-clipboard',
+            'data-source',
+            'article.node-quote',
+            metrics=registry,
+        )
+        parser.fetch_all()
+
+    for stage in ('fetch', 'parse', 'extract'):
+        assert registry.stage(stage)['count'] == 1
+
+
+def test_selection_counts_attempts_and_fallbacks():
+    REGISTRY.reset()
+    parser = Mock()
+    parser.fetch_all.return_value = [{"quote": "x" * 100, "source": None}]
+
+    _, _, attempts, within_limit = fetch_quote_with_retries(parser, 20, 3, 0)
+
+    assert (attempts, within_limit) == (3, False)
+    assert REGISTRY.counter(COUNTER_ATTEMPTS) == 3
+    assert REGISTRY.counter(COUNTER_FALLBACKS) == 1
+    assert REGISTRY.stage('select')['count'] == 3
+
+
+def test_publish_status_counts_truncations_and_api_errors():
+    REGISTRY.reset()
+    client = Mock(debug=False, skipped_updates=0)
+    client.set_status.side_effect = GitHubRateLimitError("slow down", retry_after=10)
+
+    assert publish_status(client, "y" * 100, 20, 0)
+    assert REGISTRY.counter(COUNTER_TRUNCATIONS) == 1
+    assert REGISTRY.counter(COUNTER_API_ERRORS, kind='rate_limit') == 1
+    assert REGISTRY.stage('mutation')['count'] == 1
@@ -0,0 +1,125 @@
+import threading
+import time
+
+from src.core.history import QuoteHistory
+from src.core.pool import QuotePool
+from src.core.prefetch import QuotePrefetcher
+from src.core.runner import fetch_status_message
+
+
+def counting_fetch(results):
+    calls = iter(results)
+
+    def fetch():
+        return next(calls)
+
+    return fetch
+
+
+def test_prefetcher_fills_bounded_queue_with_fitting_messages():
+    produced = [
+        ({"quote": f"q{idx}", "source": None}, f'"q{idx}"', 1, True) for idx in range(10)
+    ]
+    prefetcher = QuotePrefetcher(counting_fetch(produced), depth=2, retry_interval=0).start()
+
+    deadline = time.monotonic() + 2
+    while prefetcher.ready() < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.05)
+
+    assert prefetcher.ready() == 2
+    assert prefetcher.get(timeout=1).message == '"q0"'
+    assert prefetcher.get(timeout=1).message == '"q1"'
+    prefetcher.close()
+    assert prefetcher.get(timeout=0.1) is None
+
+
+def test_prefetcher_skips_too_long_and_survives_errors():
+    calls = []
+
+    def fetch():
+        calls.append(None)
+        if len(calls) == 1:
+            raise RuntimeError("site down")
+        if len(calls) == 2:
+            return {"quote": "long"}, '"long"', 3, False
+        return {"quote": "ok"}, '"ok"', 1, True
+
+    prefetcher = QuotePrefetcher(fetch, depth=1, retry_interval=0).start()
+    prepared = prefetcher.get(timeout=2)
+    prefetcher.close()
+
+    assert prepared.message == '"ok"'
+    assert prefetcher.errors == 1
+
+
+def test_fetch_status_message_takes_from_prefetcher_without_parser():
+    prefetcher = QuotePrefetcher(
+        counting_fetch([({"quote": "ready", "source": "me"}, '"ready" — me', 1, True)]),
+        retry_interval=60,
+    ).start()
+
+    ok, message = fetch_status_message(None, 80, 1, 0, prefetcher=prefetcher)
+    prefetcher.close()
+
+    assert ok is True
+    assert message == '"ready" — me'
+
+
+def test_quote_pool_is_usable_from_worker_threads(tmp_path):
+    pool = QuotePool(str(tmp_path / 'pool.sqlite3'))
+    pool.add_many([{"quote": f"q{idx}", "source": None} for idx in range(20)])
+    taken = []
+
+    def worker():
+        for _ in range(5):
+            taken.append(pool.take(80)[1])
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    pool.close()
+
+    assert len(set(taken)) == 20
+
+
+def test_prefetcher_records_history_only_when_dequeued(tmp_path):
+    history = QuoteHistory(str(tmp_path / 'history.json'))
+    produced = [({"quote": f"q{idx}", "source": None}, f'"q{idx}"', 1, True) for idx in range(5)]
+    prefetcher = QuotePrefetcher(
+        counting_fetch(produced), depth=2, retry_interval=60, history=history
+    ).start()
+
+    prepared = prefetcher.get(timeout=1)
+    deadline = time.monotonic() + 2
+    while prefetcher.ready() < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    prefetcher.close()
+
+    assert history.seen(prepared.entry)
+    assert not history.seen({"quote": "q1", "source": None})
+    assert len(history) == 1
+
+
+def test_prefetcher_returns_queued_quotes_to_pool_on_close(tmp_path):
+    pool = QuotePool(str(tmp_path / 'pool.sqlite3'))
+    pool.add_many([{"quote": f"q{idx}", "source": None} for idx in range(3)])
+
+    def fetch():
+        entry, message = pool.take(80)
+        return entry, message, 1, True
+
+    prefetcher = QuotePrefetcher(fetch, depth=2, retry_interval=60, pool=pool).start()
+    published = prefetcher.get(timeout=1)
+    deadline = time.monotonic() + 2
+    while prefetcher.ready() < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    prefetcher.close()
+
+    assert pool.available() == 2
+    remaining = {pool.take(80)[0]["quote"] for _ in range(2)}
+    pool.close()
+
+    assert published.entry["quote"] not in remaining
@@ -0,0 +1,72 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.core.builders import build_parser
+from src.core.selection import fits_status_length
+from src.parser import site_parser
+from src.parser.process_pool import ParsePool, parse_records
+from tests.test_site_parser import HTML_SNIPPET
+
+
+@pytest.fixture(scope='module')
+def parse_pool():
+    pool = ParsePool(workers=2, chunksize=2)
+    yield pool
+    pool.close()
+
+
+def make_parser(parse_pool=None):
+    return site_parser.QuoteParser(
+        'https://citaty.info/random',
+        'div.field-name-body a > p',
+        'a.copy-to-clipboard',
+        'data-source',
+        'article.node-quote',
+        parse_pool=parse_pool,
+    )
+
+
+def test_parse_records_are_compact_tuples():
+    records = parse_records(make_parser().parse_spec, HTML_SNIPPET)
+
+    assert records and all(isinstance(record, tuple) and len(record) == 2 for record in records)
+
+
+def test_process_pool_matches_in_process_parsing(parse_pool):
+    local = make_parser()
+    pooled = make_parser(parse_pool)
+
+    assert pooled.parse(HTML_SNIPPET) == local.parse(HTML_SNIPPET)
+    assert parse_pool.parse_many(pooled.parse_spec, [HTML_SNIPPET] * 3) == [local.parse(HTML_SNIPPET)] * 3
+
+
+def test_fetch_all_with_process_pool_applies_stop_when(parse_pool):
+    parser = make_parser(parse_pool)
+    response = Mock(status_code=200, text=HTML_SNIPPET)
+    response.raise_for_status = Mock()
+
+    with patch('requests.Session.get', return_value=response):
+        results = parser.fetch_all(stop_when=fits_status_length(500))
+
+    assert len(results) == 1
+
+
+def test_build_parser_shares_process_pool_between_sources():
+    config = {
+        'parser': {
+            'quote_selector': 'div.field-name-body a > p',
+            'process_pool': {'enabled': True, 'workers': 3},
+            'sources': [
+                {'name': 'random', 'url': 'https://citaty.info/random'},
+                {'name': 'short', 'url': 'https://citaty.info/short'},
+            ],
+        },
+    }
+
+    aggregator = build_parser(config)
+    first, second = (source.parser.parse_pool for source in aggregator.sources)
+    aggregator.close()
+
+    assert first is second
+    assert first.workers == 3
@@ -0,0 +1,61 @@
+import pstats
+import time
+
+import pytest
+
+from src.core.profiling import CycleProfiler
+from src.core.runner import parse_args
+
+
+def busy_cycle():
+    deadline = time.perf_counter() + 0.03
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(100))
+    return total
+
+
+def test_cprofile_mode_aggregates_cycles_into_pstats_and_collapsed(tmp_path):
+    prefix = str(tmp_path / 'profile' / 'update')
+    profiler = CycleProfiler(output_prefix=prefix, interval=0.001)
+
+    results = profiler.run(busy_cycle, cycles=3)
+
+    assert len(results) == 3
+    assert len(profiler.durations) == 3
+    stats = pstats.Stats(profiler.pstats_path)
+    calls = [
+        (ncalls, func) for func, (_, ncalls, *_rest) in stats.stats.items() if func[2] == 'busy_cycle'
+    ]
+    assert calls and calls[0][0] == 3
+
+    with open(profiler.collapsed_path, encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    cycle_stacks = [line for line in lines if 'busy_cycle (test_profiling.py:' in line]
+    assert cycle_stacks
+    for line in cycle_stacks:
+        stack, count = line.rsplit(' ', 1)
+        assert int(count) > 0
+        assert stack.startswith('MainThread;')
+
+
+def test_sampling_mode_writes_only_collapsed(tmp_path):
+    profiler = CycleProfiler(mode='sampling', output_prefix=str(tmp_path / 'sample'), interval=0.001)
+    profiler.run(busy_cycle, cycles=2)
+
+    assert set(profiler.files()) == {'collapsed'}
+    assert not (tmp_path / 'sample.pstats').exists()
+    assert profiler.sampler.samples > 0
+    assert 'Циклов: 2' in profiler.summary()
+
+
+def test_profile_arguments():
+    args = parse_args(['--profile', '--profile-cycles', '10', '--profile-mode', 'sampling'])
+
+    assert args.profile
+    assert args.profile_cycles == 10
+    assert args.profile_mode == 'sampling'
+    assert not parse_args([]).profile
+
+    with pytest.raises(SystemExit):
+        parse_args(['--profile-mode', 'perf'])
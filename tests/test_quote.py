@@ -0,0 +1,52 @@
+import pickle
+
+from src.core.pool import QuotePool
+from src.core.selection import format_status_message, select_quote_for_length
+from src.parser import site_parser
+from src.parser.quote import Quote
+from tests.test_site_parser import HTML_SNIPPET
+
+
+def test_quote_is_dict_compatible():
+    quote = Quote("Текст", "Автор", "https://citaty.info/random")
+
+    assert quote == {"quote": "Текст", "source": "Автор"}
+    assert quote["quote"] == "Текст" and quote.get("source") == "Автор"
+    assert quote.get("missing") is None
+    assert dict(quote) == {"quote": "Текст", "source": "Автор"}
+    assert not hasattr(quote, "__dict__")
+
+
+def test_quote_caches_message_length_and_hash():
+    quote = Quote("Текст", "Автор")
+
+    assert quote.message == format_status_message("Текст", "Автор")
+    assert quote.length == len(quote.message)
+    assert quote.content_hash == Quote(" текст ", "АВТОР").content_hash
+    assert quote.content_hash != Quote("Текст", None).content_hash
+
+    restored = pickle.loads(pickle.dumps(quote))
+    assert restored == quote and restored.message == quote.message
+
+
+def test_parser_pool_and_selection_produce_quotes(tmp_path):
+    parser = site_parser.QuoteParser(
+        'https://citaty.info/man/mark-tven',
+        'div.field-name-body a > p',
+        'a.copy-to-clipboard',
+        'data-source',
+        'article.node-quote',
+    )
+    entries = parser.parse(HTML_SNIPPET)
+    assert all(isinstance(entry, Quote) for entry in entries)
+    assert entries[0].url == 'https://citaty.info/man/mark-tven'
+
+    entry, message = select_quote_for_length(entries, 500)
+    assert entry is entries[0]
+    assert message == entries[0].message
+
+    pool = QuotePool(str(tmp_path / 'pool.sqlite3'))
+    pool.add_many(entries)
+    taken, _ = pool.take(500)
+    pool.close()
+    assert isinstance(taken, Quote)
@@ -0,0 +1,121 @@
+from unittest.mock import MagicMock, patch
+
+from src.core.pool import QuotePool
+from src.core.selection import fetch_quote_with_retries
+
+
+def test_pool_take_returns_fitting_quote_once():
+    pool = QuotePool(':memory:')
+    added = pool.add_many([
+        {"quote": "A" * 100, "source": "Long"},
+        {"quote": "короткая", "source": "Автор"},
+        {"quote": "короткая", "source": "Автор"},
+    ])
+
+    assert added == 2
+    assert pool.available(80) == 1
+
+    entry, message = pool.take(80)
+    assert entry == {"quote": "короткая", "source": "Автор"}
+    assert message == '"короткая" — Автор'
+
+    assert pool.take(80) == (None, None)
+    assert pool.available() == 1
+
+
+def test_pool_keeps_missing_source_as_none():
+    pool = QuotePool(':memory:')
+    pool.add_many([{"quote": "без автора", "source": None}])
+
+    entry, message = pool.take(80)
+
+    assert entry == {"quote": "без автора", "source": None}
+    assert message == '"без автора"'
+
+
+def test_fetch_quote_with_retries_uses_pool_without_network():
+    pool = QuotePool(':memory:')
+    pool.add_many([{"quote": "из пула", "source": "Автор"}])
+    parser = MagicMock()
+
+    entry, message, attempts, within_limit = fetch_quote_with_retries(
+        parser,
+        max_status_length=80,
+        max_attempts=0,
+        retry_interval=0.0,
+        pool=pool,
+    )
+
+    assert attempts == 0
+    assert within_limit is True
+    assert entry['quote'] == 'из пула'
+    parser.fetch_all.assert_not_called()
+
+
+def test_fetch_quote_with_retries_stores_leftovers_in_pool():
+    pool = QuotePool(':memory:')
+    parser = MagicMock()
+    parser.fetch_all.return_value = [
+        {"quote": "первая", "source": "Автор"},
+        {"quote": "вторая", "source": "Автор"},
+    ]
+
+    with patch('src.core.selection.time.sleep'):
+        entry, _, attempts, _ = fetch_quote_with_retries(
+            parser,
+            max_status_length=80,
+            max_attempts=1,
+            retry_interval=0.0,
+            pool=pool,
+        )
+
+    assert attempts == 1
+    assert entry['quote'] == 'первая'
+    assert pool.available(80) == 1
+    assert pool.take(80)[0]['quote'] == 'вторая'
+
+
+def test_pool_random_policy_returns_each_fitting_quote_once():
+    import random
+
+    pool = QuotePool(':memory:', rng=random.Random(3))
+    pool.add_many([{"quote": f"цитата {idx}", "source": None} for idx in range(20)])
+    pool.add_many([{"quote": "Д" * 100, "source": None}])
+
+    taken = [pool.take(80, 'random')[0]['quote'] for _ in range(20)]
+
+    assert sorted(taken) == sorted(f"цитата {idx}" for idx in range(20))
+    assert taken != sorted(taken, key=lambda quote: (len(quote), quote))
+    assert pool.take(80, 'random') == (None, None)
+    assert pool.available() == 1
+
+
+def test_pool_random_policy_is_uniform_across_lengths():
+    import random
+
+    pool = QuotePool(':memory:', rng=random.Random(5))
+    pool.add_many([{"quote": "к", "source": None}])
+    pool.add_many([{"quote": f"{idx:03d}" + "д" * 36, "source": None} for idx in range(100)])
+
+    short = 0
+    for _ in range(2000):
+        entry, _ = pool.take(80, 'random')
+        short += entry['quote'] == "к"
+        pool.release(entry)
+
+    # одна цитата из 101: около 20 попаданий, а не половина выборки
+    assert short < 60
+    assert pool.available() == 101
+
+
+def test_pool_take_longest_policy():
+    pool = QuotePool(':memory:')
+    pool.add_many([
+        {"quote": "коротко", "source": None},
+        {"quote": "немного длиннее", "source": "Автор"},
+        {"quote": "A" * 120, "source": "Long"},
+    ])
+
+    entry, _ = pool.take(80, 'longest')
+
+    assert entry['quote'] == 'немного длиннее'
@@ -0,0 +1,94 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.github.rate_limit import RateLimiter, limiter_for_token, parse_retry_after
+from src.github.status_client import GitHubRateLimitError, GitHubStatusClient
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_response(status_code, payload=None, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.json.return_value = payload or {}
+    response.raise_for_status.return_value = None
+    return response
+
+
+STATUS_PAYLOAD = {
+    "data": {"changeUserStatus": {"status": {"message": '"Quote"', "emoji": None, "expiresAt": None}}}
+}
+
+
+def test_reserve_spaces_requests_and_waits_for_reset():
+    clock = FakeClock()
+    limiter = RateLimiter(min_interval=1.0, clock=clock)
+
+    assert limiter.reserve() == 0.0
+    assert limiter.reserve() == 1.0
+
+    limiter.update_from_headers(
+        {'X-RateLimit-Limit': '5000', 'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '1300'}
+    )
+    assert limiter.reserve(max_wait=60) == 300.0
+    assert limiter.budget().remaining == 0
+
+
+def test_low_budget_spreads_requests_until_reset():
+    clock = FakeClock()
+    limiter = RateLimiter(clock=clock)
+    limiter.update_from_graphql({'limit': 5000, 'cost': 1, 'remaining': 10, 'resetAt': '1970-01-01T00:18:20Z'})
+
+    assert limiter.reserve() == 0.0
+    assert limiter.reserve() == pytest.approx(10.0)
+    assert limiter.budget().last_cost == 1
+
+
+def test_retry_after_formats():
+    assert parse_retry_after('30', 0) == 30.0
+    assert parse_retry_after('Thu, 01 Jan 1970 00:01:00 GMT', 0) == 60.0
+    assert parse_retry_after(' 5 ', 0) == 5.0
+    assert parse_retry_after('soon', 0) is None
+    assert parse_retry_after(None, 0) is None
+
+
+def test_client_honours_retry_after_and_retries_once():
+    limiter = RateLimiter()
+    responses = [
+        make_response(429, headers={'Retry-After': '2'}),
+        make_response(200, STATUS_PAYLOAD, headers={'X-RateLimit-Remaining': '4999'}),
+    ]
+
+    with patch('requests.Session.post', side_effect=responses) as mock_post, \
+            patch('time.sleep') as mock_sleep:
+        client = GitHubStatusClient("token", rate_limiter=limiter)
+        result = client.set_status('"Quote"')
+
+    assert result.message == '"Quote"'
+    assert mock_post.call_count == 2
+    assert mock_sleep.call_args.args[0] == pytest.approx(2.0, abs=0.1)
+    assert client.rate_limit_budget().remaining == 4999
+
+
+def test_client_raises_rate_limit_error_when_wait_is_too_long():
+    limiter = RateLimiter()
+
+    with patch('requests.Session.post', return_value=make_response(403, headers={'Retry-After': '3600'})):
+        client = GitHubStatusClient("token", rate_limiter=limiter, max_wait_seconds=10)
+        with pytest.raises(GitHubRateLimitError) as excinfo:
+            client.set_status('"Quote"')
+
+    assert excinfo.value.retry_after == pytest.approx(3600, abs=1)
+
+
+def test_limiters_are_shared_per_token():
+    assert limiter_for_token('rate-limit-test-a') is limiter_for_token('rate-limit-test-a')
+    assert limiter_for_token('rate-limit-test-a') is not limiter_for_token('rate-limit-test-b')
@@ -37,7 +37,7 @@ def make_response(text):
 
 
 def test_fetch_all_returns_multiple_quotes():
-    with patch('src.parser.site_parser.requests.get') as mock_get:
+    with patch('requests.Session.get') as mock_get:
         mock_get.return_value = make_response(HTML_SNIPPET)
         parser = site_parser.QuoteParser(
             'https://citaty.info/short',
@@ -56,7 +56,7 @@ def test_fetch_all_returns_multiple_quotes():
 
 
 def test_fetch_all_without_source_selector_returns_none_sources():
-    with patch('src.parser.site_parser.requests.get') as mock_get:
+    with patch('requests.Session.get') as mock_get:
         mock_get.return_value = make_response(HTML_SNIPPET)
         parser = site_parser.QuoteParser(
             'https://citaty.info/short',
@@ -72,7 +72,7 @@ def test_fetch_all_without_source_selector_returns_none_sources():
 
 
 def test_fetch_returns_first_entry():
-    with patch('src.parser.site_parser.requests.get') as mock_get:
+    with patch('requests.Session.get') as mock_get:
         mock_get.return_value = make_response(HTML_SNIPPET)
         parser = site_parser.QuoteParser(
             'https://citaty.info/short',
@@ -86,3 +86,69 @@ def test_fetch_returns_first_entry():
 
         assert result['quote'] == 'Сочинять, значит быть одиноким до тошноты...'
         assert result['source'] == '📚 Дэвид Митчелл, Облачный атлас'
+
+
+def test_parser_reuses_session_and_reports_stats():
+    with patch('requests.Session.get') as mock_get:
+        mock_get.return_value = make_response(HTML_SNIPPET)
+        parser = site_parser.QuoteParser(
+            'https://citaty.info/short',
+            'div.field-name-body a > p',
+            'a.copy-to-clipboard',
+            'data-source',
+            'article.node-quote'
+        )
+        parser.fetch_all()
+        parser.fetch_all()
+
+    stats = parser.connection_stats()
+    assert mock_get.call_count == 2
+    assert stats['requests'] == 2
+    assert 'gzip' in parser.session.headers['Accept-Encoding']
+
+
+def test_build_session_configures_pool_and_retries():
+    session = site_parser.build_session(pool_size=3, max_retries=4, backoff_factor=0.1, keep_alive=False)
+    adapter = session.get_adapter('https://citaty.info/random')
+
+    assert adapter._pool_maxsize == 3
+    assert adapter.max_retries.total == 4
+    assert 429 in adapter.max_retries.status_forcelist
+    assert session.headers['Connection'] == 'close'
+
+
+@pytest.mark.parametrize('backend', ['html.parser', 'lxml', 'selectolax'])
+def test_backends_return_same_results(backend):
+    if backend != 'html.parser':
+        pytest.importorskip(backend)
+
+    parser = site_parser.QuoteParser(
+        'https://citaty.info/short',
+        'div.field-name-body a > p',
+        'a.copy-to-clipboard',
+        'data-source',
+        'article.node-quote',
+        backend=backend,
+    )
+
+    assert parser.parse(HTML_SNIPPET) == [
+        {"quote": 'Сочинять, значит быть одиноким до тошноты...', "source": '📚 Дэвид Митчелл, Облачный атлас'},
+        {"quote": 'Денег, которые я заработал, хватит мне до конца жизни...', "source": '🧑🏼 Хенни Янгман'},
+    ]
+
+
+def test_unknown_backend_raises():
+    with pytest.raises(ValueError):
+        site_parser.QuoteParser('https://citaty.info/short', 'p', backend='regex')
+
+
+def test_invalid_selector_fails_at_construction():
+    with pytest.raises(ValueError):
+        site_parser.QuoteParser('https://citaty.info/short', 'div[[', block_selector='article')
+
+
+def test_parsers_with_same_config_share_compiled_plan():
+    first = site_parser.QuoteParser('https://citaty.info/short', 'a > p', 'a.copy', 'data-source', 'article')
+    second = site_parser.QuoteParser('https://citaty.info/random', 'a > p', 'a.copy', 'data-source', 'article')
+
+    assert first.plan is second.plan
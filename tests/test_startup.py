@@ -0,0 +1,83 @@
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.startup import (
+    ROOT_DIR,
+    check_startup,
+    forbidden_imports,
+    parse_importtime,
+)
+from benchmarks.startup import main as startup_main
+
+HEAVY_MODULES = ('requests', 'bs4', 'soupsieve', 'asyncio', 'sqlite3', 'multiprocessing', 'http.server')
+
+
+def loaded_after_import(module):
+    code = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', code], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+    )
+    return [name for name in result.stdout.strip().split(',') if name]
+
+
+@pytest.mark.parametrize('module', ['main', 'src', 'src.core.runner'])
+def test_entry_points_do_not_import_heavy_dependencies(module):
+    assert loaded_after_import(module) == []
+
+
+def test_main_resolves_legacy_names_lazily():
+    import main
+    from src.core import selection
+
+    assert main.enforce_status_length is selection.enforce_status_length
+    assert main.DEFAULT_MAX_STATUS_LENGTH == selection.DEFAULT_MAX_STATUS_LENGTH
+    with pytest.raises(AttributeError):
+        main.no_such_helper
+
+
+def test_packages_resolve_exports_on_access():
+    import src.core
+    import src.github
+    import src.parser
+
+    assert src.parser.Quote.__module__ == 'src.parser.quote'
+    assert src.github.StatusCache.__module__ == 'src.github.status_cache'
+    assert src.core.METRICS is __import__('src.core.metrics', fromlist=['REGISTRY']).REGISTRY
+    assert 'QuotePool' in dir(src.core)
+
+
+def test_parse_importtime_reads_self_cumulative_and_depth():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       100 |        100 | site\n"
+        "import time:        30 |         30 |   json.decoder\n"
+        "import time:        20 |         50 | json\n"
+    )
+
+    rows = parse_importtime(stderr)
+
+    assert rows == [('site', 100, 100, 0), ('json.decoder', 30, 30, 1), ('json', 20, 50, 0)]
+    assert forbidden_imports(['json', 'bs4.element', 'requests'], ('bs4', 'requests')) == ['bs4', 'requests']
+
+
+def test_startup_guard_trips_on_leaked_module_and_budget():
+    results = {
+        'main': {'median_ms': 0.2, 'modules': ['main']},
+        'src.core.runner': {'median_ms': 80.0, 'modules': ['src.core.runner', 'requests.adapters']},
+    }
+
+    assert check_startup(results, ('requests', 'bs4'), budget_ms=50) == [
+        ('src.core.runner', 'загружает requests'),
+        ('src.core.runner', 'импорт дольше бюджета 50.0 ms'),
+    ]
+
+
+def test_startup_cli_fails_when_runner_loads_forbidden_module():
+    # argparse действительно загружается при импорте src.core.runner
+    assert startup_main(['--module', 'src.core.runner', '--runs', '1', '--forbid', 'argparse']) == 1
+    assert startup_main(['--module', 'src.core.runner', '--runs', '1', '--budget-ms', '1000']) == 0
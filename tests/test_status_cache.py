@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+from src.github.status_cache import CachedStatus, StatusCache
+from src.github.rate_limit import RateLimiter
+from src.github.status_client import GitHubStatusClient
+
+
+def iso_in(seconds):
+    moment = datetime.now(timezone.utc) + timedelta(seconds=seconds)
+    return moment.isoformat().replace("+00:00", "Z")
+
+
+def make_response(status):
+    response = MagicMock()
+    response.status_code = 200
+    response.headers = {}
+    response.json.return_value = {"data": {"changeUserStatus": {"status": status}}}
+    response.raise_for_status.return_value = None
+    return response
+
+
+def make_client(cache, **kwargs):
+    return GitHubStatusClient("token", status_cache=cache, rate_limiter=RateLimiter(), **kwargs)
+
+
+def test_cached_status_covers_same_message_with_enough_expiry():
+    live = CachedStatus('"Quote"', ':books:', iso_in(3600))
+
+    assert live.covers('"Quote"', ':books:', iso_in(3500))
+    assert not live.covers('"Quote"', ':books:', iso_in(7200))
+    assert not live.covers('"Other"', ':books:', iso_in(3500))
+    assert not live.covers('"Quote"', None, iso_in(3500))
+    assert CachedStatus('"Quote"', None, None).covers('"Quote"', None, None)
+
+
+def test_unchanged_status_skips_mutation_and_persists(tmp_path):
+    path = str(tmp_path / 'status.json')
+    status = {"message": '"Quote"', "emoji": None, "expiresAt": iso_in(3600)}
+
+    with patch('requests.Session.post', return_value=make_response(status)) as mock_post:
+        make_client(StatusCache(path)).set_status('"Quote"', expires_in_seconds=3600)
+        client = make_client(StatusCache(path))
+        result = client.set_status('"Quote"', expires_in_seconds=3600)
+
+    assert mock_post.call_count == 1
+    assert client.skipped_updates == 1
+    assert result.message == '"Quote"'
+
+
+def test_changed_message_or_short_expiry_is_sent(tmp_path):
+    cache = StatusCache(str(tmp_path / 'status.json'))
+    cache.put('default', CachedStatus('"Quote"', None, iso_in(30)))
+    status = {"message": '"Quote"', "emoji": None, "expiresAt": iso_in(3600)}
+
+    with patch('requests.Session.post', return_value=make_response(status)) as mock_post:
+        client = make_client(cache)
+        client.set_status('"Quote"', expires_in_seconds=3600)
+        client.set_status('"Another"', expires_in_seconds=3600)
+
+    assert mock_post.call_count == 2
+    assert client.skipped_updates == 0
+
+
+def test_refresh_on_start_seeds_cache_from_viewer(tmp_path):
+    cache = StatusCache(str(tmp_path / 'status.json'))
+    client = make_client(cache, refresh_cache=True)
+    client.fetch_status = MagicMock(  # type: ignore[assignment]
+        side_effect=lambda: cache.put('default', CachedStatus('"Quote"', None, None))
+    )
+
+    with patch('requests.Session.post') as mock_post:
+        client.set_status('"Quote"')
+        client.set_status('"Quote"')
+
+    client.fetch_status.assert_called_once()
+    mock_post.assert_not_called()
+    assert client.skipped_updates == 2
+
+
+def test_refresh_window_skips_while_live_status_has_time_left(tmp_path):
+    live = CachedStatus('"Quote"', None, iso_in(1800))
+
+    # a loop asks for an expiry one interval past the live one: without a window it always mutates
+    assert not live.covers('"Quote"', None, iso_in(1800 + 3600))
+    assert live.covers('"Quote"', None, iso_in(1800 + 3600), refresh_window=600)
+    assert not live.covers('"Quote"', None, iso_in(1800 + 3600), refresh_window=3600)
+    assert not live.covers('"Other"', None, iso_in(1800 + 3600), refresh_window=600)
+
+    cache = StatusCache(str(tmp_path / 'status.json'))
+    cache.put('default', live)
+    with patch('requests.Session.post') as mock_post:
+        client = make_client(cache, refresh_window=600)
+        client.set_status('"Quote"', expires_in_seconds=1800 + 3600)
+
+    mock_post.assert_not_called()
+    assert client.skipped_updates == 1
@@ -1,5 +1,7 @@
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from main import (
     DEFAULT_MAX_STATUS_LENGTH,
     TRUNCATION_SUFFIX,
@@ -56,6 +58,38 @@ def test_select_quote_for_length_falls_back_to_first():
     assert message.startswith('"')
 
 
+def test_select_quote_for_length_policies_pick_among_fitting():
+    candidates = [
+        {"quote": "A" * 100, "source": None},
+        {"quote": "средняя цитата", "source": None},
+        {"quote": "коротко", "source": None},
+        {"quote": "самая длинная из подходящих", "source": None},
+        {"quote": "кратко!", "source": None},
+    ]
+
+    assert select_quote_for_length(candidates, 40, 'first')[0]['quote'] == 'средняя цитата'
+    assert select_quote_for_length(candidates, 40, 'shortest')[0]['quote'] == 'коротко'
+    assert select_quote_for_length(candidates, 40, 'longest')[0]['quote'] == 'самая длинная из подходящих'
+    picked = {select_quote_for_length(candidates, 40, 'random')[0]['quote'] for _ in range(200)}
+    assert picked == {'средняя цитата', 'коротко', 'самая длинная из подходящих', 'кратко!'}
+    assert select_quote_for_length(candidates, 5, 'longest')[0]['quote'] == 'A' * 100
+    with pytest.raises(ValueError):
+        select_quote_for_length(candidates, 40, 'median')
+
+
+def test_select_quote_for_length_longest_policy():
+    quotes = [
+        {"quote": "коротко", "source": None},
+        {"quote": "немного длиннее", "source": "Автор"},
+        {"quote": "A" * 120, "source": "Long"},
+    ]
+
+    entry, message = select_quote_for_length(quotes, 80, 'longest')
+
+    assert entry is quotes[1]
+    assert message == '"немного длиннее" — Автор'
+
+
 def test_fetch_quote_with_retries_returns_on_second_attempt():
     parser = MagicMock()
     parser.fetch_all.side_effect = [
@@ -63,7 +97,7 @@ def test_fetch_quote_with_retries_returns_on_second_attempt():
         [{"quote": "короткая", "source": "Автор"}],
     ]
 
-    with patch('main.time.sleep') as mock_sleep:
+    with patch('src.core.selection.time.sleep') as mock_sleep:
         entry, message, attempts, within_limit = fetch_quote_with_retries(
             parser,
             max_status_length=80,
@@ -84,7 +118,7 @@ def test_fetch_quote_with_retries_falls_back_after_limit():
         [{"quote": "B" * 110, "source": "Also long"}],
     ]
 
-    with patch('main.time.sleep') as mock_sleep:
+    with patch('src.core.selection.time.sleep') as mock_sleep:
         entry, message, attempts, within_limit = fetch_quote_with_retries(
             parser,
             max_status_length=80,
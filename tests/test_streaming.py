@@ -0,0 +1,94 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.core.selection import fits_status_length
+from src.parser import site_parser
+from src.parser.streaming import CompoundSelector, iter_block_fragments
+from tests.test_site_parser import HTML_SNIPPET
+
+
+def make_stream_response(body, chunk_size, consumed):
+    data = body.encode('utf-8')
+
+    def iter_content(chunk_size=chunk_size):
+        for start in range(0, len(data), chunk_size):
+            consumed.append(start)
+            yield data[start:start + chunk_size]
+
+    response = MagicMock()
+    response.headers = {'Content-Type': 'text/html; charset=utf-8'}
+    response.encoding = 'utf-8'
+    response.iter_content.side_effect = iter_content
+    response.__enter__.return_value = response
+    return response
+
+
+def make_parser(**kwargs):
+    return site_parser.QuoteParser(
+        'https://citaty.info/short',
+        'div.field-name-body a > p',
+        'a.copy-to-clipboard',
+        'data-source',
+        'article.node-quote',
+        streaming=True,
+        **kwargs,
+    )
+
+
+def test_compound_selector_matching():
+    selector = CompoundSelector('article.node-quote[data-id=7]')
+
+    assert selector.matches('article', [('class', 'node node-quote'), ('data-id', '7')])
+    assert not selector.matches('article', [('class', 'node'), ('data-id', '7')])
+    assert not selector.matches('div', [('class', 'node-quote'), ('data-id', '7')])
+
+
+@pytest.mark.parametrize('selector', ['div article.node-quote', 'a > p', 'a, b', ''])
+def test_compound_selector_rejects_combinators(selector):
+    with pytest.raises(ValueError):
+        CompoundSelector(selector)
+
+
+def test_iter_block_fragments_handles_split_chunks():
+    chunks = [HTML_SNIPPET[i:i + 7] for i in range(0, len(HTML_SNIPPET), 7)]
+
+    fragments = list(iter_block_fragments(chunks, 'article.node-quote'))
+
+    assert len(fragments) == 2
+    assert fragments[0].startswith('<article class="node node-quote">')
+    assert fragments[0].endswith('</article>')
+
+
+def test_streaming_fetch_all_matches_regular_parse():
+    consumed = []
+    with patch('requests.Session.get') as mock_get:
+        mock_get.return_value = make_stream_response(HTML_SNIPPET, 64, consumed)
+        parser = make_parser(chunk_size=64)
+        results = parser.fetch_all()
+
+    assert results == parser.parse(HTML_SNIPPET)
+    assert mock_get.call_args.kwargs['stream'] is True
+
+
+def test_streaming_stops_reading_after_fitting_quote():
+    consumed = []
+    with patch('requests.Session.get') as mock_get:
+        mock_get.return_value = make_stream_response(HTML_SNIPPET, 64, consumed)
+        parser = make_parser(chunk_size=64)
+        results = parser.fetch_all(stop_when=fits_status_length(80))
+
+    total_chunks = len(range(0, len(HTML_SNIPPET.encode('utf-8')), 64))
+    assert len(results) == 1
+    assert results[0]['source'] == '📚 Дэвид Митчелл, Облачный атлас'
+    assert len(consumed) < total_chunks
+
+
+def test_streaming_requires_simple_block_selector():
+    with pytest.raises(ValueError):
+        site_parser.QuoteParser(
+            'https://citaty.info/short',
+            'p',
+            block_selector='main article',
+            streaming=True,
+        )
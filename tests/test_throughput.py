@@ -0,0 +1,39 @@
+import pytest
+
+from benchmarks.throughput import LocalServers, growth_slope, run_throughput
+
+
+def test_run_throughput_counts_updates_and_requests():
+    stats = run_throughput(accounts=4, cycles=3, warmup=1, in_process=True)
+
+    assert stats['cycles'] == 3
+    assert stats['failed_cycles'] == 0
+    assert stats['updates'] == 12
+    # минимум одна страница citaty.info на цикл плюс одна мутация на аккаунт
+    assert stats['http_requests'] >= 3 + 12
+    assert stats['requests_per_update'] == pytest.approx(stats['http_requests'] / 12)
+    assert stats['updates_per_sec'] > 0
+    assert stats['p50_ms'] <= stats['p99_ms']
+    assert 'mutation' in stats['stage_mean_ms']
+
+
+def test_run_throughput_honours_duration():
+    stats = run_throughput(accounts=1, duration=0.2, warmup=0, in_process=True)
+
+    assert stats['cycles'] >= 1
+    assert stats['wall_seconds'] >= 0.2
+
+
+def test_local_servers_in_subprocess_report_stats():
+    with LocalServers(quotes=3) as servers:
+        stats = servers.stats()
+
+    assert servers.citaty_url.endswith('/random')
+    assert servers.github_url.endswith('/graphql')
+    assert stats['citaty']['requests'] == 0
+    assert stats['github']['mutations'] == 0
+
+
+def test_growth_slope():
+    assert growth_slope([100.0]) == 0.0
+    assert growth_slope([100.0, 102.0, 104.0, 106.0]) == pytest.approx(2.0)